@@ -32,7 +32,7 @@ from __future__ import annotations
 
 import re
 import sys
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import List, Optional, Tuple, Dict, Any
 
@@ -239,7 +239,7 @@ class TenhouReplayer:
         # 若该玩家有未处理的 drawn_tile (上一巡摸的没打), 先并入 hand
         p = gs.players[who]
         if p.drawn_tile is not None:
-            p.hand.append(p.drawn_tile)
+            p.add_to_hand(p.drawn_tile)
             p.hand.sort()
         p.drawn_tile = tile
         gs.current_player_index = who
@@ -255,12 +255,12 @@ class TenhouReplayer:
             p.drawn_tile = None
         else:
             if p.drawn_tile is not None:
-                p.hand.append(p.drawn_tile)
+                p.add_to_hand(p.drawn_tile)
                 p.drawn_tile = None
                 p.hand.sort()
             # 移除手牌中该 tile (按 value, 优先非赤)
             self._remove_from_hand(p, tile.value)
-        p.discards.append(tile)
+        p.add_discard(tile)
         gs.last_discarded_tile = tile
         gs.last_discard_player_index = who
         gs.current_player_index = (who + 1) % 4
@@ -273,10 +273,9 @@ class TenhouReplayer:
         }
 
     def _remove_from_hand(self, p: PlayerState, value: int):
-        for i, t in enumerate(p.hand):
+        for t in p.hand:
             if t.value == value:
-                p.hand.pop(i)
-                return True
+                return p.remove_from_hand(t)
         return False
 
     def _apply_meld(self, gs: GameState, caller: int, meld: TenhouMeld,
@@ -289,18 +288,18 @@ class TenhouReplayer:
             for t in consumed:
                 self._remove_from_hand(p, t.value)
             meld_tiles = [tenhou_id_to_tile(h) for h in meld.mentsu]
-            p.melds.append(Meld(type=ActionType.CHI, tiles=tuple(meld_tiles),
-                                from_player=gs.last_discard_player_index,
-                                called_tile=last_discard_tile))
+            p.add_meld(Meld(type=ActionType.CHI, tiles=tuple(meld_tiles),
+                            from_player=gs.last_discard_player_index,
+                            called_tile=last_discard_tile))
             p.is_menzen = False
         elif meld.kind == 'pon':
             called_type = tenhou_id_to_tile(meld.mentsu[0]).value
             for _ in range(2):
                 self._remove_from_hand(p, called_type)
             meld_tiles = [tenhou_id_to_tile(h) for h in meld.mentsu]
-            p.melds.append(Meld(type=ActionType.PON, tiles=tuple(meld_tiles),
-                                from_player=gs.last_discard_player_index,
-                                called_tile=last_discard_tile))
+            p.add_meld(Meld(type=ActionType.PON, tiles=tuple(meld_tiles),
+                            from_player=gs.last_discard_player_index,
+                            called_tile=last_discard_tile))
             p.is_menzen = False
         elif meld.kind == 'kakan':
             called_type = tenhou_id_to_tile(meld.mentsu[0]).value
@@ -311,10 +310,8 @@ class TenhouReplayer:
             for i, mm in enumerate(p.melds):
                 if mm.type == ActionType.PON and mm.tiles[0].value == called_type:
                     added = tenhou_id_to_tile(meld.mentsu[0])
-                    p.melds[i] = Meld(type=ActionType.KAN,
-                                      tiles=mm.tiles + (added,),
-                                      from_player=mm.from_player,
-                                      called_tile=mm.called_tile)
+                    p.replace_meld(i, replace(mm, type=ActionType.KAN,
+                                              tiles=mm.tiles + (added,)))
                     break
         elif meld.kind in ('ankan', 'daiminkan'):
             base_type = tenhou_id_to_tile(meld.mentsu[0]).value
@@ -328,12 +325,12 @@ class TenhouReplayer:
                 for _ in range(3):
                     self._remove_from_hand(p, base_type)
             base_tile = tenhou_id_to_tile(meld.mentsu[0])
-            p.melds.append(Meld(type=ActionType.KAN,
-                                tiles=tuple([base_tile] * 4),
-                                from_player=caller if meld.kind == 'ankan'
-                                else gs.last_discard_player_index,
-                                called_tile=None if meld.kind == 'ankan'
-                                else last_discard_tile))
+            p.add_meld(Meld(type=ActionType.KAN,
+                            tiles=tuple([base_tile] * 4),
+                            from_player=caller if meld.kind == 'ankan'
+                            else gs.last_discard_player_index,
+                            called_tile=None if meld.kind == 'ankan'
+                            else last_discard_tile))
         gs.current_player_index = caller
         gs.game_phase = GamePhase.ACTION_PROCESSING   # 鸣牌后该玩家待打牌
         # 更新 last_action_info (鸣牌动作)
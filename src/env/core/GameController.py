@@ -1,3 +1,6 @@
+import functools
+import logging
+import operator
 import sys
 from typing import List, Dict, Optional, Tuple
 
@@ -8,11 +11,44 @@ from src.env.core.rules.rules_engine import RulesEngine
 from src.env.core.game_state import Wall  # 假设 Wall 在 core 中
 from src.env.core.game_state import PlayerState  # 假设 PlayerState 在 core 中
 from src.env.core.actions import Action, ActionType, KanType
-from src.env.core.game_state import GamePhase
+from src.env.core.game_state import GamePhase, responder_order
+from src.env.core.rules.constants import ACTION_PRIORITY
 
 # 模块内 print 重绑到 logger.debug (默认静默)
-from src.utils.logger import get_logger as _get_logger
-print = _get_logger(__name__).debug
+from src.utils.logger import get_env_logger as _get_logger
+_log = _get_logger(__name__)
+print = _log.debug
+
+# 阶段成员提升为模块常量: 每步多次比较/赋值时免去 Enum 类属性查找
+_PLAYER_DRAW = GamePhase.PLAYER_DRAW
+_PLAYER_DISCARD = GamePhase.PLAYER_DISCARD
+_WAITING_FOR_RESPONSE = GamePhase.WAITING_FOR_RESPONSE
+_ACTION_PROCESSING = GamePhase.ACTION_PROCESSING
+_HAND_OVER_SCORES = GamePhase.HAND_OVER_SCORES
+_GAME_OVER = GamePhase.GAME_OVER
+
+# 响应阶段每个 PASS 都要比较的动作类型 / 优先级码, 同样提升为模块常量 (用 is 比较)
+_PASS = ActionType.PASS
+_RON = ActionType.RON
+_RON_PRIORITY = ACTION_PRIORITY[_RON]
+
+# 需要玩家输入 (退出自动推进循环) 的阶段
+_INPUT_PHASES = frozenset((_PLAYER_DISCARD, _WAITING_FOR_RESPONSE, _GAME_OVER))
+
+
+@functools.lru_cache(maxsize=None)
+def _deal_pickers(num_players: int) -> Tuple["operator.itemgetter", ...]:
+    """
+    配牌取牌器: 第 pid 个 itemgetter 从一次切出的 13*N 张里取出该座位的 13 张
+    (前三轮每人 4 张, 第四轮每人 1 张, 与逐张 draw_tile 的配牌顺序一致), 按人数只构造一次
+    """
+    n = num_players
+    pickers = []
+    for pid in range(n):
+        idx = [(r * n + pid) * 4 + k for r in range(3) for k in range(4)]
+        idx.append(12 * n + pid)
+        pickers.append(operator.itemgetter(*idx))
+    return tuple(pickers)
 
 
 class GameController:
@@ -26,17 +62,38 @@ class GameController:
     4. 调用 RulesEngine 进行规则判断和计分。
     """
 
+    # 显式 __slots__: 响应簿记 (pending_responses / _response_priority) 在 __init__ 里一次建好,
+    # 之后只原地清空复用, 不再有运行期动态挂上的属性 (新增字段须同步登记)
+    __slots__ = (
+        "config",
+        "wall",
+        "gamestate",
+        "rules_engine",
+        "pending_responses",
+        "_response_priority",
+        "_no_priority",
+        "_responders_needed",
+        "_responder_cursor",
+    )
+
     def __init__(self, config: Dict):
         self.config = config
 
         # 1. 核心组件
-        self.wall = Wall()
+        self.wall = Wall(config=self.config)  # 牌墙读 use_red_fives / seed
         self.gamestate = GameState(config=self.config, wall=self.wall)
         self.rules_engine = RulesEngine(config=self.config)  # RulesEngine 无状态
 
         # 2. 响应管理 (Response Management)
         # 存储当前等待响应的玩家及其声明的动作 {player_idx: Action}
         self.pending_responses: Dict[int, Action] = {}
+        # 各座位本次响应的优先级码 (0=PASS/未响应, 1=CHI, 2=PON/KAN, 3=RON), 预分配并原地清零
+        self._response_priority: List[int] = [0] * self.gamestate.num_players
+        self._no_priority: Tuple[int, ...] = (0,) * self.gamestate.num_players  # 清零模板
+        # 每张弃牌需要收齐的响应数 (人数对局内固定, 除打牌者外各一份)
+        self._responders_needed: int = self.gamestate.num_players - 1
+        # next_responder 在 responder_order 中的游标: 已表态者只增不减, 游标单调前移
+        self._responder_cursor: int = 0
 
     def reset(self):
         """重置整个游戏 (由 Env.reset 调用)"""
@@ -47,18 +104,17 @@ class GameController:
         """开始新的一局：洗牌、发牌、设置初始状态"""
         # 1. 重置数据 (reset_new_hand 内部已调用 shuffle_and_setup, 勿重复)
         self.gamestate.reset_new_hand()
-        self.pending_responses.clear()
+        self._clear_responses()
 
         # 2. 配牌 (Deal Tiles)
         # 标准日麻：庄家14张，闲家13张
-        # 我们模拟摸牌过程，直接操作 GameState
-        for _ in range(3):  # 前三轮，每人拿4张
-            for pid in range(self.gamestate.num_players):
-                for _ in range(4):
-                    self.gamestate.players[pid].hand.append(self.wall.draw_tile())
-
-        for pid in range(self.gamestate.num_players):  # 第四轮，每人拿1张
-            self.gamestate.players[pid].hand.append(self.wall.draw_tile())
+        # 一次切出 13*N 张, 按原摸牌顺序分配 (前三轮每人4张, 第四轮每人1张),
+        # 与逐张 draw_tile 的配牌结果完全一致; 每人 13 张由缓存的 itemgetter 一次取出
+        players = self.gamestate.players
+        n = self.gamestate.num_players
+        dealt = self.wall.draw_tiles(13 * n)
+        for p, pick in zip(players, _deal_pickers(n)):
+            p.extend_hand(pick(dealt))
 
         # 庄家多拿一张 (第14张) 作为 drawn_tile, 不放入 hand (避免双重计数)
         # 标准日麻: 庄家手牌 13 张 + 摸到的第 14 张 (drawn_tile)
@@ -66,17 +122,18 @@ class GameController:
         dealer_tile = self.wall.draw_tile()
         self.gamestate.players[dealer_idx].drawn_tile = dealer_tile  # 第14张作为摸到的牌
 
-        # 理牌
+        # 理牌: 按计数向量直接重建有序手牌, 不做比较排序
         for p in self.gamestate.players:
-            p.hand.sort()
+            p.sort_hand()
 
         # 3. 设置初始阶段
         self.gamestate.current_player_index = dealer_idx
-        self.gamestate.game_phase = GamePhase.PLAYER_DISCARD  # 庄家已摸牌，等待出牌
+        self.gamestate.game_phase = _PLAYER_DISCARD  # 庄家已摸牌，等待出牌
 
-        print(
-            f"GameController: New hand started. Dealer: {dealer_idx}, Round: {self.gamestate.round_wind}-{self.gamestate.round_number}"
-        )
+        if _log.isEnabledFor(logging.DEBUG):
+            print(
+                f"GameController: New hand started. Dealer: {dealer_idx}, Round: {self.gamestate.round_wind}-{self.gamestate.round_number}"
+            )
 
     # ======================================================================
     # == 核心交互接口 (Step) ==
@@ -95,29 +152,31 @@ class GameController:
         Returns:
             observation (GameState), reward, done, info
         """
+        gs = self.gamestate
+        phase = gs.game_phase
         # 0. 安全检查 (防止非当前玩家乱动，除非是响应阶段)
-        if self.gamestate.game_phase != GamePhase.WAITING_FOR_RESPONSE:
-            if player_idx != self.gamestate.current_player_index:
+        if phase is not _WAITING_FOR_RESPONSE:
+            if player_idx != gs.current_player_index:
                 raise ValueError(f"Not player {player_idx}'s turn.")
 
         # 1. 应用动作 (根据当前阶段分发)
-        if self.gamestate.game_phase == GamePhase.PLAYER_DISCARD:
+        if phase is _PLAYER_DISCARD:
             self._handle_player_discard_phase(player_idx, action)
 
-        elif self.gamestate.game_phase == GamePhase.WAITING_FOR_RESPONSE:
+        elif phase is _WAITING_FOR_RESPONSE:
             self._handle_response_phase(player_idx, action)
 
         else:
-            raise RuntimeError(f"Invalid phase for step: {self.gamestate.game_phase}")
+            raise RuntimeError(f"Invalid phase for step: {phase}")
 
         # 2. 自动流程推演 (Auto-Flow)
         # 如果当前不需要玩家输入 (例如进入了处理阶段)，则自动推进直到需要输入或结束
         self._process_auto_flow()
 
         # 3. 返回结果
-        done = self.gamestate.game_phase == GamePhase.GAME_OVER
+        done = gs.game_phase is _GAME_OVER
         reward = 0  # TODO: 计算 reward
-        return self.gamestate, reward, done, {}
+        return gs, reward, done, {}
 
     # ======================================================================
     # == 阶段处理逻辑 ==
@@ -131,29 +190,29 @@ class GameController:
         # legal_actions = self.rules_engine.generate_candidate_actions(self.gamestate, player_idx)
         # if action not in legal_actions: raise ValueError("Illegal action")
 
+        gs = self.gamestate
+        rules = self.rules_engine
         # 2. 应用动作到 GameState
-        self.gamestate.apply_action(
-            player_idx, action
-        )  # 注意：GameState.apply_action 需要适配 player_idx
+        gs.apply_action(player_idx, action)  # 注意：GameState.apply_action 需要适配 player_idx
 
         # 3. 根据动作类型决定下一阶段
-        next_phase = self.rules_engine.determine_next_phase(self.gamestate, action)
+        next_phase = rules.determine_next_phase(gs, action)
 
-        if next_phase == GamePhase.HAND_OVER_SCORES:
+        if next_phase is _HAND_OVER_SCORES:
             # 自摸 (TSUMO) -> 结算
             self._process_hand_outcome(
                 end_reason="TSUMO", action=action, winner_idx=player_idx
             )
 
-        elif next_phase == GamePhase.ACTION_PROCESSING:
+        elif next_phase is _ACTION_PROCESSING:
             # 杠 (KAN) -> 自动流程处理 (摸岭上牌)
-            self.gamestate.game_phase = GamePhase.ACTION_PROCESSING
+            gs.game_phase = _ACTION_PROCESSING
             # _process_auto_flow 会接手
 
-        elif next_phase == GamePhase.WAITING_FOR_RESPONSE:
+        elif next_phase is _WAITING_FOR_RESPONSE:
             # 打牌 (DISCARD) -> 进入响应阶段
-            self.gamestate.game_phase = GamePhase.WAITING_FOR_RESPONSE
-            self.pending_responses.clear()  # 清空上一轮
+            gs.game_phase = _WAITING_FOR_RESPONSE
+            self._clear_responses()  # 清空上一轮
 
             # 途中流局检测: 四风连打 / 四家立直 (打牌后立即判定)
             abort_reason = self._check_abortive_draw()
@@ -161,6 +220,10 @@ class GameController:
                 self._process_hand_outcome(end_reason=abort_reason)
                 return
 
+            # 快速路径: 没有对手能荣和/鸣牌时, 跳过只有 PASS 可选的响应阶段, 直接由下家摸牌
+            if not rules.any_response_possible(gs):
+                self._advance_to_next_turn()
+
         else:
             raise RuntimeError(
                 f"Unexpected next phase from PLAYER_DISCARD: {next_phase}"
@@ -170,34 +233,63 @@ class GameController:
         """
         处理 WAITING_FOR_RESPONSE 阶段的动作 (吃 / 碰 / 杠 / 荣 / 过)。
         """
+        pending = self.pending_responses
+        priorities = self._response_priority
+        atype = action.type
         # 1. 记录响应; 若 PASS 且本可荣和, 设置振听标记
-        self.pending_responses[player_idx] = action
-        if action.type == ActionType.PASS:
+        pending[player_idx] = action
+        priorities[player_idx] = ACTION_PRIORITY.get(atype, 0)
+        if atype is _PASS:
             self._update_furiten_on_pass(player_idx)
 
         # 2. 检查是否所有人都响应了 (除了打牌者自己)
-        # 需要响应的人数 = 总人数 - 1
-        if len(self.pending_responses) < self.gamestate.num_players - 1:
+        if len(pending) < self._responders_needed:
             return  # 等待其他人
 
         # 3. 所有人都响应了 -> 解决优先级
+        # 全员 PASS: 无需解析优先级, 直接流转到下家摸牌
+        if not any(priorities):
+            self._advance_to_next_turn()
+            return
         # 三家和途中流局: 3家以上 RON 同一张牌
-        ron_count = sum(1 for a in self.pending_responses.values() if a.type == ActionType.RON)
-        if ron_count >= 3:
+        if priorities.count(_RON_PRIORITY) >= 3:
             self._process_hand_outcome(end_reason="ABORTIVE_DRAW")
             return
 
         winning_action, winner_idx = self.rules_engine.resolve_response_priorities(
-            self.pending_responses, self.gamestate
+            pending, self.gamestate
         )
 
-        if winning_action and winning_action.type != ActionType.PASS:
+        if winning_action and winning_action.type is not _PASS:
             # 有人鸣牌或荣和
             self._execute_response(winner_idx, winning_action)
         else:
             # 所有人 PASS -> 流转到下家摸牌
             self._advance_to_next_turn()
 
+    def next_responder(self) -> Optional[int]:
+        """
+        响应阶段下一位待表态的玩家 (按下家→对家→上家顺序的第一个未响应者);
+        全员已表态时返回 None。响应状态只由 Controller 持有, Env 通过此方法查询。
+        """
+        gs = self.gamestate
+        pending = self.pending_responses
+        order = responder_order(gs.last_discard_player_index, gs.num_players)
+        # 从上次停下的位置继续, 不再每次从头扫描已表态的座位
+        cursor = self._responder_cursor
+        n = len(order)
+        while cursor < n and order[cursor] in pending:
+            cursor += 1
+        self._responder_cursor = cursor
+        return order[cursor] if cursor < n else None
+
+    def _clear_responses(self):
+        """清空上一张弃牌的响应记录 (容器原地复用)"""
+        self.pending_responses.clear()
+        self._responder_cursor = 0
+        # 切片赋值在 C 层原地清零 (列表对象不变, 外部持有的引用仍有效)
+        self._response_priority[:] = self._no_priority
+
     def _update_furiten_on_pass(self, player_idx: int):
         """玩家在响应阶段 PASS 时, 若该牌本可被其荣和, 设置振听标记。
         - 同巡振听 (temporary_furiten): 本巡内, 过自己摸牌后清除。
@@ -208,8 +300,10 @@ class GameController:
         if last_discard is None:
             return
         try:
-            can_ron = self.rules_engine.scoring.is_valid_win(
-                player, last_discard, is_tsumo=False, game_state=self.gamestate
+            # 复用本次弃牌已生成的候选动作 (RulesEngine 按弃牌缓存), 不再重复 is_valid_win
+            can_ron = any(
+                a.type is _RON
+                for a in self.rules_engine.generate_candidate_actions(self.gamestate, player_idx)
             )
         except Exception:
             can_ron = False
@@ -231,26 +325,16 @@ class GameController:
         if all(p.riichi_declared for p in gs.players):
             return "ABORTIVE_DRAW"
         # 四杠散了 (杠完成后场上4杠)
-        total_kans = sum(
-            1 for p in gs.players for m in p.melds if m.type == ActionType.KAN
-        )
-        if total_kans >= 4:
+        if gs.total_kans() >= 4:
             return "ABORTIVE_DRAW"
         # 四风连打 (第1巡: turn_number<=1 且门清)
         if gs.turn_number <= 1 and all(p.is_menzen for p in gs.players):
             # 本巡4家弃牌是否同一风牌
             if all(len(p.discards) >= 1 for p in gs.players):
                 first = gs.players[gs.dealer_index].discards[0].value
-                if 27 <= first <= 30:
-                    # 按庄家起顺序检查4家首弃
-                    ok = True
-                    for i in range(gs.num_players):
-                        idx = (gs.dealer_index + i) % gs.num_players
-                        if not gs.players[idx].discards or gs.players[idx].discards[0].value != first:
-                            ok = False
-                            break
-                    if ok:
-                        return "ABORTIVE_DRAW"
+                # 4家首弃均为同一风牌 (与座位顺序无关, 直接逐家比较)
+                if 27 <= first <= 30 and all(p.discards[0].value == first for p in gs.players):
+                    return "ABORTIVE_DRAW"
         return None
 
     def _execute_response(self, player_idx: int, action: Action):
@@ -261,7 +345,7 @@ class GameController:
         # 2. 决定下一阶段
         next_phase = self.rules_engine.determine_next_phase(self.gamestate, action)
 
-        if next_phase == GamePhase.HAND_OVER_SCORES:
+        if next_phase is _HAND_OVER_SCORES:
             # 荣和 (RON)
             self._process_hand_outcome(
                 end_reason="RON",
@@ -269,15 +353,15 @@ class GameController:
                 winner_idx=player_idx,
                 loser_idx=self.gamestate.last_discard_player_index,
             )
-        elif next_phase == GamePhase.PLAYER_DISCARD:
+        elif next_phase is _PLAYER_DISCARD:
             # 吃/碰 (CHI/PON) -> 轮到该玩家打牌
             self.gamestate.current_player_index = player_idx
-            self.gamestate.game_phase = GamePhase.PLAYER_DISCARD
+            self.gamestate.game_phase = _PLAYER_DISCARD
             # 注意：鸣牌后不摸牌，drawn_tile 应为 None (由 apply_action 处理)
-        elif next_phase == GamePhase.ACTION_PROCESSING:
+        elif next_phase is _ACTION_PROCESSING:
             # 明杠 (OPEN KAN) -> 摸岭上牌
             self.gamestate.current_player_index = player_idx
-            self.gamestate.game_phase = GamePhase.ACTION_PROCESSING
+            self.gamestate.game_phase = _ACTION_PROCESSING
 
     # ======================================================================
     # == 自动流程 (Auto-Flow) ==
@@ -288,18 +372,15 @@ class GameController:
         处理不需要玩家输入的自动阶段。
         循环执行，直到游戏结束或进入需要玩家输入的阶段 (PLAYER_DISCARD / WAITING_FOR_RESPONSE)。
         """
+        gs = self.gamestate
         while True:
-            phase = self.gamestate.game_phase
+            phase = gs.game_phase
 
             # Case 1: 动作处理 (例如：杠后摸岭上牌)
-            if phase == GamePhase.ACTION_PROCESSING:
+            if phase is _ACTION_PROCESSING:
                 # 四杠散了途中流局: 杠完成后场上4杠, 下家摸牌前判定
                 # (若该玩家可岭上自摸则先让他和, 此处简化为直接流局)
-                total_kans = sum(
-                    1 for p in self.gamestate.players
-                    for m in p.melds if m.type == ActionType.KAN
-                )
-                if total_kans >= 4:
+                if gs.total_kans() >= 4:
                     self._process_hand_outcome(end_reason="ABORTIVE_DRAW")
                     break
                 self._perform_rinshan_draw()
@@ -307,19 +388,19 @@ class GameController:
                 continue
 
             # Case 2: 玩家摸牌 (PLAYER_DRAW) -> 这是一个瞬态，立即执行
-            elif phase == GamePhase.PLAYER_DRAW:
+            elif phase is _PLAYER_DRAW:
                 self._perform_regular_draw()
                 # 摸完牌后，状态变为 PLAYER_DISCARD (或流局)，循环继续
                 continue
 
             # Case 3: 局终结算 (HAND_OVER_SCORES)
-            elif phase == GamePhase.HAND_OVER_SCORES:
+            elif phase is _HAND_OVER_SCORES:
                 # 此时 RulesEngine.process_hand_outcome 已经计算完分数并存在 GameState 中
                 # 或者是时候开始新的一局了
                 # 检查是否整场游戏结束
-                if self.rules_engine.is_game_over(self.gamestate):
-                    self.gamestate.game_phase = GamePhase.GAME_OVER
-                    self.gamestate._game_over_flag = True  # 同步置位, Env 据此返回 terminated
+                if self.rules_engine.is_game_over(gs):
+                    gs.game_phase = _GAME_OVER
+                    gs._game_over_flag = True  # 同步置位, Env 据此返回 terminated
                     break  # 退出循环
                 else:
                     self._start_new_hand()
@@ -327,11 +408,7 @@ class GameController:
                     break
 
             # Case 4: 需要玩家输入 -> 退出自动循环
-            elif phase in {
-                GamePhase.PLAYER_DISCARD,
-                GamePhase.WAITING_FOR_RESPONSE,
-                GamePhase.GAME_OVER,
-            }:
+            elif phase in _INPUT_PHASES:
                 break
 
             else:
@@ -348,13 +425,14 @@ class GameController:
 
         # 摸牌成功: 摸到的牌只放入 drawn_tile (不 append 到 hand, 避免双重计数)。
         # 玩家切出手牌 (Te-dashi) 时, apply_action 的 DISCARD 分支会先把 drawn_tile 并入 hand。
-        current_player = self.gamestate.players[self.gamestate.current_player_index]
+        gs = self.gamestate
+        current_player = gs.players[gs.current_player_index]
         current_player.drawn_tile = tile
         # 自己摸牌后, 同巡振听解除 (立直振听不解除)
         current_player.temporary_furiten = False
-        self.gamestate.last_draw_was_rinshan = False  # 常规摸牌，清除岭上标记
-        self.gamestate.turn_number += 1  # 每巡+1 (F1: 之前从未自增, 第一巡判定全失效)
-        self.gamestate.game_phase = GamePhase.PLAYER_DISCARD
+        gs.last_draw_was_rinshan = False  # 常规摸牌，清除岭上标记
+        gs.turn_number += 1  # 每巡+1 (F1: 之前从未自增, 第一巡判定全失效)
+        gs.game_phase = _PLAYER_DISCARD
 
     def _perform_rinshan_draw(self):
         """执行岭上摸牌 (杠后)"""
@@ -372,20 +450,16 @@ class GameController:
         current_player.drawn_tile = tile  # 岭上牌只放 drawn_tile, 不 append 到 hand
         # 标记为岭上摸牌上下文 (供 RulesEngine/Scoring 判定岭上开花使用)
         self.gamestate.last_draw_was_rinshan = True
-        self.gamestate.game_phase = GamePhase.PLAYER_DISCARD
+        self.gamestate.game_phase = _PLAYER_DISCARD
 
     def _advance_to_next_turn(self):
         """流转到下家摸牌 (全 PASS 后)。
         注意: 下家是"打牌者的下家"(last_discard_player_index+1), 而非
         current_player_index+1 —— 后者在响应阶段可能被改为响应者, 会跳错家。
         """
-        next_pid = (
-            self.gamestate.last_discard_player_index + 1
-        ) % self.gamestate.num_players
-        self.gamestate.current_player_index = next_pid
-        self.gamestate.game_phase = (
-            GamePhase.PLAYER_DRAW
-        )  # 设置为摸牌阶段，由 auto_flow 处理
+        gs = self.gamestate
+        gs.current_player_index = gs.next_seat[gs.last_discard_player_index]
+        gs.game_phase = _PLAYER_DRAW  # 设置为摸牌阶段，由 auto_flow 处理
 
     # ======================================================================
     # == 结算逻辑 ==
@@ -415,5 +489,5 @@ class GameController:
         self.gamestate.apply_next_hand_state(next_state_config)
 
         # 4. 设置阶段
-        self.gamestate.game_phase = GamePhase.HAND_OVER_SCORES
+        self.gamestate.game_phase = _HAND_OVER_SCORES
         # 下一次 step 或 auto_flow 会处理新局开始或游戏结束
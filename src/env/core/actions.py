@@ -9,17 +9,32 @@ import numpy as np
 # --- I. 用户提供的核心数据结构 ---
 
 
-@dataclass(frozen=True)  # 使Tile不可变（更安全）
+# 牌 id: 0-33 为普通牌 (= value), 34/35/36 为赤五万/筒/索;
+# 其它 value 的赤牌 (规则上不存在, 仅测试可能构造) 映射到 37+value, 保证 id 唯一
+RED_TILE_ID = {4: 34, 13: 35, 22: 36}
+
+
+@dataclass(frozen=True, slots=True)  # 使Tile不可变（更安全）, slots 省去实例 __dict__
 class Tile:
     """麻将牌表示（值0-33）"""
 
     value: int  # 0-8: 1-9万，9-17: 1-9筒，18-26: 1-9条，27-30: 东南西北，31-33: 白发中
     is_red: bool = False  # 是否是赤宝牌
+    # 预计算的整数 id (见 RED_TILE_ID): 相等/哈希只比较这一个 int, 不再逐字段比较
+    tid: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         # 添加对牌值的验证
         if not (0 <= self.value < 34):
             raise ValueError(f"无效的牌值: {self.value}")
+        value = self.value
+        tid = RED_TILE_ID.get(value, 37 + value) if self.is_red else value
+        object.__setattr__(self, "tid", tid)
+
+    def __eq__(self, other):
+        if other.__class__ is Tile:
+            return self.tid == other.tid
+        return NotImplemented
 
     def __lt__(self, other):
         # 允许牌的排序
@@ -28,15 +43,43 @@ class Tile:
         return self.value < other.value
 
     def __hash__(self):
-        # 使Tile可哈希，用于集合/字典
-        return hash((self.value, self.is_red))
+        # 使Tile可哈希，用于集合/字典 (与 __eq__ 一致, 只看 tid)
+        return self.tid
 
     def __str__(self):
-        # 基本字符串表示（可增强）
-        return f"T({self.value}{'r' if self.is_red else ''})"
+        # 常规 id 查预格式化表 (TILE_STR), 非常规赤牌现格式化
+        tid = self.tid
+        if tid < _NUM_TILE_IDS:
+            return TILE_STR[tid]
+        return _format_tile(self.value, self.is_red)
 
-    def __repr__(self):
-        return self.__str__()
+    __repr__ = __str__
+
+
+def _format_tile(value: int, is_red: bool) -> str:
+    """牌的基本字符串表示（可增强）"""
+    return f"T({value}{'r' if is_red else ''})"
+
+
+# 牌 id -> 字符串 (驻留): 0-33 普通牌, 34-36 赤五 (见 RED_TILE_ID)
+_NUM_TILE_IDS = 34 + len(RED_TILE_ID)
+TILE_STR: Tuple[str, ...] = tuple(
+    sys.intern(_format_tile(v, False)) for v in range(34)
+) + tuple(
+    sys.intern(_format_tile(v, True)) for v in sorted(RED_TILE_ID, key=RED_TILE_ID.get)
+)
+
+# 共享牌实例 (flyweight): Tile 不可变, 同 (value, is_red) 的牌复用同一对象, 不再逐次分配
+_SHARED_TILES: Tuple[Tile, ...] = tuple(Tile(value=v) for v in range(34))
+_SHARED_RED_TILES = {v: Tile(value=v, is_red=True) for v in RED_TILE_ID}
+
+
+def make_tile(value: int, is_red: bool = False) -> Tile:
+    """按 (value, is_red) 取共享的 Tile 实例; 非常规赤牌 / 非法 value 仍现构造 (照常校验)"""
+    if not is_red and 0 <= value < 34:
+        return _SHARED_TILES[value]
+    tile = _SHARED_RED_TILES.get(value) if is_red else None
+    return tile if tile is not None else Tile(value=value, is_red=is_red)
 
 
 class ActionType(Enum):
@@ -62,7 +105,12 @@ class KanType(Enum):
     OPEN = auto()  # 大明杠（Daiminkan）- 对弃牌进行杠
 
 
-@dataclass(frozen=True)
+# 以 tile 为主参数的动作类型 (特征编码时写入 tile one-hot); 模块级 frozenset, 不在每次编码时重建列表
+_TILE_PARAM_TYPES = frozenset((ActionType.DISCARD, ActionType.PON, ActionType.KAN))
+_WIN_TYPES = frozenset((ActionType.TSUMO, ActionType.RON))
+
+
+@dataclass(frozen=True, slots=True)  # 每步为每个候选生成一个 Action, slots 省去实例 __dict__
 class Action:
     """完整的麻将动作表示"""
 
@@ -125,7 +173,7 @@ class Action:
 
         # 编码参数 (简化，仅包含与 Tile 相关的核心逻辑)
         primary_tile = None
-        if self.type in [ActionType.DISCARD, ActionType.PON, ActionType.KAN]:
+        if self.type in _TILE_PARAM_TYPES:
             primary_tile = self.tile
         elif self.type == ActionType.RIICHI:
             primary_tile = self.riichi_discard
@@ -162,7 +210,7 @@ class Action:
             parts.append(f"kan_type={self.kan_type.name}")
         if self.riichi_discard and self.type == ActionType.RIICHI:
             parts.append(f"riichi_discard={self.riichi_discard}")
-        if self.winning_tile and self.type in [ActionType.TSUMO, ActionType.RON]:
+        if self.winning_tile and self.type in _WIN_TYPES:
             parts.append(f"winning_tile={self.winning_tile}")
 
         return f"Action({', '.join(parts)})"
@@ -1,19 +1,69 @@
 from __future__ import annotations
-import random
+import bisect
+import functools
+import operator
+import logging
 from enum import Enum, auto
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Tuple, Set, TYPE_CHECKING  # 引入类型提示
-from collections import Counter
-from .actions import Action, ActionType, Tile, KanType
+from dataclasses import dataclass, field, replace
+from typing import List, Optional, Dict, Any, Tuple, Set, Deque, TYPE_CHECKING  # 引入类型提示
+from collections import Counter, deque
 
-# 把模块内 print 重绑到 logger.debug (默认 WARNING 级别静默, --verbose 才输出)
-from src.utils.logger import get_logger as _get_logger
-print = _get_logger(__name__).debug
+import numpy as np
+from .actions import Action, ActionType, Tile, KanType, RED_TILE_ID, TILE_STR, make_tile
+from .rules.constants import NEXT_DORA_VALUE
 
+# 把模块内 print 重绑到 mjagent.env.* 的 logger.debug (默认 INFO 级别静默, --verbose 才输出)
+# 热路径上的 f-string 日志先用 _log.isEnabledFor 守卫, 关闭 DEBUG 时不做格式化
+from src.utils.logger import get_env_logger as _get_logger
+_log = _get_logger(__name__)
+print = _log.debug
 
-@dataclass(frozen=True)
+# 预先驻留的牌实例: 牌组/宝牌只复用这些单例, 不再逐张构造
+_TILE_POOL: Tuple[Tile, ...] = tuple(make_tile(v) for v in range(34))
+_RED_TILE_POOL: Dict[int, Tile] = {v: make_tile(v, True) for v in (4, 13, 22)}
+
+# 动作事件环形缓冲默认长度 (只保留最近 N 条 (player, action), 回放/调试时再按需格式化)
+_EVENT_LOG_SIZE = 256
+
+# 一局最多公开的宝牌指示牌数 (开局 1 张 + 4 次杠)
+_MAX_DORA_INDICATORS = 5
+
+# 手牌按 value 有序 (同 Tile.__lt__), 二分插入用的取键函数
+_tile_value = operator.attrgetter("value")
+
+# 赤五所在 value -> 花色位 (PlayerState.red_fives 位掩码: bit0 万, bit1 筒, bit2 索)
+_RED_FIVE_BIT = {4: 1, 13: 2, 22: 4}
+
+# 鸣牌/杠热路径上反复比较的枚举成员, 提到模块级后用 is 比较 (省去每次的类属性查找)
+_CHI = ActionType.CHI
+_PON = ActionType.PON
+_KAN = ActionType.KAN
+_KAN_OPEN = KanType.OPEN
+_KAN_CLOSED = KanType.CLOSED
+_KAN_ADDED = KanType.ADDED
+
+
+@functools.lru_cache(maxsize=None)
+def seat_winds(dealer_index: int, num_players: int) -> Tuple[int, ...]:
+    """各座位的自风 (0=东 .. 3=北), 按 (庄家, 人数) 只计算一次; 非 4 人局同样适用"""
+    return tuple((i - dealer_index) % num_players for i in range(num_players))
+
+
+@functools.lru_cache(maxsize=None)
+def responder_order(discarder_index: int, num_players: int) -> Tuple[int, ...]:
+    """打牌者之后的座位顺序 (下家→对家→上家), 按 (打牌者, 人数) 只计算一次"""
+    return tuple((discarder_index + i) % num_players for i in range(1, num_players))
+
+
+@functools.lru_cache(maxsize=None)
+def next_seats(num_players: int) -> Tuple[int, ...]:
+    """下家查表: next_seats(n)[i] == (i + 1) % n, 按人数只计算一次"""
+    return tuple((i + 1) % num_players for i in range(num_players))
+
+
+@dataclass(frozen=True, slots=True)
 class Meld:
-    """表示一个副露 (吃, 碰, 杠)"""
+    """表示一个副露 (吃, 碰, 杠)。不可变, 变更 (如加杠) 用 dataclasses.replace 生成新对象"""
 
     type: ActionType  # CHI, PON, KAN
     tiles: Tuple[Tile, ...]  # 组成该副露的牌 (对于KAN是4张，PON是3张，CHI是3张)
@@ -21,6 +71,23 @@ class Meld:
     called_tile: Optional[Tile] = None  # 对于吃/碰/明杠，具体是哪张被叫的牌
 
 
+# 副露种类编码 (与 StateEncoder 副露 type one-hot 的下标一致)
+MELD_KIND_CHI = 0
+MELD_KIND_PON = 1
+MELD_KIND_OPEN_KAN = 2  # 大明杠 / 加杠 (from_player 为他家)
+MELD_KIND_CLOSED_KAN = 3  # 暗杠 (from_player 为自己)
+
+
+def meld_kind(meld: Meld, owner_idx: int) -> int:
+    """副露 -> 种类编码"""
+    mtype = meld.type
+    if mtype is _CHI:
+        return MELD_KIND_CHI
+    if mtype is _PON:
+        return MELD_KIND_PON
+    return MELD_KIND_CLOSED_KAN if meld.from_player == owner_idx else MELD_KIND_OPEN_KAN
+
+
 class GamePhase(Enum):
     """枚举类型表示游戏当前阶段"""
 
@@ -35,7 +102,7 @@ class GamePhase(Enum):
     GAME_OVER = auto()  # 整场游戏结束
 
 
-@dataclass
+@dataclass(slots=True)  # slots: 去掉实例 __dict__ (4 玩家 x 多并行环境), 属性访问走槽描述符
 class PlayerState:
     """表示单个玩家的状态"""
 
@@ -45,9 +112,10 @@ class PlayerState:
     seat_wind: int = 0  # 0-3: 东东南西 (初始化时应被覆盖)
 
     # --- 手牌与副露 (核心数据) ---
-    hand: List[Tile] = field(default_factory=list)  # 手牌 (不含副露)
-    melds: List[Meld] = field(default_factory=list)  # 副露 (吃碰杠)
-    discards: List[Tile] = field(default_factory=list)  # 弃牌河
+    # 手牌 / 副露 / 弃牌河存于私有槽, 经同名 property 读写 (整体赋值时重建对应索引, 见下)
+    _hand: List[Tile] = field(default_factory=list, init=False)  # 手牌 (不含副露)
+    _melds: List[Meld] = field(default_factory=list, init=False)  # 副露 (吃碰杠)
+    _discards: List[Tile] = field(default_factory=list, init=False)  # 弃牌河
     drawn_tile: Optional[Tile] = None  # 当前摸到的牌 (尚未切出或加入手牌)
 
     # --- 立直相关状态 ---
@@ -71,11 +139,274 @@ class PlayerState:
     # --- 统计/结算信息 ---
     has_won: bool = False  # 是否和牌
 
+    # --- 手牌计数索引 (与 hand 同步维护, 供 O(1) 张数查询) ---
+    hand_counts: List[int] = field(
+        default_factory=lambda: [0] * 34, init=False, repr=False, compare=False
+    )  # 按 value 的张数 (含赤牌)
+    red_fives: int = field(default=0, init=False, repr=False, compare=False)  # 手中赤五位掩码
+    # 碰副露的 value 集合 (加杠判定 O(1), 随 melds 同步维护)
+    pon_values: Set[int] = field(default_factory=set, init=False, repr=False, compare=False)
+    kan_count: int = field(default=0, init=False, repr=False, compare=False)  # 杠副露个数
+    # 与 melds 平行的种类编码列表 (MELD_KIND_*), 编码/役判定直接读整数, 不再逐个比较 Meld.type
+    meld_kinds: List[int] = field(default_factory=list, init=False, repr=False, compare=False)
+    # 与 melds 平行的首张牌 value 列表 (碰/杠即该副露的 value), 加杠查找对应碰副露只比较整数
+    meld_values: List[int] = field(default_factory=list, init=False, repr=False, compare=False)
+    # 弃牌河 value 位掩码 (bit v = 打过 value v; 舍牌振听 O(1) 判定, 随 discards 同步维护)
+    discards_mask: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.rebuild_hand_counts()
+        self.rebuild_meld_index()
+        self.rebuild_discards_mask()
+
+    # 整体替换手牌 / 副露 / 弃牌河 (测试 / 牌谱回放直接赋值) 时由 setter 重建对应索引;
+    # 其余字段是普通槽写入, 热路径上的标记读写不经过任何 Python 钩子
+    @property
+    def hand(self) -> List[Tile]:
+        return self._hand
+
+    @hand.setter
+    def hand(self, tiles: List[Tile]):
+        self._hand = tiles
+        self.rebuild_hand_counts()
+
+    @property
+    def melds(self) -> List[Meld]:
+        return self._melds
+
+    @melds.setter
+    def melds(self, melds: List[Meld]):
+        self._melds = melds
+        self.rebuild_meld_index()
+
+    @property
+    def discards(self) -> List[Tile]:
+        return self._discards
+
+    @discards.setter
+    def discards(self, tiles: List[Tile]):
+        self._discards = tiles
+        self.rebuild_discards_mask()
+
+    def rebuild_discards_mask(self):
+        """按当前 discards 列表重建 discards_mask"""
+        mask = 0
+        for t in self._discards:
+            mask |= 1 << t.value
+        self.discards_mask = mask
+
+    def add_discard(self, tile: Tile):
+        """打出的牌放入弃牌河"""
+        self._discards.append(tile)
+        self.discards_mask |= 1 << tile.value
+
+    def rebuild_meld_index(self):
+        """按当前 melds 列表重建 pon_values / kan_count / meld_kinds / meld_values"""
+        melds = self._melds
+        self.pon_values = {m.tiles[0].value for m in melds if m.type is _PON}
+        self.kan_count = sum(1 for m in melds if m.type is _KAN)
+        self.meld_kinds = [meld_kind(m, self.player_index) for m in melds]
+        self.meld_values = [m.tiles[0].value for m in melds]
+
+    def add_meld(self, meld: Meld):
+        """追加一个副露"""
+        self._melds.append(meld)
+        self.meld_kinds.append(meld_kind(meld, self.player_index))
+        self.meld_values.append(meld.tiles[0].value)
+        if meld.type is _PON:
+            self.pon_values.add(meld.tiles[0].value)
+        elif meld.type is _KAN:
+            self.kan_count += 1
+
+    def replace_meld(self, index: int, meld: Meld):
+        """替换第 index 个副露 (加杠: PON -> KAN)"""
+        old = self._melds[index]
+        self._melds[index] = meld
+        self.meld_kinds[index] = meld_kind(meld, self.player_index)
+        self.meld_values[index] = meld.tiles[0].value
+        if old.type is _PON:
+            self.pon_values.discard(old.tiles[0].value)
+        elif old.type is _KAN:
+            self.kan_count -= 1
+        if meld.type is _PON:
+            self.pon_values.add(meld.tiles[0].value)
+        elif meld.type is _KAN:
+            self.kan_count += 1
+
+    def find_pon(self, value: int) -> int:
+        """value 对应碰副露在 melds 中的下标 (无则 -1); 只扫平行的整数列表, 不访问 Meld 对象"""
+        if value not in self.pon_values:
+            return -1
+        kinds = self.meld_kinds
+        for i, v in enumerate(self.meld_values):
+            if v == value and kinds[i] == MELD_KIND_PON:
+                return i
+        return -1
+
+    def rebuild_hand_counts(self):
+        """按当前 hand 列表重建 hand_counts / red_fives"""
+        counts = [0] * 34
+        red = 0
+        for t in self._hand:
+            counts[t.value] += 1
+            if t.is_red:
+                red |= _RED_FIVE_BIT.get(t.value, 0)
+        self.hand_counts = counts
+        self.red_fives = red
+
+    def count_in_hand(self, value: int) -> int:
+        """手牌 (不含 drawn_tile) 中该 value 的张数"""
+        return self.hand_counts[value]
+
+    def has_tile(self, tile: Tile) -> bool:
+        """手牌中是否有该牌实例 (赤五与普通五区分), O(1)"""
+        n = self.hand_counts[tile.value]
+        bit = _RED_FIVE_BIT.get(tile.value, 0)
+        if tile.is_red:
+            return bool(self.red_fives & bit)
+        return n - (1 if self.red_fives & bit else 0) > 0
+
+    def add_to_hand(self, tile: Tile):
+        """向手牌加入一张牌 (不排序)"""
+        self._hand.append(tile)
+        self.hand_counts[tile.value] += 1
+        if tile.is_red:
+            self.red_fives |= _RED_FIVE_BIT.get(tile.value, 0)
+
+    def insert_sorted(self, tile: Tile):
+        """
+        向 (已理好的) 手牌插入一张牌并保持有序: 二分定位后一次插入,
+        结果与 add_to_hand + hand.sort() 相同 (同 value 排在已有牌之后), 但不再整手比较。
+        """
+        bisect.insort_right(self._hand, tile, key=_tile_value)
+        self.hand_counts[tile.value] += 1
+        if tile.is_red:
+            self.red_fives |= _RED_FIVE_BIT.get(tile.value, 0)
+
+    def extend_hand(self, tiles: List[Tile]):
+        """向手牌批量加入多张牌 (配牌用, 不排序)"""
+        self._hand.extend(tiles)
+        counts = self.hand_counts
+        for t in tiles:
+            counts[t.value] += 1
+            if t.is_red:
+                self.red_fives |= _RED_FIVE_BIT.get(t.value, 0)
+
+    def remove_from_hand(self, tile: Tile) -> bool:
+        """从手牌移除一张牌实例, 不存在时返回 False 且不改动手牌"""
+        if not self.has_tile(tile):
+            return False
+        # 手牌按 value 有序: 二分到该 value 的第一张, 只在同 value 的 (至多 4 张) 里找实例,
+        # 不再从头逐张 Tile.__eq__; 手牌未理好 (测试直接赋值乱序手牌) 时退回 list.remove
+        hand = self._hand
+        value = tile.value
+        tid = tile.tid
+        i = bisect.bisect_left(hand, value, key=_tile_value)
+        n = len(hand)
+        while i < n and hand[i].value == value:
+            if hand[i].tid == tid:
+                del hand[i]
+                break
+            i += 1
+        else:
+            hand.remove(tile)
+        self.hand_counts[value] -= 1
+        if tile.is_red:
+            self.red_fives &= ~_RED_FIVE_BIT.get(tile.value, 0)
+        return True
+
+    def remove_tiles(self, tiles: List[Tile]) -> bool:
+        """
+        从手牌一次移除多张牌实例: 单趟重建列表, 不逐张 list.remove。
+        有任何一张不在手牌中时返回 False 且手牌不变。
+        """
+        need: Dict[Tile, int] = {}
+        for t in tiles:
+            need[t] = need.get(t, 0) + 1
+        left = len(tiles)
+        kept: List[Tile] = []
+        for t in self._hand:
+            n = need.get(t, 0) if left else 0
+            if n:
+                need[t] = n - 1
+                left -= 1
+            else:
+                kept.append(t)
+        if left:
+            return False
+        self._hand[:] = kept
+        counts = self.hand_counts
+        for t in tiles:
+            counts[t.value] -= 1
+            if t.is_red:
+                self.red_fives &= ~_RED_FIVE_BIT.get(t.value, 0)
+        return True
+
+    def take_by_value(self, value: int, n: int) -> Optional[List[Tile]]:
+        """
+        按 value 从手牌取出 n 张 (手牌顺序的前 n 张) 并返回这些实例。
+        先按计数索引 O(1) 校验, 不足时返回 None 且手牌不变; 之后对有序手牌切片删除,
+        乱序时单趟原地重建列表, 都不再逐张 list.remove。
+        """
+        total = self.hand_counts[value]
+        if total < n:
+            return None
+        hand = self._hand
+        # 手牌有序时同 value 的牌连续: 二分到段首, 若该段恰好含全部 total 张,
+        # 前 n 张就是手牌顺序的前 n 张, 直接切片删除, 不再整手重建
+        i = bisect.bisect_left(hand, value, key=_tile_value)
+        j = i + total
+        if j <= len(hand) and hand[j - 1].value == value and all(
+            t.value == value for t in hand[i:j]
+        ):
+            taken = hand[i:i + n]
+            del hand[i:i + n]
+        else:
+            # 乱序手牌 (测试直接赋值) 退回单趟重建
+            taken = []
+            kept: List[Tile] = []
+            for t in hand:
+                if len(taken) < n and t.value == value:
+                    taken.append(t)
+                else:
+                    kept.append(t)
+            hand[:] = kept
+        self.hand_counts[value] -= n
+        # 只有五且本手持有该色赤五时才需扫描取出的牌
+        bit = _RED_FIVE_BIT.get(value)
+        if bit and self.red_fives & bit and any(t.is_red for t in taken):
+            self.red_fives &= ~bit
+        return taken
+
+    def sort_hand(self):
+        """
+        按 hand_counts 计数排序重建手牌 (理牌), 与 hand.sort() 结果等价:
+        遍历 34 个 value 直接输出, 不做逐对 Tile.__lt__ 比较。同 value 的赤五排在最前。
+        """
+        hand: List[Tile] = []
+        red = self.red_fives
+        for v, c in enumerate(self.hand_counts):
+            if c:
+                bit = _RED_FIVE_BIT.get(v, 0)
+                if red & bit:
+                    hand.append(_RED_TILE_POOL[v])
+                    c -= 1
+                hand += [_TILE_POOL[v]] * c
+        # 计数不变, 无需重建索引
+        self._hand = hand
+
     def reset_hand(self):
         """重置玩家状态以开始新局"""
-        self.hand.clear()
-        self.melds.clear()
-        self.discards.clear()
+        self._hand.clear()
+        self.hand_counts = [0] * 34
+        self.red_fives = 0
+        self._melds.clear()
+        self.pon_values.clear()
+        self.kan_count = 0
+        self.meld_kinds.clear()
+        self.meld_values.clear()
+        self._discards.clear()
+        self.discards_mask = 0
         self.drawn_tile = None
 
         self.riichi_declared = False
@@ -99,6 +430,60 @@ class PlayerState:
         return False  # 占位，实际逻辑在外部处理
 
 
+@functools.lru_cache(maxsize=4)
+def _make_template(use_red_fives: bool) -> Tuple[Tile, ...]:
+    """生成一副完整牌组的不可变模板 (按 value 排列, 每种 5 各含一张赤牌)"""
+    tiles = []
+    # 万子, 筒子, 索子 (0-26)
+    for suit_offset in range(0, 27, 9):
+        for value in range(9):  # 1-9
+            tile_val = suit_offset + value
+            # 处理赤宝牌 (假设每种5各有一张赤牌)
+            num_normal = 4
+            is_red_possible = value == 4  # 值是5 (索引为4)
+            if use_red_fives and is_red_possible:
+                tiles.append(_RED_TILE_POOL[tile_val])
+                num_normal = 3
+            tiles.extend([_TILE_POOL[tile_val]] * num_normal)
+    # 字牌 (27-33)
+    for value in range(27, 34):
+        tiles.extend([_TILE_POOL[value]] * 4)
+
+    # 验证总数是否正确
+    assert len(tiles) == 136, "牌数应为136"
+
+    return tuple(tiles)
+
+
+# 牌 id (即 Tile.tid, 见 actions.RED_TILE_ID): 0-33 为普通牌, 34/35/36 为赤五万/筒/索;
+# 洗牌只打乱 id 数组
+_ID_TO_TILE: Tuple[Tile, ...] = _TILE_POOL + tuple(
+    _RED_TILE_POOL[v] for v in sorted(RED_TILE_ID)
+)
+
+
+def _tile_id(tile: Tile) -> int:
+    """Tile -> 牌 id (见 _ID_TO_TILE)"""
+    return tile.tid
+
+
+_ROUND_WIND_NAMES: Tuple[str, ...] = ("东", "南", "西", "北")
+
+
+@functools.lru_cache(maxsize=None)
+def round_name(round_wind: int, round_number: int) -> str:
+    """局名字符串 (如 "东1"), 按 (场风, 局数) 只格式化一次, get_info 每步直接复用"""
+    return f"{_ROUND_WIND_NAMES[round_wind % 4]}{round_number}"
+
+
+@functools.lru_cache(maxsize=4)
+def _make_template_ids(use_red_fives: bool) -> np.ndarray:
+    """与 _make_template 同序的牌 id 模板 (只读 uint8[136], 洗牌前 copy)"""
+    ids = np.array([_tile_id(t) for t in _make_template(use_red_fives)], dtype=np.uint8)
+    ids.setflags(write=False)
+    return ids
+
+
 class Wall:
     """表示牌墙，包含王牌和宝牌指示牌"""
 
@@ -106,51 +491,69 @@ class Wall:
     NUM_DEAD_WALL = 14  # 王牌区固定14张
     NUM_REPLACEMENT_TILES = 4  # 岭上牌数量
 
-    def __init__(self, config: Optional[Dict] = None, rng: Optional[random.Random] = None):
+    __slots__ = (
+        "config",
+        "rng",
+        "_live_ids",
+        "_live_cursor",
+        "dead_wall_tiles",
+        "dora_indicators",
+        "ura_dora_indicators",
+        "replacement_tiles_drawn",
+        "_dora_version",
+        "_dora_cache",
+        "_dora_cache_key",
+        "_dora_cache_src",
+        "_dora_ids",
+        "_dora_ids_count",
+        "_dora_ids_key",
+        "_dora_ids_src",
+    )
+
+    def __init__(self, config: Optional[Dict] = None, rng: Optional[np.random.Generator] = None):
         self.config = config or {}
-        # 独立的随机数发生器 (支持 seed 复现); None 时退回全局 random
-        self.rng = rng if rng is not None else random
-        self.live_tiles: List[Tile] = []  # 可供正常摸牌的牌
+        # 独立的随机数发生器 (支持 seed 复现); 未传入时按 config["seed"] 新建 (无 seed 即不设种子)
+        self.rng = rng if rng is not None else np.random.default_rng(self.config.get("seed"))
+        # 活动牌墙: 洗牌后不再修改, 存牌 id, 用游标 _live_cursor 摸牌时再映射为 Tile
+        # (避免 list.pop(0) 的 O(n) 移位)
+        self._live_ids: List[int] = []
+        self._live_cursor: int = 0
         self.dead_wall_tiles: List[Tile] = []  # 王牌区的牌 (包含岭上牌和指示牌)
         self.dora_indicators: List[Tile] = []  # 当前已公开的宝牌指示牌
         self.ura_dora_indicators: List[Tile] = []  # 里宝牌指示牌 (立直和牌后才公开)
         self.replacement_tiles_drawn: int = 0  # 已摸取的岭上牌数量 (0-4)
 
+        # 宝牌缓存: 指示牌每局最多变化 5 次, 按版本号失效
+        self._dora_version: int = 0  # shuffle_and_setup / reveal_new_dora 时递增
+        self._dora_cache: List[Tile] = []
+        self._dora_cache_key: Optional[Tuple[int, int]] = None
+        self._dora_cache_src: Optional[List[Tile]] = None  # 缓存对应的指示牌列表对象
+        # 指示牌 value 的定长 int8 数组 (开局 1 张 + 4 次杠宝牌 = 最多 5 张, 未用位为 -1),
+        # 前 _dora_ids_count 位有效; 编码器等热路径直接取切片, 失效规则同 _dora_cache
+        self._dora_ids: np.ndarray = np.full(_MAX_DORA_INDICATORS, -1, dtype=np.int8)
+        self._dora_ids_count: int = 0
+        self._dora_ids_key: Optional[Tuple[int, int]] = None
+        self._dora_ids_src: Optional[List[Tile]] = None
+
         # TODO: 实现赤宝牌逻辑 (根据 config)
 
     def _generate_tiles(self) -> List[Tile]:
         """生成一副完整的麻将牌 (包括可能的赤宝牌)"""
-        tiles = []
-        # 万子, 筒子, 索子 (0-26)
-        for suit_offset in range(0, 27, 9):
-            for value in range(9):  # 1-9
-                tile_val = suit_offset + value
-                # 处理赤宝牌 (假设每种5各有一张赤牌)
-                num_normal = 4
-                is_red_possible = value == 4  # 值是5 (索引为4)
-                # TODO: 从 config 读取赤宝牌配置
-                use_red_fives = self.config.get("use_red_fives", True)
-                if use_red_fives and is_red_possible:
-                    tiles.append(Tile(value=tile_val, is_red=True))
-                    num_normal = 3
-                tiles.extend([Tile(value=tile_val, is_red=False)] * num_normal)
-        # 字牌 (27-33)
-        for value in range(27, 34):
-            tiles.extend([Tile(value=value, is_red=False)] * 4)
-
-        # 验证总数是否正确
-        assert len(tiles) == 136, "暂不支持赤宝牌，牌数应为136"  # 强制标准牌数
-
-        return tiles
+        # 牌组内容只取决于赤宝牌配置, 复用模块级缓存的模板, 每局只做一次浅拷贝
+        return list(_make_template(bool(self.config.get("use_red_fives", True))))
 
     def shuffle_and_setup(self):
         """洗牌并设置牌墙、宝牌指示牌"""
-        all_tiles = self._generate_tiles()
-        self.rng.shuffle(all_tiles)
-
-        num_live = len(all_tiles) - self.NUM_DEAD_WALL
-        self.live_tiles = all_tiles[:num_live]
-        self.dead_wall_tiles = all_tiles[num_live:]
+        # 在 uint8 id 数组上做 C 层洗牌, 不再逐个交换 136 个 Tile 对象;
+        # permutation 对只读模板一次完成 copy + shuffle (随机流与 copy 后 shuffle 相同)
+        ids = self.rng.permutation(
+            _make_template_ids(bool(self.config.get("use_red_fives", True)))
+        ).tolist()
+
+        num_live = len(ids) - self.NUM_DEAD_WALL
+        self._live_ids = ids[:num_live]
+        self._live_cursor = 0
+        self.dead_wall_tiles = [_ID_TO_TILE[i] for i in ids[num_live:]]
         self.replacement_tiles_drawn = 0  # 重置已摸岭上牌计数
 
         # 设置初始宝牌指示牌 (标准日麻：从右数第3墩上层牌)
@@ -170,15 +573,36 @@ class Wall:
         else:
             self.dora_indicators = [self.dead_wall_tiles[dora_indicator_index]]
             self.ura_dora_indicators = [self.dead_wall_tiles[ura_dora_indicator_index]]
+        self._dora_version += 1
 
         # print(f"牌墙设置: {len(self.live_tiles)} 张活动牌, {len(self.dead_wall_tiles)} 张王牌.")
-        print(f"初始宝牌指示牌: {self.dora_indicators[0]}")
+        if _log.isEnabledFor(logging.DEBUG):
+            print(f"初始宝牌指示牌: {self.dora_indicators[0]}")
+
+    @property
+    def live_tiles(self) -> List[Tile]:
+        """尚未摸取的活动牌 (副本, 仅供调试/测试查看)"""
+        return [_ID_TO_TILE[i] for i in self._live_ids[self._live_cursor:]]
+
+    @live_tiles.setter
+    def live_tiles(self, tiles: List[Tile]):
+        self._live_ids = [_tile_id(t) for t in tiles]
+        self._live_cursor = 0
 
     def draw_tile(self) -> Optional[Tile]:
         """从活动牌墙摸一张牌"""
-        if not self.live_tiles:
+        cursor = self._live_cursor
+        if cursor >= len(self._live_ids):
             return None
-        return self.live_tiles.pop(0)  # 从牌尾摸牌 (列表开头)
+        self._live_cursor = cursor + 1
+        return _ID_TO_TILE[self._live_ids[cursor]]  # 从牌尾摸牌 (列表开头)
+
+    def draw_tiles(self, n: int) -> List[Tile]:
+        """从活动牌墙按顺序一次摸 n 张 (配牌用): 一次切片代替 n 次 draw_tile, 余牌不足时只返回剩余的"""
+        start = self._live_cursor
+        ids = self._live_ids[start:start + n]
+        self._live_cursor = start + len(ids)
+        return [_ID_TO_TILE[i] for i in ids]
 
     def draw_replacement_tile(self) -> Optional[Tile]:
         """杠后从王牌区摸一张岭上牌"""
@@ -213,7 +637,9 @@ class Wall:
                 new_ura = self.dead_wall_tiles[new_ura_dora_index]
                 self.dora_indicators.append(new_dora)
                 self.ura_dora_indicators.append(new_ura)
-                print(f"杠后公开新宝牌指示牌: {new_dora}")
+                self._dora_version += 1
+                if _log.isEnabledFor(logging.DEBUG):
+                    print(f"杠后公开新宝牌指示牌: {new_dora}")
                 return new_dora
             else:
                 print(f"错误：尝试公开新宝牌时王牌区索引越界！")
@@ -222,28 +648,13 @@ class Wall:
 
     def get_remaining_live_tiles_count(self) -> int:
         """返回活动牌墙剩余牌数"""
-        return len(self.live_tiles)
+        return len(self._live_ids) - self._live_cursor
 
     def _calculate_next_tile_value(self, value: int) -> int:
         """内部方法：根据指示牌的value计算下一个宝牌的value"""
-        # 万子/筒子/索子 (0-26)
-        if 0 <= value <= 26:
-            suit_offset = (value // 9) * 9  # 0, 9, 18
-            number_in_suit = value % 9  # 0-8 (对应 1-9)
-            # 宝牌是数字+1，但9的宝牌是1
-            next_number_in_suit = (number_in_suit + 1) % 9  # 8(9) -> 0(1)
-            return suit_offset + next_number_in_suit
-        # 风牌 (27-30) 东南北西
-        elif 27 <= value <= 30:
-            # 东(27)->南(28)->西(29)->北(30)->东(27)
-            return 27 + ((value - 27 + 1) % 4)
-        # 三元牌 (31-33) 白发中
-        elif 31 <= value <= 33:
-            # 白(31)->发(32)->中(33)->白(31)
-            return 31 + ((value - 31 + 1) % 3)
-        else:
-            # 理论上不应该有其他值
+        if not 0 <= value < 34:
             raise ValueError(f"Invalid tile value for calculating Dora: {value}")
+        return NEXT_DORA_VALUE[value]
 
     def get_current_dora_tiles(self) -> List[Tile]:
         """
@@ -251,24 +662,36 @@ class Wall:
         这些是 Tile 实例，代表哪些牌是宝牌，但不包含其原本的 is_red 属性。
         是否是红宝牌是在渲染时判断原始牌实例的 is_red 属性。
         """
-        current_dora_tiles: List[Tile] = []
-        for indicator_tile in self.dora_indicators:
-            try:
-                # 根据指示牌的 value 计算出宝牌的 value
-                dora_value = self._calculate_next_tile_value(indicator_tile.value)
-                # 创建一个代表这个宝牌的 Tile 实例，is_red 设为 False，因为宝牌本身不带红色属性
-                # 红宝牌是牌局中实际存在的红色的牌，如果它的 value 恰好是宝牌值，那它就是红宝牌。
-                # 这里的 Tile 实例仅用于判断哪些 value 是宝牌。
-                current_dora_tiles.append(
-                    Tile(value=dora_value, is_red=False)
-                )  # 注意这里 is_red=False
-            except ValueError as e:
-                print(
-                    f"Warning: Could not calculate Dora for indicator {indicator_tile}: {e}"
-                )
-                # 可以在这里添加一个占位符牌或者忽略，取决于你希望如何处理错误
-                pass  # 简单忽略错误指示牌
-        return current_dora_tiles
+        # 缓存键: 版本号 + 列表身份/长度 (外部直接赋值或 append 指示牌时同样失效)
+        key = (self._dora_version, len(self.dora_indicators))
+        if key == self._dora_cache_key and self._dora_cache_src is self.dora_indicators:
+            return list(self._dora_cache)
+
+        # 指示牌 value 由 Tile 构造时保证在 0-33, 直接查表
+        current_dora_tiles = [
+            _TILE_POOL[NEXT_DORA_VALUE[indicator.value]] for indicator in self.dora_indicators
+        ]
+        self._dora_cache = current_dora_tiles
+        self._dora_cache_key = key
+        self._dora_cache_src = self.dora_indicators
+        return list(current_dora_tiles)
+
+    def get_dora_indicator_ids(self) -> np.ndarray:
+        """已公开指示牌的 value (int8 数组视图, 只读使用); 指示牌未变化时不重写数组"""
+        indicators = self.dora_indicators
+        n = len(indicators)
+        key = (self._dora_version, n)
+        if key != self._dora_ids_key or self._dora_ids_src is not indicators:
+            if n > len(self._dora_ids):  # 外部直接赋值了超长列表, 按需扩容
+                self._dora_ids = np.full(n, -1, dtype=np.int8)
+            ids = self._dora_ids
+            ids.fill(-1)
+            for i, t in enumerate(indicators):
+                ids[i] = t.value
+            self._dora_ids_count = n
+            self._dora_ids_key = key
+            self._dora_ids_src = indicators
+        return self._dora_ids[: self._dora_ids_count]
 
 
 @dataclass
@@ -280,12 +703,42 @@ class GameState:
     不包含复杂的控制流、规则校验或临时流程状态。
     """
 
+    # 显式 __slots__: 去掉实例 __dict__, 每步大量的状态字段读写走槽描述符 (新增字段须同步登记)
+    __slots__ = (
+        "config",
+        "num_players",
+        "next_seat",
+        "players",
+        "wall",
+        "round_wind",
+        "round_number",
+        "honba",
+        "riichi_sticks",
+        "dealer_index",
+        "initial_dealer_index",
+        "current_player_index",
+        "game_phase",
+        "last_discarded_tile",
+        "last_discard_player_index",
+        "last_action_info",
+        "events",
+        "last_draw_was_rinshan",
+        "_response_candidates",
+        "_response_cache_key",
+        "_hand_over_flag",
+        "_game_over_flag",
+        "turn_number",
+        "hand_outcome_info_temp",
+    )
+
     def __init__(self, config, wall: "Wall"):
         """
         初始化游戏状态。
         """
         self.config = config or {}
         self.num_players = self.config.get("num_players", 4)
+        # 下家座位表 (人数在对局内固定): next_seat[i] 代替每次的 (i + 1) % num_players
+        self.next_seat: Tuple[int, ...] = next_seats(self.num_players)
         initial_score = self.config.get("initial_score", 25000)
 
         # --- 玩家状态列表 ---
@@ -312,7 +765,15 @@ class GameState:
         self.last_discarded_tile: Optional["Tile"] = None  # 最近一次打出的牌
         self.last_discard_player_index: int = -1  # 最近一次打牌的玩家索引
         self.last_action_info: Optional[Dict] = None  # 上一个被应用动作的信息
+        # 最近动作的环形事件日志: 每步只追加 (player_idx, Action) 元组, 不做任何字符串格式化
+        self.events: Deque[Tuple[int, "Action"]] = deque(
+            maxlen=self.config.get("event_log_size", _EVENT_LOG_SIZE)
+        )
         self.last_draw_was_rinshan: bool = False  # 上一次摸牌是否为岭上摸牌 (杠后)，供 Scoring 判定岭上开花
+        # 本次弃牌各响应者的候选动作缓存 {player_idx: [Action]}, 每次打牌时清空 (容器复用)
+        # key = (打牌者, 弃牌); RulesEngine 仅在 key 与当前弃牌一致时读写
+        self._response_candidates: Dict[int, List["Action"]] = {}
+        self._response_cache_key: Optional[Tuple[int, "Tile"]] = None
 
         # --- 局/游戏结束标记 ---
         self._hand_over_flag: bool = False  # 内部标记: 当前局是否结束?
@@ -334,6 +795,7 @@ class GameState:
         self.riichi_sticks = 0
         self.dealer_index = 0  # 初始庄家为 0
         self._game_over_flag = False
+        self.events.clear()
         # 注意：game_phase 由 GameController 在调用此方法后设置
         print("游戏重置：数据已清空。")
 
@@ -342,16 +804,16 @@ class GameState:
         [数据] 重置数据以准备新的一局。
         *不* 负责发牌或设置游戏阶段。
         """
-        print(
-            f"\n--- 新局数据重置: {['东','南','西','北'][self.round_wind]}{self.round_number}局 庄家: {self.dealer_index} 本场: {self.honba} ---"
-        )
+        if _log.isEnabledFor(logging.DEBUG):
+            print(
+                f"\n--- 新局数据重置: {round_name(self.round_wind, self.round_number)}局 庄家: {self.dealer_index} 本场: {self.honba} ---"
+            )
 
         # 1. 重置玩家手牌相关状态并分配座位风
+        winds = seat_winds(self.dealer_index, self.num_players)
         for i, player in enumerate(self.players):
             player.reset_hand()
-            player.seat_wind = (
-                i - self.dealer_index + self.num_players
-            ) % self.num_players
+            player.seat_wind = winds[i]
 
         # 2. 重置牌墙 (洗牌并设置宝牌)
         self.wall.shuffle_and_setup()
@@ -364,6 +826,8 @@ class GameState:
             "info": "NEW_HAND_RESET",
         }
         self.last_draw_was_rinshan = False
+        self._response_candidates.clear()
+        self._response_cache_key = None
         self._hand_over_flag = False
         self.turn_number = 0  # 设为0，第一次摸牌时(DRAW动作)再+1
 
@@ -382,9 +846,10 @@ class GameState:
         # 记录最后一次动作 (用于日志或回放)
         self.last_action_info = {
             "player": player_idx,
-            "type": action.type.name,
+            "type": action.type._name_,  # _name_ 是实例属性, 免去 .name 描述符开销
             "action_obj": action,
         }
+        self.events.append((player_idx, action))
 
         try:
             player = self.players[player_idx]
@@ -392,263 +857,233 @@ class GameState:
             print(f"严重错误: apply_action 收到无效的 player_idx {player_idx}")
             return
 
-        # ==================================================================
-        # 1. 打牌 (DISCARD)
-        # ==================================================================
-        if action.type == ActionType.DISCARD:
-            tile_to_discard = action.tile
-
-            # 优先切出刚摸到的牌 (Tsumogiri): 按 value 判断 (不依赖 is_red 实例一致性)
-            if player.drawn_tile and player.drawn_tile.value == tile_to_discard.value:
-                player.drawn_tile = None
-            else:
-                # 切出手牌中的牌 (Te-dashi)
-                # 如果有摸到的牌，先把它并入手牌 (理牌)
-                if player.drawn_tile:
-                    player.hand.append(player.drawn_tile)
-                    player.drawn_tile = None
-                    player.hand.sort()
-
-                # 移除并校验 (H4: 之前不检查返回值, 失败时手牌膨胀)
-                if not self._remove_tiles_from_hand(player, [tile_to_discard]):
-                    raise RuntimeError(
-                        f"apply_action(DISCARD): 无法从手牌移除 {tile_to_discard}, "
-                        f"手牌张数={len(player.hand)}"
-                    )
-
-            # 添加到弃牌河
-            player.discards.append(tile_to_discard)
-
-            # 更新全局状态
-            self.last_discarded_tile = tile_to_discard
-            self.last_discard_player_index = player_idx
-
-            # 如果这回合立直了，清理临时标记
-            if player.riichi_declared_this_turn:
-                player.riichi_declared_this_turn = False  # 立直成立
-                # player.ippatsu_chance 保持为 True，直到下一次轮换
-
-            # 更新振听状态 (舍牌振听)
-            # (逻辑：如果听牌，且打出的牌是听的牌，则振听)
-            # TODO: 振听判定由 Scoring._is_furiten 负责，详见 YAKU_AND_SCORING_DESIGN §7
-
-        # ==================================================================
-        # 2. 立直 (RIICHI)
-        # ==================================================================
-        elif action.type == ActionType.RIICHI:
-            # 立直宣言 (扣分在下家打牌通过后才结算，但通常简化为立即扣分)
-            # 这里我们立即执行状态变更
-            player.riichi_declared = True
-            player.riichi_declared_this_turn = True  # 标记为“刚立直”，用于一发判断
-            player.ippatsu_chance = True
-
-            player.score -= 1000
-            self.riichi_sticks += 1
-
-            # 立直必定伴随打牌 (Action.riichi_discard)
-            tile_to_discard = action.riichi_discard
-
-            # 执行打牌逻辑 (H3: 用 value 判断 tsumogiri + 检查移除返回值)
-            if player.drawn_tile and player.drawn_tile.value == tile_to_discard.value:
+        # 按动作类型查表分派 (替代逐个比较的 if/elif 链); PASS 等无数据变更的动作不在表中
+        handler = self._ACTION_HANDLERS.get(action.type)
+        if handler is not None:
+            handler(self, player, player_idx, action)
+
+    # ==================================================================
+    # apply_action 的分派目标: 签名统一为 (self, player, player_idx, action)
+    # ==================================================================
+
+    def _discard_tile(self, player: PlayerState, player_idx: int, tile_to_discard: Tile, label: str):
+        """打出一张牌 (DISCARD / RIICHI 共用): 摸切或手切, 然后放入牌河"""
+        drawn = player.drawn_tile
+        # 优先切出刚摸到的牌 (Tsumogiri): 按 value 判断 (不依赖 is_red 实例一致性)
+        if drawn and drawn.value == tile_to_discard.value:
+            player.drawn_tile = None
+        else:
+            # 切出手牌中的牌 (Te-dashi)
+            # 如果有摸到的牌，先把它并入手牌 (理牌)
+            if drawn:
+                player.insert_sorted(drawn)
                 player.drawn_tile = None
-            else:
-                if player.drawn_tile:
-                    player.hand.append(player.drawn_tile)
-                    player.drawn_tile = None
-                    player.hand.sort()
-                if not self._remove_tiles_from_hand(player, [tile_to_discard]):
-                    raise RuntimeError(
-                        f"apply_action(RIICHI): 无法从手牌移除 {tile_to_discard}, "
-                        f"手牌张数={len(player.hand)}"
-                    )
 
-            player.discards.append(tile_to_discard)
-            self.last_discarded_tile = tile_to_discard
-            self.last_discard_player_index = player_idx
-
-        # ==================================================================
-        # 3. 鸣牌 (CHI / PON / OPEN KAN)
-        # ==================================================================
-        elif action.type in (ActionType.CHI, ActionType.PON) or (
-            action.type == ActionType.KAN and action.kan_type == KanType.OPEN
-        ):
-            # 1. 从手牌移除用来鸣牌的搭子
-            # (注意：Action 中包含的是 *全部* 组成副露的牌，还是只包含 *手牌中* 的牌？)
-            # (根据您的 Action 定义：chi_tiles 是手牌中的两张; KAN/PON 的 tile 是目标牌)
-
-            tiles_to_remove = []
-            meld_tiles = []
-
-            if action.type == ActionType.CHI:
-                tiles_to_remove = list(action.chi_tiles)  # 手牌中的两张
-                # 副露 = 吃的那张 + 手牌两张
-                meld_tiles = [self.last_discarded_tile] + tiles_to_remove
-
-            elif action.type == ActionType.PON:
-                target_tile = action.tile  # 碰的牌 (类型)
-                # 手牌中需要移除 2 张
-                # 为了找到具体的 Tile 实例，我们需要在手牌里搜
-                # 简化：假设 _remove_tiles_by_value 或调用者保证
-                # 这里假设我们能找到 2 张匹配的牌
-                found = [t for t in player.hand if t.value == target_tile.value][:2]
-                tiles_to_remove = found
-                meld_tiles = [self.last_discarded_tile] + tiles_to_remove
-
-            elif action.type == ActionType.KAN:  # 明杠
-                target_tile = action.tile
-                # 手牌中移除 3 张
-                found = [t for t in player.hand if t.value == target_tile.value][:3]
-                tiles_to_remove = found
-                meld_tiles = [self.last_discarded_tile] + tiles_to_remove
-
-            # 校验移除成功 (失败说明状态与动作不一致, 必须暴露而非静默膨胀手牌)
-            if not self._remove_tiles_from_hand(player, tiles_to_remove):
+            # 移除并校验 (H4: 之前不检查返回值, 失败时手牌膨胀)
+            # 单张直接走 remove_from_hand: 计数索引 O(1) 判定在手, 再二分到同 value 段删除,
+            # 不为一张牌包一层列表再经 _remove_tiles_from_hand 分派
+            if not player.remove_from_hand(tile_to_discard):
                 raise RuntimeError(
-                    f"apply_action({action.type.name}): 无法从手牌移除 {[str(t) for t in tiles_to_remove]}, "
+                    f"apply_action({label}): 无法从手牌移除 {tile_to_discard}, "
                     f"手牌张数={len(player.hand)}"
                 )
 
-            # 2. 创建副露对象
+        # 添加到弃牌河
+        player.add_discard(tile_to_discard)
+
+        # 更新全局状态
+        self.last_discarded_tile = tile_to_discard
+        self.last_discard_player_index = player_idx
+        self._response_candidates.clear()
+        self._response_cache_key = (player_idx, tile_to_discard)
+
+    def _apply_discard(self, player: PlayerState, player_idx: int, action: "Action"):
+        """1. 打牌 (DISCARD)"""
+        self._discard_tile(player, player_idx, action.tile, "DISCARD")
+
+        # 如果这回合立直了，清理临时标记
+        if player.riichi_declared_this_turn:
+            player.riichi_declared_this_turn = False  # 立直成立
+            # player.ippatsu_chance 保持为 True，直到下一次轮换
+
+        # 更新振听状态 (舍牌振听)
+        # (逻辑：如果听牌，且打出的牌是听的牌，则振听)
+        # TODO: 振听判定由 Scoring._is_furiten 负责，详见 YAKU_AND_SCORING_DESIGN §7
+
+    def _apply_riichi(self, player: PlayerState, player_idx: int, action: "Action"):
+        """2. 立直 (RIICHI)"""
+        # 立直宣言 (扣分在下家打牌通过后才结算，但通常简化为立即扣分)
+        # 这里我们立即执行状态变更
+        player.riichi_declared = True
+        player.riichi_declared_this_turn = True  # 标记为“刚立直”，用于一发判断
+        player.ippatsu_chance = True
+
+        player.score -= 1000
+        self.riichi_sticks += 1
+
+        # 立直必定伴随打牌 (Action.riichi_discard)
+        # 执行打牌逻辑 (H3: 用 value 判断 tsumogiri + 检查移除返回值)
+        self._discard_tile(player, player_idx, action.riichi_discard, "RIICHI")
+
+    def _apply_kan(self, player: PlayerState, player_idx: int, action: "Action"):
+        """KAN 按 kan_type 再分派: 明杠走鸣牌流程, 暗杠/加杠走自摸杠流程"""
+        kan_type = action.kan_type
+        if kan_type is _KAN_OPEN:
+            self._apply_call(player, player_idx, action)
+        elif kan_type is _KAN_CLOSED or kan_type is _KAN_ADDED:
+            self._apply_self_kan(player, player_idx, action)
+
+    def _apply_call(self, player: PlayerState, player_idx: int, action: "Action"):
+        """3. 鸣牌 (CHI / PON / OPEN KAN)"""
+        atype = action.type
+        last_discard = self.last_discarded_tile
+        # 1. 从手牌移除用来鸣牌的搭子
+        # (注意：Action 中包含的是 *全部* 组成副露的牌，还是只包含 *手牌中* 的牌？)
+        # (根据您的 Action 定义：chi_tiles 是手牌中的两张; KAN/PON 的 tile 是目标牌)
+
+        # 校验移除成功 (失败说明状态与动作不一致, 必须暴露而非静默膨胀手牌)
+        if atype is _CHI:
+            tiles_to_remove = action.chi_tiles  # 手牌中的两张 (tuple 直接传, 不再复制成 list)
+            ok = self._remove_tiles_from_hand(player, tiles_to_remove)
+        else:
+            # PON 移除 2 张 / 明杠移除 3 张 同 value 的牌 (按计数校验后单趟取出具体实例)
+            target_val = action.tile.value
+            need = 2 if atype is _PON else 3
+            taken = player.take_by_value(target_val, need)
+            ok = taken is not None
+            tiles_to_remove = taken if ok else [action.tile] * need
+        if not ok:
+            raise RuntimeError(
+                f"apply_action({atype.name}): 无法从手牌移除 {[str(t) for t in tiles_to_remove]}, "
+                f"手牌张数={len(player.hand)}"
+            )
+        # 2. 创建副露对象: 鸣的那张 + 手牌中的搭子, 直接拼成 tuple (碰/杠各张同 value, 无需排序)
+        new_meld = Meld(
+            type=atype,
+            tiles=(last_discard, *tiles_to_remove),
+            from_player=self.last_discard_player_index,
+            called_tile=last_discard,
+        )
+        player.add_meld(new_meld)
+
+        # 3. 更新状态
+        player.is_menzen = False
+        # 鸣牌者成为当前玩家
+        self.current_player_index = player_idx
+
+        # 4. 从上家弃牌河中“拿走”这张牌 (UI逻辑，通常不物理删除，而是标记为被鸣牌)
+        # 但为了数据一致性，许多环境会选择保留在河里但标记，或者移出。
+        # 这里我们选择保留引用，不做物理删除 (符合标准日麻记录，虽然显示上会移动)
+
+        # 清除所有人的“一发”状态
+        self._clear_ippatsu_for_all()
+
+    def _apply_self_kan(self, player: PlayerState, player_idx: int, action: "Action"):
+        """4. 暗杠 / 加杠 (CLOSED KAN / ADDED KAN)"""
+        target_tile = action.tile
+        target_val = target_tile.value
+        drawn = player.drawn_tile
+
+        if action.kan_type is _KAN_CLOSED:
+            # 暗杠：从手牌(含 drawn_tile)移除 4 张同 value
+            # drawn_tile 是否参与暗杠 (按 value 判断, 不用 is —— 实例身份不可靠)
+            drawn_in = drawn is not None and drawn.value == target_val
+            # hand 中该 value 的张数
+            hand_count = player.hand_counts[target_val]
+            need_from_hand = 3 if drawn_in else 4
+            if hand_count < need_from_hand:
+                raise RuntimeError(
+                    f"apply_action(CLOSED_KAN): 手牌中 {target_tile} 不足 "
+                    f"(需 {need_from_hand}, 实际 {hand_count})"
+                )
+            # 从 hand 移除 need_from_hand 张 (取前 N 张同 value 实例; 张数已在上方校验)
+            to_remove = player.take_by_value(target_val, need_from_hand)
+            # 若 drawn 参与暗杠, 清掉 drawn_tile 标记
+            if drawn_in:
+                player.drawn_tile = None
+
+            # 创建副露 (暗杠 from_player = 自己，4张 = hand移除的 + drawn)
+            kan_tiles = tuple(to_remove) + ((drawn,) if drawn_in else ())
             new_meld = Meld(
-                type=action.type,
-                tiles=tuple(meld_tiles),  # 转为 tuple
-                from_player=self.last_discard_player_index,
-                called_tile=self.last_discarded_tile,
+                type=ActionType.KAN,
+                tiles=kan_tiles,  # 4 张
+                from_player=player_idx,
+                called_tile=None,
             )
-            player.melds.append(new_meld)
-
-            # 3. 更新状态
-            player.is_menzen = False
-            # 鸣牌者成为当前玩家
-            self.current_player_index = player_idx
-
-            # 4. 从上家弃牌河中“拿走”这张牌 (UI逻辑，通常不物理删除，而是标记为被鸣牌)
-            # 但为了数据一致性，许多环境会选择保留在河里但标记，或者移出。
-            # 这里我们选择保留引用，不做物理删除 (符合标准日麻记录，虽然显示上会移动)
-            pass
-
-            # 清除所有人的“一发”状态
-            self._clear_ippatsu_for_all()
-
-        # ==================================================================
-        # 4. 暗杠 / 加杠 (CLOSED KAN / ADDED KAN)
-        # ==================================================================
-        elif action.type == ActionType.KAN and action.kan_type in (
-            KanType.CLOSED,
-            KanType.ADDED,
-        ):
+            player.add_meld(new_meld)
+            # 暗杠不破坏门清 (is_menzen 保持原样)
 
-            if action.kan_type == KanType.CLOSED:
-                # 暗杠：从手牌(含 drawn_tile)移除 4 张同 value
-                target_tile = action.tile
-                target_val = target_tile.value
-                drawn = player.drawn_tile
-                # drawn_tile 是否参与暗杠 (按 value 判断, 不用 is —— 实例身份不可靠)
-                drawn_in = drawn is not None and drawn.value == target_val
-                # hand 中该 value 的张数
-                hand_count = sum(1 for t in player.hand if t.value == target_val)
-                need_from_hand = 3 if drawn_in else 4
-                if hand_count < need_from_hand:
-                    raise RuntimeError(
-                        f"apply_action(CLOSED_KAN): 手牌中 {target_tile} 不足 "
-                        f"(需 {need_from_hand}, 实际 {hand_count})"
-                    )
-                # 从 hand 移除 need_from_hand 张 (取前 N 张同 value 实例)
-                to_remove = [t for t in player.hand if t.value == target_val][:need_from_hand]
-                if not self._remove_tiles_from_hand(player, to_remove):
-                    raise RuntimeError(
-                        f"apply_action(CLOSED_KAN): 无法从手牌移除 {[str(t) for t in to_remove]}"
-                    )
-                # 若 drawn 参与暗杠, 清掉 drawn_tile 标记
-                if drawn_in:
-                    player.drawn_tile = None
-
-                # 创建副露 (暗杠 from_player = 自己，4张 = hand移除的 + drawn)
-                kan_tiles = tuple(to_remove) + ((drawn,) if drawn_in else ())
-                new_meld = Meld(
-                    type=ActionType.KAN,
-                    tiles=kan_tiles,  # 4 张
-                    from_player=player_idx,
-                    called_tile=None,
+        else:
+            # 加杠：从手牌(或drawn_tile)移除 1 张，加到已有的 PON 上
+            # 先查碰副露索引, 无对应 PON 时在改动手牌之前报错
+            if target_val not in player.pon_values:
+                raise RuntimeError(
+                    f"apply_action(ADDED_KAN): 未找到 {target_tile} 的 PON 副露"
                 )
-                player.melds.append(new_meld)
-                # 暗杠不破坏门清 (is_menzen 保持原样)
-
-            elif action.kan_type == KanType.ADDED:
-                # 加杠：从手牌(或drawn_tile)移除 1 张，加到已有的 PON 上
-                target_tile = action.tile
 
-                # 移除
-                if player.drawn_tile and player.drawn_tile.value == target_tile.value:
-                    added_tile = player.drawn_tile
-                    player.drawn_tile = None
-                else:
-                    # 从手牌找
-                    added_tile = next(
-                        (t for t in player.hand if t.value == target_tile.value), None
-                    )
-                    if added_tile is None:
-                        raise RuntimeError(
-                            f"apply_action(ADDED_KAN): 手牌中无 {target_tile} 可加杠"
-                        )
-                    if not self._remove_tiles_from_hand(player, [added_tile]):
-                        raise RuntimeError(
-                            f"apply_action(ADDED_KAN): 无法从手牌移除 {added_tile}"
-                        )
-                    # 加杠用手牌的牌时, drawn_tile 仍存在, 必须清除
-                    # (加杠后进入杠流程摸岭上牌, 不保留旧 drawn_tile)
-                    player.drawn_tile = None
-
-                # 更新副露
-                pon_found = False
-                for i, m in enumerate(player.melds):
-                    if (
-                        m.type == ActionType.PON
-                        and m.tiles[0].value == target_tile.value
-                    ):
-                        # 替换旧的 PON 为新的 KAN
-                        new_tiles = m.tiles + (added_tile,)
-                        new_meld = Meld(
-                            type=ActionType.KAN,
-                            tiles=new_tiles,
-                            from_player=m.from_player,
-                            called_tile=m.called_tile,
-                        )
-                        player.melds[i] = new_meld
-                        pon_found = True
-                        break
-                if not pon_found:
+            # 移除
+            if drawn and drawn.value == target_val:
+                added_tile = drawn
+                player.drawn_tile = None
+            else:
+                # 从手牌取该 value 的第一张: take_by_value 按计数校验后在有序手牌上
+                # 二分切片, 查找与移除一步完成 (计数为 0 时返回 None, 手牌不变)
+                taken = player.take_by_value(target_val, 1)
+                if taken is None:
                     raise RuntimeError(
-                        f"apply_action(ADDED_KAN): 未找到 {target_tile} 的 PON 副露"
+                        f"apply_action(ADDED_KAN): 手牌中无 {target_tile} 可加杠"
                     )
+                added_tile = taken[0]
+                # 加杠用手牌的牌时, drawn_tile 仍存在, 必须清除
+                # (加杠后进入杠流程摸岭上牌, 不保留旧 drawn_tile)
+                player.drawn_tile = None
 
-            self._clear_ippatsu_for_all()
-            # 鸣牌也意味着上一家的“刚立直”状态结束（立直成立）
-            # 虽然通常 riichi_declared_this_turn 主要用于判断是否刚刚打出了立直宣言牌
-            # 在鸣牌后，就不再是“刚宣言”的状态了
-            self.players[self.last_discard_player_index].riichi_declared_this_turn = (
-                False
+            # 更新副露: 按平行索引定位碰副露, 替换旧的 PON 为新的 KAN
+            i = player.find_pon(target_val)
+            if i < 0:
+                raise RuntimeError(
+                    f"apply_action(ADDED_KAN): 未找到 {target_tile} 的 PON 副露"
+                )
+            m = player.melds[i]
+            player.replace_meld(
+                i, replace(m, type=_KAN, tiles=m.tiles + (added_tile,))
             )
 
-        # ==================================================================
-        # 5. 和牌 (TSUMO / RON)
-        # ==================================================================
-        elif action.type in (ActionType.TSUMO, ActionType.RON):
-            # 仅设置标志位，具体的结算逻辑由 GameController 调用 RulesEngine 处理
-            self._hand_over_flag = True
-            # 注意：不在这里修改分数，分数修改由 RulesEngine 计算后回填
-
-        # ==================================================================
-        # 6. 流局 (SPECIAL DRAW)
-        # ==================================================================
-        elif action.type == ActionType.SPECIAL_DRAW:
-            self._hand_over_flag = True
+        self._clear_ippatsu_for_all()
+        # 鸣牌也意味着上一家的“刚立直”状态结束（立直成立）
+        # 虽然通常 riichi_declared_this_turn 主要用于判断是否刚刚打出了立直宣言牌
+        # 在鸣牌后，就不再是“刚宣言”的状态了
+        self.players[self.last_discard_player_index].riichi_declared_this_turn = (
+            False
+        )
 
-        elif action.type == ActionType.PASS:
-            pass
+    def _apply_hand_over(self, player: PlayerState, player_idx: int, action: "Action"):
+        """5/6. 和牌 (TSUMO / RON) 与流局 (SPECIAL DRAW)"""
+        # 仅设置标志位，具体的结算逻辑由 GameController 调用 RulesEngine 处理
+        self._hand_over_flag = True
+        # 注意：不在这里修改分数，分数修改由 RulesEngine 计算后回填
+
+    _ACTION_HANDLERS = {
+        ActionType.DISCARD: _apply_discard,
+        ActionType.RIICHI: _apply_riichi,
+        ActionType.CHI: _apply_call,
+        ActionType.PON: _apply_call,
+        ActionType.KAN: _apply_kan,
+        ActionType.TSUMO: _apply_hand_over,
+        ActionType.RON: _apply_hand_over,
+        ActionType.SPECIAL_DRAW: _apply_hand_over,
+    }
 
     # --- 辅助方法 ---
 
+    def format_events(self) -> List[str]:
+        """把事件日志格式化为可读字符串 (仅在回放/调试时调用, 热路径不格式化)"""
+        return [f"玩家 {player_idx}: {action}" for player_idx, action in self.events]
+
+    def total_kans(self) -> int:
+        """场上杠的总数 (四杠散了判定), 汇总各玩家的 kan_count 而非逐个扫描副露"""
+        return sum(p.kan_count for p in self.players)
+
     def _clear_ippatsu_for_all(self):
         """任何鸣牌都会消除所有人的“一发”机会"""
         for p in self.players:
@@ -657,13 +1092,15 @@ class GameState:
     def _remove_tiles_from_hand(
         self, player: PlayerState, tiles_to_remove: List[Tile]
     ) -> bool:
-        """从手牌中移除指定的牌实例"""
-        for t in tiles_to_remove:
-            if t in player.hand:
-                player.hand.remove(t)
-            else:
-                return False  # 找不到牌
-        return True
+        """
+        从手牌中移除指定的牌实例。
+
+        单张 (打牌/加杠, 每步都走) 直接走 remove_from_hand 的 O(1) 计数校验;
+        多张 (吃) 交给 remove_tiles 单趟重建手牌, 其整体校验失败时手牌保持不变。
+        """
+        if len(tiles_to_remove) == 1:
+            return player.remove_from_hand(tiles_to_remove[0])
+        return player.remove_tiles(tiles_to_remove)
 
     # --- Getter 方法 (应保留) ---
     def get_player_state(self, player_index: int) -> Optional["PlayerState"]:
@@ -675,18 +1112,22 @@ class GameState:
 
     def update_scores(self, score_changes: Dict[int, int]):
         """[数据] 根据计算结果更新玩家分数"""
-        print(f"更新分数: {score_changes}")
+        debug = _log.isEnabledFor(logging.DEBUG)
+        if debug:
+            print(f"更新分数: {score_changes}")
         for player_index, change in score_changes.items():
             if 0 <= player_index < self.num_players:
                 self.players[player_index].score += change
-        print(f"更新后分数: {[(p.player_index, p.score) for p in self.players]}")
+        if debug:
+            print(f"更新后分数: {[(p.player_index, p.score) for p in self.players]}")
         # TODO: 检查是否有人被飞 (tobi)，并设置 _game_over_flag
 
     def apply_next_hand_state(self, next_hand_state_info: Dict[str, Any]):
         """
         [数据] 根据 RulesEngine 计算的下一局状态信息更新 GameState。
         """
-        print(f"应用下一局状态: {next_hand_state_info}")
+        if _log.isEnabledFor(logging.DEBUG):
+            print(f"应用下一局状态: {next_hand_state_info}")
         self.dealer_index = next_hand_state_info["next_dealer_index"]
         self.round_wind = next_hand_state_info["next_round_wind"]
         self.round_number = next_hand_state_info["next_round_number"]
@@ -698,18 +1139,41 @@ class GameState:
             self._game_over_flag = True
 
     def get_info(self) -> Dict[str, Any]:
-        """[数据] 获取当前游戏状态的部分信息 (用于调试或记录)"""
+        """[数据] 获取当前游戏状态的部分信息 (用于调试或记录)。
+        值只含 str / int / list / None, 可直接交给 json / orjson 序列化 (无需 default=str)。"""
+        # 键集合固定: 先把嵌套属性取到局部变量, 字典字面量里只做 LOAD_FAST
+        wall = self.wall
+        last_discard = self.last_discarded_tile
+        return {
+            "round": round_name(self.round_wind, self.round_number),
+            "honba": self.honba,
+            "riichi_sticks": self.riichi_sticks,
+            "dealer": self.dealer_index,
+            "current_player": self.current_player_index,
+            "phase": self.game_phase._name_,
+            "scores": [p.score for p in self.players],
+            "live_tiles_left": wall.get_remaining_live_tiles_count(),
+            # 指示牌取自牌墙, 都是常规牌 id, 直接查预格式化表
+            "dora_indicators": [TILE_STR[t.tid] for t in wall.dora_indicators],
+            "last_discard": None if last_discard is None else str(last_discard),
+        }
+
+    def get_state_ids(self) -> Dict[str, Any]:
+        """[数据] get_info 的整数版: 阶段/牌都给整数 id, 不做任何 str 格式化。
+        dora_indicators 是指示牌 value 的 int8 数组副本 (调用方可随意修改, 翻新宝牌后不变);
+        无最后弃牌时 last_discard 为 -1。"""
+        wall = self.wall
+        last_discard = self.last_discarded_tile
         return {
-            "round": f"{['东','南','西','北'][self.round_wind]}{self.round_number}",
+            "round_wind": self.round_wind,
+            "round_number": self.round_number,
             "honba": self.honba,
             "riichi_sticks": self.riichi_sticks,
             "dealer": self.dealer_index,
             "current_player": self.current_player_index,
-            "phase": self.game_phase.name,
+            "phase": self.game_phase._value_,
             "scores": [p.score for p in self.players],
-            "live_tiles_left": self.wall.get_remaining_live_tiles_count(),
-            "dora_indicators": [str(t) for t in self.wall.dora_indicators],
-            "last_discard": (
-                str(self.last_discarded_tile) if self.last_discarded_tile else None
-            ),
+            "live_tiles_left": wall.get_remaining_live_tiles_count(),
+            "dora_indicators": wall.get_dora_indicator_ids().copy(),
+            "last_discard": -1 if last_discard is None else last_discard.value,
         }
@@ -9,12 +9,12 @@
 # Priority,"resolve_response_priorities(self, declarations: Dict[int, Action], discarder_index: int) -> Tuple[Optional[Action], Optional[int]]",根据优先级 (Ron > Kan/Pon > Chi) 确定唯一的获胜响应动作和玩家。 （来自 temp_from_game state.py）
 # action_validator.py
 
-from typing import List, Dict, Optional, Tuple, Any, Set, Counter as TypingCounter
-from collections import Counter
+from typing import List, Dict, Optional, Tuple, Any, Set
+from dataclasses import replace
 
 # 假设从 actions.py 和 game_state.py 导入
-from src.env.core.actions import Action, ActionType, Tile, KanType
-from src.env.core.game_state import GameState, PlayerState, Meld, GamePhase
+from src.env.core.actions import Action, ActionType, Tile, KanType, make_tile
+from src.env.core.game_state import GameState, PlayerState, Meld, GamePhase, responder_order
 
 # 假设从 hand_analyzer.py 和 scoring.py 导入
 from src.env.core.rules.hand_analyzer import HandAnalyzer
@@ -23,6 +23,63 @@ from src.env.core.rules.scoring import Scoring
 # 假设从 constants.py 导入
 from src.env.core.rules.constants import TERMINAL_HONOR_VALUES, ACTION_PRIORITY
 
+# 响应优先级解析用的等级常量 (取自 ACTION_PRIORITY 静态表, 解析时不再写魔数)
+_RON_RANK = ACTION_PRIORITY[ActionType.RON]
+_CHI_RANK = ACTION_PRIORITY[ActionType.CHI]
+
+
+# --- 基于计数向量的 O(1) 鸣牌预判 (先于候选动作枚举, 大部分弃牌在此即被排除) ---
+
+def _value_counts(player: "PlayerState") -> List[int]:
+    """玩家手牌按 value 的计数 (PlayerState 直接复用 hand_counts, 其他鸭子类型对象现算)"""
+    counts = getattr(player, "hand_counts", None)
+    if counts is None:
+        counts = [0] * 34
+        for t in player.hand:
+            counts[t.value] += 1
+    return counts
+
+
+def _pon_values(player: "PlayerState") -> List[int]:
+    """玩家碰副露的 value (升序; PlayerState 复用 pon_values 索引)"""
+    values = getattr(player, "pon_values", None)
+    if values is None:
+        values = {m.tiles[0].value for m in player.melds if m.type == ActionType.PON}
+    return sorted(values)
+
+
+def _total_kans(game_state: "GameState") -> int:
+    """场上杠的总数 (PlayerState 复用 kan_count, 其他鸭子类型对象扫描副露)"""
+    total = 0
+    for p in game_state.players:
+        n = getattr(p, "kan_count", None)
+        if n is None:
+            n = sum(1 for m in p.melds if m.type == ActionType.KAN)
+        total += n
+    return total
+
+
+def _can_pon_counts(hand_counts: List[int], tile_val: int) -> bool:
+    """手牌中至少有两张同 value"""
+    return hand_counts[tile_val] >= 2
+
+
+def _can_kan_open_counts(hand_counts: List[int], tile_val: int) -> bool:
+    """手牌中至少有三张同 value"""
+    return hand_counts[tile_val] >= 3
+
+
+def _can_chi_counts(hand_counts: List[int], tile_val: int) -> bool:
+    """三种搭子窗口 (T-2,T-1) / (T-1,T+1) / (T+1,T+2) 是否至少有一种成立 (不跨花色)"""
+    if tile_val >= 27:  # 字牌不能吃
+        return False
+    n = tile_val % 9
+    return (
+        (n >= 2 and hand_counts[tile_val - 2] and hand_counts[tile_val - 1])
+        or (1 <= n <= 7 and hand_counts[tile_val - 1] and hand_counts[tile_val + 1])
+        or (n <= 6 and hand_counts[tile_val + 1] and hand_counts[tile_val + 2])
+    )
+
 
 class ActionValidator:
     """
@@ -101,7 +158,7 @@ class ActionValidator:
         candidates: List["Action"] = []
         last_discard = game_state.last_discarded_tile
 
-        if not last_discard:
+        if last_discard is None:
             return [Action(type=ActionType.PASS)]  # 安全校验
 
         # 1. 检查荣和 (RON)
@@ -111,19 +168,18 @@ class ActionValidator:
 
         # 如果已立直，通常不能再进行碰/杠/吃
         if not player.riichi_declared:
+            counts = _value_counts(player)
+            target_val = last_discard.value
+
             # 2. 检查碰 (PON)
-            if self._can_pon(player, last_discard):
-                pon_tile_type = Tile(value=last_discard.value, is_red=False)
+            if _can_pon_counts(counts, target_val):
+                pon_tile_type = make_tile(target_val)  # 共享实例, 不为每个候选新建 Tile
                 candidates.append(Action(type=ActionType.PON, tile=pon_tile_type))
 
             # 3. 检查明杠 (KAN - OPEN / Daiminkan)
             # 四杠散了规则: 场上杠总数已达 4 时, 不允许再明杠
-            total_kans = sum(
-                1 for p in game_state.players
-                for m in p.melds if m.type == ActionType.KAN
-            )
-            if total_kans < 4 and self._can_open_kan(player, last_discard):
-                kan_tile_type = Tile(value=last_discard.value, is_red=False)
+            if _can_kan_open_counts(counts, target_val) and _total_kans(game_state) < 4:
+                kan_tile_type = make_tile(target_val)
                 candidates.append(
                     Action(
                         type=ActionType.KAN,
@@ -135,7 +191,9 @@ class ActionValidator:
             # 4. 检查吃 (CHI) - 仅限下家
             if (
                 game_state.last_discard_player_index + 1
-            ) % game_state.num_players == player.player_index:
+            ) % game_state.num_players == player.player_index and _can_chi_counts(
+                counts, target_val
+            ):
                 candidates.extend(self._find_chi_actions(player, last_discard))
 
         # 5. 必须可以 PASS (不响应)
@@ -143,6 +201,33 @@ class ActionValidator:
 
         return candidates
 
+    def any_response_possible(self, game_state: "GameState") -> bool:
+        """
+        当前弃牌是否有任一对手可以荣和 / 碰 / 杠 / 吃 (即响应阶段不只有 PASS)。
+        两趟扫描: 先对所有对手做 O(1) 计数预判 (鸣牌), 任一成立即返回, 不再为排在前面的
+        对手做荣和判定; 再逐个判荣和 (_can_ron 先判和牌形, 形状成立才做完整的 is_valid_win)。
+        """
+        last_discard = game_state.last_discarded_tile
+        if last_discard is None:
+            return False
+        target_val = last_discard.value
+        discarder = game_state.last_discard_player_index
+        order = responder_order(discarder, game_state.num_players)
+        players = game_state.players
+        for idx in order:
+            player = players[idx]
+            if not player.riichi_declared:
+                counts = _value_counts(player)
+                # 明杠蕴含碰, 只需判碰
+                if _can_pon_counts(counts, target_val):
+                    return True
+                if idx == order[0] and _can_chi_counts(counts, target_val):
+                    return True
+        for idx in order:
+            if self._can_ron(players[idx], last_discard, game_state):
+                return True
+        return False
+
     def resolve_response_priorities(
         self, declarations: Dict[int, "Action"], discarder_index: int, num_players: int
     ) -> Tuple[Optional["Action"], Optional[int]]:
@@ -152,45 +237,27 @@ class ActionValidator:
 
         规则: Ron (any) > Pon/Kan (any) > Chi (next player)
         """
-        priority_map = ACTION_PRIORITY
-
-        # 1. 检查 Ron (最高优先级)
-        ron_declarations = {
-            idx: action
-            for idx, action in declarations.items()
-            if action.type == ActionType.RON
-        }
-        if ron_declarations:
-            # 头跳: 从打牌者的下家开始顺时针 (下家→对家→上家)
-            for i in range(1, num_players):
-                player_idx_check = (discarder_index + i) % num_players
-                if player_idx_check in ron_declarations:
-                    return ron_declarations[player_idx_check], player_idx_check
-
-        # 2. 检查 Pon/Kan (次高优先级)
-        pon_kan_declarations = {
-            idx: action
-            for idx, action in declarations.items()
-            if action.type in {ActionType.PON, ActionType.KAN}
-        }
-        if pon_kan_declarations:
-            # 头跳: 下家→对家→上家
-            for i in range(1, num_players):
-                player_idx_check = (discarder_index + i) % num_players
-                if player_idx_check in pon_kan_declarations:
-                    return pon_kan_declarations[player_idx_check], player_idx_check
-
-        # 3. 检查 Chi (最低优先级)
-        chi_declarations = {
-            idx: action
-            for idx, action in declarations.items()
-            if action.type == ActionType.CHI
-        }
-        if chi_declarations:
+        # 单趟按头跳顺序 (下家→对家→上家) 扫描, 不再为 Ron / Pon-Kan / Chi 各建一个过滤字典:
+        # 第一个 Ron 直接胜出; 否则保留优先级最高且座位最靠前的声明
+        order = responder_order(discarder_index, num_players)
+        next_idx = order[0]
+        best_action, best_idx, best_rank = None, None, 0
+        for idx in order:
+            action = declarations.get(idx)
+            if action is None:
+                continue
+            rank = ACTION_PRIORITY.get(action.type, 0)
+            if rank <= best_rank:  # PASS 及不高于当前最优的声明 (同级按座位先到先得)
+                continue
+            if rank == _RON_RANK:
+                return action, idx
             # 只有下家能 Chi
-            next_player_index = (discarder_index + 1) % num_players
-            if next_player_index in chi_declarations:
-                return chi_declarations[next_player_index], next_player_index
+            if rank == _CHI_RANK and idx != next_idx:
+                continue
+            best_action, best_idx, best_rank = action, idx, rank
+
+        if best_action is not None:
+            return best_action, best_idx
 
         # 所有人Pass
         return None, None
@@ -224,6 +291,14 @@ class ActionValidator:
         if not target_tile:
             return False
 
+        # 先在计数向量上判和牌形 (绝大多数弃牌在这里就被排除), 形状成立才做完整检查;
+        # 张数异常 (非和了前手牌) 时交给 Scoring 兜底处理
+        melds = player.melds
+        if len(player.hand) + 3 * len(melds) == 13 and not self.hand_analyzer.wins_on(
+            _value_counts(player), len(melds), target_tile.value
+        ):
+            return False
+
         # 委托 Scoring 模块进行完整检查 (形状, 役种, 振听)
         return self.scoring.is_valid_win(
             player, target_tile, is_tsumo=False, game_state=game_state
@@ -236,16 +311,14 @@ class ActionValidator:
         if not target_tile or player.riichi_declared:
             return False
         # 手牌中至少有两张同种牌 (只比较 value)
-        count = sum(1 for t in player.hand if t.value == target_tile.value)
-        return count >= 2
+        return _can_pon_counts(_value_counts(player), target_tile.value)
 
     def _can_open_kan(self, player: "PlayerState", target_tile: "Tile") -> bool:
         """检查玩家是否能明杠目标牌 (移植)"""
         if not target_tile or player.riichi_declared:
             return False
         # 手牌中至少有三张同种牌 (只比较 value)
-        count = sum(1 for t in player.hand if t.value == target_tile.value)
-        return count >= 3
+        return _can_kan_open_counts(_value_counts(player), target_tile.value)
 
     def _find_chi_actions(
         self, player: "PlayerState", discarded_tile: "Tile"
@@ -265,7 +338,8 @@ class ActionValidator:
             tile1_options = [t for t in hand_tiles if t.value == val1]
             tile2_options = [t for t in hand_tiles if t.value == val2]
             if tile1_options and tile2_options:
-                chi_combo = tuple(sorted((tile1_options[0], tile2_options[0])))
+                # 两张 value 已知大小 (val2 < val1), 直接按序组成 tuple, 不再 sorted
+                chi_combo = (tile2_options[0], tile1_options[0])
                 chi_actions.append(
                     Action(
                         type=ActionType.CHI, chi_tiles=chi_combo, tile=discarded_tile
@@ -279,7 +353,7 @@ class ActionValidator:
             tile2_options = [t for t in hand_tiles if t.value == val2]
             if tile1_options and tile2_options:
                 # (为简化，省略了旧代码中处理手牌多张同种牌的复杂逻辑，假设找到即可)
-                chi_combo = tuple(sorted((tile1_options[0], tile2_options[0])))
+                chi_combo = (tile1_options[0], tile2_options[0])  # val1 < val2, 已有序
                 chi_actions.append(
                     Action(
                         type=ActionType.CHI, chi_tiles=chi_combo, tile=discarded_tile
@@ -292,7 +366,7 @@ class ActionValidator:
             tile1_options = [t for t in hand_tiles if t.value == val1]
             tile2_options = [t for t in hand_tiles if t.value == val2]
             if tile1_options and tile2_options:
-                chi_combo = tuple(sorted((tile1_options[0], tile2_options[0])))
+                chi_combo = (tile1_options[0], tile2_options[0])  # val1 < val2, 已有序
                 chi_actions.append(
                     Action(
                         type=ActionType.CHI, chi_tiles=chi_combo, tile=discarded_tile
@@ -318,49 +392,44 @@ class ActionValidator:
         kan_actions: List["Action"] = []
 
         # 四杠散了规则: 场上杠总数已达 4 时, 不允许再杠 (第5杠触发途中流局)
-        total_kans = sum(
-            1 for p in game_state.players
-            for m in p.melds if m.type == ActionType.KAN
-        )
-        if total_kans >= 4:
+        if _total_kans(game_state) >= 4:
             return kan_actions
 
-        full_hand_tiles = player.hand + (
-            [player.drawn_tile] if player.drawn_tile else []
-        )
+        counts = _value_counts(player)
+        drawn = player.drawn_tile
+        drawn_val = drawn.value if drawn else -1
 
-        # 1. 查找暗杠 (Ankan)
-        tile_counts: TypingCounter[Tile] = Counter(full_hand_tiles)
-        for tile_object, count in tile_counts.items():
-            if count == 4:
-                # 立直后暗杠不得改变听牌 (标准规则)
-                if player.riichi_declared and self._kan_changes_waits(
-                    player, game_state, tile_object.value, KanType.CLOSED
-                ):
-                    continue
-                kan_actions.append(
-                    Action(
-                        type=ActionType.KAN, kan_type=KanType.CLOSED, tile=tile_object
-                    )
+        # 1. 查找暗杠 (Ankan): 手牌 + drawn 中同 value 恰为 4 张 (按 value 计数, 含赤牌)
+        for value in range(34):
+            if counts[value] + (value == drawn_val) != 4:
+                continue
+            # 立直后暗杠不得改变听牌 (标准规则)
+            if player.riichi_declared and self._kan_changes_waits(
+                player, game_state, value, KanType.CLOSED
+            ):
+                continue
+            kan_actions.append(
+                Action(
+                    type=ActionType.KAN, kan_type=KanType.CLOSED, tile=make_tile(value)
                 )
+            )
 
-        # 2. 查找加杠 (Kakan)
-        for meld in player.melds:
-            if meld.type == ActionType.PON:
-                pon_tile_value = meld.tiles[0].value
-                for tile in full_hand_tiles:
-                    if tile.value == pon_tile_value:
-                        # 立直后加杠不得改变听牌
-                        if player.riichi_declared and self._kan_changes_waits(
-                            player, game_state, pon_tile_value, KanType.ADDED
-                        ):
-                            break
-                        kan_actions.append(
-                            Action(
-                                type=ActionType.KAN, kan_type=KanType.ADDED, tile=tile
-                            )
-                        )
-                        break  # 一个碰只能加杠一次
+        # 2. 查找加杠 (Kakan): 碰副露 value 在手牌或 drawn 中
+        for pon_tile_value in _pon_values(player):
+            if pon_tile_value == drawn_val and not counts[pon_tile_value]:
+                tile = drawn
+            elif counts[pon_tile_value]:
+                tile = next(t for t in player.hand if t.value == pon_tile_value)
+            else:
+                continue
+            # 立直后加杠不得改变听牌
+            if player.riichi_declared and self._kan_changes_waits(
+                player, game_state, pon_tile_value, KanType.ADDED
+            ):
+                continue
+            kan_actions.append(
+                Action(type=ActionType.KAN, kan_type=KanType.ADDED, tile=tile)
+            )
 
         return kan_actions
 
@@ -390,7 +459,7 @@ class ActionValidator:
             sim_hand = [t for t in player.hand if t.value != kan_value]
             new_kan_meld = Meld(
                 type=ActionType.KAN,
-                tiles=tuple(Tile(kan_value) for _ in range(4)),
+                tiles=(make_tile(kan_value),) * 4,
                 from_player=player.player_index,
                 called_tile=None,
             )
@@ -409,12 +478,7 @@ class ActionValidator:
             for m in melds_before:
                 if m.type == ActionType.PON and m.tiles[0].value == kan_value:
                     sim_melds.append(
-                        Meld(
-                            type=ActionType.KAN,
-                            tiles=m.tiles + (Tile(kan_value),),
-                            from_player=m.from_player,
-                            called_tile=m.called_tile,
-                        )
+                        replace(m, type=ActionType.KAN, tiles=m.tiles + (make_tile(kan_value),))
                     )
                 else:
                     sim_melds.append(m)
@@ -451,11 +515,18 @@ class ActionValidator:
         )
 
         processed_tile_keys = set()
+        # 赤五与普通五打出后的手牌 value 计数相同, 听牌结果按 value 复用
+        tenpai_by_value: Dict[int, bool] = {}
         for tile_to_discard in possible_discards:
             tile_key = (tile_to_discard.value, tile_to_discard.is_red)
             if tile_key in processed_tile_keys:
                 continue
             processed_tile_keys.add(tile_key)
+            cached = tenpai_by_value.get(tile_to_discard.value)
+            if cached is not None:
+                if cached:
+                    riichi_discards.append(tile_to_discard)
+                continue
 
             # 模拟打出这张牌后的手牌 (H5: 只移除一张实例, 不是所有相等元素)
             temp_hand_after_discard = list(possible_discards)
@@ -467,7 +538,9 @@ class ActionValidator:
                     break
 
             # **[重构关键]**：调用 self.hand_analyzer 检查听牌
-            if self.hand_analyzer.is_tenpai(temp_hand_after_discard, player.melds):
+            tenpai = self.hand_analyzer.is_tenpai(temp_hand_after_discard, player.melds)
+            tenpai_by_value[tile_to_discard.value] = tenpai
+            if tenpai:
                 riichi_discards.append(tile_to_discard)
 
         return riichi_discards
@@ -1,6 +1,6 @@
 # 定义所有麻将牌、场风、动作类型、优先级等不变的配置数据。
 # constants.py
-from typing import Set, Dict
+from typing import Set, Dict, Tuple, FrozenSet
 from enum import Enum, auto
 
 # 假设 actions.py 在同一模块级别或父级
@@ -44,6 +44,17 @@ TERMINAL_HONOR_VALUES: Set[int] = {
     DRAGON_RED,
 }
 
+# 老头牌 (数牌 1/9)
+TERMINAL_VALUES: FrozenSet[int] = frozenset((MAN_1, MAN_9, PIN_1, PIN_9, SOU_1, SOU_9))
+
+# 宝牌指示牌 value -> 宝牌 value (查表, 替代按花色分支计算)
+# 数牌 9→1 循环, 风牌 东→南→西→北→东, 三元牌 白→发→中→白
+NEXT_DORA_VALUE: Tuple[int, ...] = tuple(
+    [base + (n + 1) % 9 for base in (MAN_1, PIN_1, SOU_1) for n in range(9)]
+    + [WIND_EAST + (i + 1) % 4 for i in range(4)]
+    + [DRAGON_WHITE + (i + 1) % 3 for i in range(3)]
+)
+
 # ======================================================================
 # 2. 游戏流程与规则 (Game Flow & Rules)
 # ======================================================================
@@ -79,3 +90,19 @@ ACTION_PRIORITY: Dict[ActionType, int] = {
     ActionType.CHI: 1,
     ActionType.PASS: 0,
 }
+
+# 役种名 -> 位 (WinDetails.yaku_mask / yakuman_mask): 复合判断用一次按位与代替多次列表查找
+YAKU_NAMES: Tuple[str, ...] = (
+    "Riichi", "Double Riichi", "Ippatsu", "Menzen Tsumo", "Rinshan Kaihou",
+    "Haitei Raoyue", "Houtei Raoyui", "Chiitoitsu", "Tanyao", "Pinfu", "Iipeikou",
+    "Toitoi", "Sanankou", "Sankantsu", "Honroutou", "Shousangen", "Sanshoku Doujun",
+    "Ikkitsuukan", "Chanta", "Junchan", "Honiisou", "Chiniisou", "Haku", "Hatsu",
+    "Chun", "Player Wind", "Round Wind",
+)
+YAKUMAN_NAMES: Tuple[str, ...] = (
+    "Tenhou", "Chiihou", "Kokushi", "Kokushi 13-sided", "Suuankou", "Suuankou Tanki",
+    "Daisangen", "Daisuushi", "Shousuushi", "Tsuuiisou", "Ryuuiisou", "Chinroutou",
+    "Chuuren Poutou", "Chuuren Poutou True", "Dai-sharin",
+)
+YAKU_BIT: Dict[str, int] = {name: 1 << i for i, name in enumerate(YAKU_NAMES)}
+YAKUMAN_BIT: Dict[str, int] = {name: 1 << i for i, name in enumerate(YAKUMAN_NAMES)}
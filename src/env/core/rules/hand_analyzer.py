@@ -10,6 +10,8 @@
 设计见 docs/HAND_DECOMPOSITION_DESIGN.md。
 """
 
+import functools
+import operator
 from typing import List, Set, Counter as TypingCounter, Dict, Optional, Any, Tuple, Iterator
 from collections import Counter
 from dataclasses import dataclass, field
@@ -18,12 +20,15 @@ from src.env.core.actions import Tile, ActionType, KanType
 from src.env.core.game_state import Meld
 from src.env.core.rules.constants import TERMINAL_HONOR_VALUES
 
+# 牌按 value 排序的取键函数 (operator.attrgetter, C 实现)
+_tile_value = operator.attrgetter("value")
+
 # ======================================================================
 # 1. 核心数据结构 (WinForm & HandComponent)
 # ======================================================================
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)  # 每种分解都要构造 4~7 个, slots 省去实例 __dict__
 class HandComponent:
     """
     表示一个已分解的面子（或雀头）—— HandAnalyzer 的内部解析结果。
@@ -35,8 +40,12 @@ class HandComponent:
     is_open: bool = False  # True=来自副露(player.melds)，False=手牌内
 
     def __post_init__(self):
-        # 保证 tiles 内部按 value 有序
-        object.__setattr__(self, "tiles", tuple(sorted(self.tiles)))
+        # 保证 tiles 内部按 value 有序; 刻子/杠子/雀头各张同 value, 本身即有序, 只有顺子需要排序
+        # (按 value 取键在 C 层比较, 与 Tile.__lt__ 的稳定排序结果相同)
+        if self.type == "shuntsu":
+            object.__setattr__(self, "tiles", tuple(sorted(self.tiles, key=_tile_value)))
+        elif type(self.tiles) is not tuple:
+            object.__setattr__(self, "tiles", tuple(self.tiles))
 
     @property
     def value(self) -> int:
@@ -44,7 +53,7 @@ class HandComponent:
         return self.tiles[0].value if self.tiles else -1
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WinForm:
     """表示一个完整的和牌形式（一种分解方法）。"""
 
@@ -87,11 +96,31 @@ _SUIT_DECOMP_CACHE: Dict[Tuple[int, ...], List[Tuple[int, int, int]]] = {}
 _HONOR_DECOMP_CACHE: Dict[Tuple[int, ...], List[Tuple[int, int, int]]] = {}
 
 
+def _pareto_front(options: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+    """
+    去重并剔除被支配的 (mentsu, taatsu, pairs) 组合。
+    向听公式对三项均单调不增, 三项都不大于另一取法的组合不可能给出更小向听,
+    剔除后各花色通常只剩 1~3 个组合, 4 花色笛卡尔积组合的开销随之下降。
+    """
+    uniq = set(options)
+    return sorted(
+        (
+            o
+            for o in uniq
+            if not any(
+                p != o and p[0] >= o[0] and p[1] >= o[1] and p[2] >= o[2] for p in uniq
+            )
+        ),
+        reverse=True,
+    )
+
+
 def _decompose_suit(counts: List[int]) -> List[Tuple[int, int, int]]:
     """
     动态分解单一数牌花色（懒计算，避免预生成 200 万状态全表）。
     counts: 长度 9 的列表，每个 0-4。
-    返回该花色所有可达的 (mentsu, taatsu, pairs) 组合（由调用方取最优向听）。
+    返回该花色可达的非支配 (mentsu, taatsu, pairs) 组合（由调用方取最优向听）。
+    按计数向量缓存, 每种花色形状只分解一次, 之后向听计算对每个花色只做一次查表。
     其中:
         mentsu = 完整面子(顺子/刻子)数
         taatsu = 部分搭子(边张/嵌张)数，不含对子
@@ -150,6 +179,7 @@ def _decompose_suit(counts: List[int]) -> List[Tuple[int, int, int]]:
     if cached is not None:
         return cached
     dfs(0, 0, 0, 0)
+    results = _pareto_front(results)
     _SUIT_DECOMP_CACHE[key] = results
     return results
 
@@ -158,7 +188,7 @@ def _decompose_honors(counts: List[int]) -> List[Tuple[int, int, int]]:
     """
     字牌分解：字牌只能组刻子/对子/孤张（无顺子）。
     counts: 长度 7 的列表（27-33 各花色对应 value 的计数），每个 0-4。
-    返回 (mentsu, taatsu, pairs) 组合（字牌无搭子，taatsu 恒为 0）。
+    返回非支配的 (mentsu, taatsu, pairs) 组合（字牌无搭子，taatsu 恒为 0）。
     """
     results: List[Tuple[int, int, int]] = []
     work = list(counts)
@@ -190,36 +220,166 @@ def _decompose_honors(counts: List[int]) -> List[Tuple[int, int, int]]:
     if cached is not None:
         return cached
     dfs(0, 0, 0)
+    results = _pareto_front(results)
     _HONOR_DECOMP_CACHE[key] = results
     return results
 
 
 def _count_tiles_by_value(tiles: List[Tile]) -> TypingCounter[int]:
-    """按 value 统计张数（忽略 is_red）"""
-    return Counter(t.value for t in tiles)
+    """按 value 统计张数（忽略 is_red）; map + attrgetter 走 C 层计数, 不经生成器帧"""
+    return Counter(map(_tile_value, tiles))
 
 
-def _tiles_to_suit_honor_counts(tiles: List[Tile]) -> Tuple[List[int], List[int], List[int], List[int]]:
+def _value_counts34(tiles: List[Tile]) -> List[int]:
+    """Tile 列表 -> 长度 34 的 value 计数向量"""
+    counts = [0] * 34
+    for t in tiles:
+        counts[t.value] += 1
+    return counts
+
+
+# --- 和牌形存在性判定: 直接在 34 计数向量上做, 按花色缓存结果 ---
+# 每个数牌花色只有有限种计数组合, 缓存后同一花色形状只判定一次 (与 _SUIT_DECOMP_CACHE 同思路)
+
+
+@functools.lru_cache(maxsize=None)
+def _suit_is_melds(key: Tuple[int, ...]) -> bool:
     """
-    将 Tile 列表转为 3 个数牌花色 + 1 个字牌的计数向量。
-    返回 (man_counts[9], pin_counts[9], sou_counts[9], honor_counts[7])。
-    man: value 0-8, pin: 9-17, sou: 18-26, honor: 27-33。
+    单一数牌花色 (长度 9 计数) 能否恰好拆成若干面子。
+    从最小 value 起贪心: 该位置的牌只能作刻子或顺子起点; 三组同起点顺子与三个刻子等价,
+    因此顺子起点数取 c % 3 即可, 无需回溯。
     """
-    man = [0] * 9
-    pin = [0] * 9
-    sou = [0] * 9
-    honor = [0] * 7
-    for t in tiles:
-        v = t.value
-        if v <= 8:
-            man[v] += 1
-        elif v <= 17:
-            pin[v - 9] += 1
-        elif v <= 26:
-            sou[v - 18] += 1
-        else:
-            honor[v - 27] += 1
-    return man, pin, sou, honor
+    work = list(key)
+    for i in range(_NUM_TILE_VALUES_PER_SUIT):
+        seq = work[i] % 3
+        if seq:
+            if i > 6 or work[i + 1] < seq or work[i + 2] < seq:
+                return False
+            work[i + 1] -= seq
+            work[i + 2] -= seq
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def _suit_is_melds_and_pair(key: Tuple[int, ...]) -> bool:
+    """单一数牌花色能否拆成若干面子 + 1 个雀头"""
+    for j in range(_NUM_TILE_VALUES_PER_SUIT):
+        if key[j] >= 2:
+            work = list(key)
+            work[j] -= 2
+            if _suit_is_melds(tuple(work)):
+                return True
+    return False
+
+
+def _is_standard_agari(counts: List[int]) -> bool:
+    """
+    34 计数向量能否拆成 若干面子 + 1 雀头 (标准型)。
+    面子数由总张数决定, 调用方负责校验张数与副露数匹配。
+    """
+    has_pair = False
+    for base in (0, 9, 18):
+        key = tuple(counts[base:base + 9])
+        r = sum(key) % 3
+        if r == 1:
+            return False
+        if r == 2:
+            if has_pair or not _suit_is_melds_and_pair(key):
+                return False
+            has_pair = True
+        elif not _suit_is_melds(key):
+            return False
+    # 字牌只能组刻子/雀头
+    for c in counts[27:]:
+        if c == 2:
+            if has_pair:
+                return False
+            has_pair = True
+        elif c != 0 and c != 3:
+            return False
+    return has_pair
+
+
+_KOKUSHI_VALUES: Tuple[int, ...] = tuple(sorted(TERMINAL_HONOR_VALUES))
+
+
+def _is_agari_counts(counts: List[int], num_melds: int) -> bool:
+    """
+    手牌计数向量 (含和了牌, 不含副露) + 副露数 -> 是否构成和牌形。
+    门清 14 张时额外判定七对子 / 国士无双。
+    """
+    n = sum(counts)
+    if num_melds == 0 and n == 14:
+        # 七对子: 7 种 value 各 2 张
+        if counts.count(2) == 7:
+            return True
+        # 国士无双: 13 种幺九字全有 (其中 1 种成对), 且没有其他牌
+        if all(counts[v] for v in _KOKUSHI_VALUES) and sum(
+            counts[v] for v in _KOKUSHI_VALUES
+        ) == 14:
+            return True
+    melds_needed = 4 - num_melds
+    if melds_needed < 0 or n != 3 * melds_needed + 2:
+        return False
+    return _is_standard_agari(counts)
+
+
+_KOKUSHI_MASK: int = sum(1 << v for v in _KOKUSHI_VALUES)
+
+
+@functools.lru_cache(maxsize=1 << 14)
+def _wait_mask(hand_key: Tuple[int, ...], num_melds: int) -> int:
+    """
+    和了前手牌计数 (长度 34, 不含副露) + 副露数 -> 听牌 value 位掩码 (bit v = 加一张 v 构成和牌形)。
+    按手牌内容缓存: 同一手牌 (立直后每巡 / 振听 / 杠前后比较) 重复查询直接命中, 手牌一变 key 即变,
+    无需额外失效逻辑。不排除已持有 4 张的 value, 由调用方结合副露过滤。
+    候选只取手牌各张 ±2 范围内的同花色数牌与手中字牌 (和了牌必与手牌组成面子/雀头), 门清时补上幺九字 (国士)。
+    孤张 (单张且 ±2 内无同花色牌的数牌 / 单张字牌) 只能与和了牌成对, 国士以外有两张以上孤张时必不听牌。
+    """
+    present = 0
+    singles = 0
+    for v, c in enumerate(hand_key):
+        if c:
+            present |= 1 << v
+            if c == 1:
+                singles |= 1 << v
+    if num_melds or present & ~_KOKUSHI_MASK:
+        isolated = 0
+        s = singles
+        while s:
+            low = s & -s
+            v = low.bit_length() - 1
+            s ^= low
+            if v < 27:
+                pos = v % 9
+                lo = pos - 2 if pos > 2 else 0
+                hi = pos + 2 if pos < 6 else 8
+                if present & (((1 << (hi - lo + 1)) - 1) << (v - pos + lo)) & ~low:
+                    continue
+            isolated += 1
+            if isolated > 1:
+                return 0
+    cand = _KOKUSHI_MASK if num_melds == 0 else 0
+    for v, c in enumerate(hand_key):
+        if c:
+            if v < 27:
+                pos = v % 9
+                lo = pos - 2 if pos > 2 else 0
+                hi = pos + 2 if pos < 6 else 8
+                cand |= ((1 << (hi - lo + 1)) - 1) << (v - pos + lo)
+            else:
+                cand |= 1 << v
+    counts = list(hand_key)
+    mask = 0
+    while cand:
+        low = cand & -cand
+        v = low.bit_length() - 1
+        cand ^= low
+        counts[v] += 1
+        if _is_agari_counts(counts, num_melds):
+            mask |= low
+        counts[v] -= 1
+    return mask
 
 
 # ======================================================================
@@ -235,6 +395,8 @@ class HandAnalyzer:
     2. 阶段B: find_all_winning_forms (实例级回溯，仅和牌时)。
     """
 
+    __slots__ = ("config", "terminal_honor_values", "_kokushi_values")
+
     def __init__(self, config: dict = None):
         self.config = config or {}
         self.terminal_honor_values: Set[int] = set(TERMINAL_HONOR_VALUES)
@@ -264,19 +426,16 @@ class HandAnalyzer:
 
         # —— 标准型向听 ——
         # 副露的牌不参与手牌分解，但占用 mentsu 名额
-        meld_tile_counts = _count_tiles_by_value(
-            [t for m in melds for t in m.tiles]
-        )
-        # 手牌部分（含可能存在的副露折算）按花色拆分
-        man, pin, sou, honor = _tiles_to_suit_honor_counts(hand_tiles)
+        # 手牌只统计一次 34 计数向量, 标准型按花色切片、七对子/国士直接复用
+        counts = _value_counts34(hand_tiles)
 
         # 各花色分解的所有 (mentsu, partial, remain) 组合
         suit_opts = [
-            _decompose_suit(man),
-            _decompose_suit(pin),
-            _decompose_suit(sou),
+            _decompose_suit(counts[0:9]),
+            _decompose_suit(counts[9:18]),
+            _decompose_suit(counts[18:27]),
         ]
-        honor_opts = [_decompose_honors(honor)]
+        honor_opts = [_decompose_honors(counts[27:34])]
 
         # 标准型需要 4 面子 + 1 雀头。副露已贡献 open_mentsu 个面子。
         # 手牌需贡献 (4 - open_mentsu) 个面子。
@@ -289,12 +448,12 @@ class HandAnalyzer:
         # —— 七对子向听（仅门清）——
         best_chiitoitsu = 99
         if chiitoitsu_ok and open_mentsu == 0:
-            best_chiitoitsu = self._chiitoitsu_shanten(hand_tiles)
+            best_chiitoitsu = self._chiitoitsu_shanten(hand_tiles, counts)
 
         # —— 国士向听（仅门清）——
         best_kokushi = 99
         if open_mentsu == 0:
-            best_kokushi = self._kokushi_shanten(hand_tiles)
+            best_kokushi = self._kokushi_shanten(hand_tiles, counts)
 
         return min(best_standard, best_chiitoitsu, best_kokushi)
 
@@ -356,66 +515,93 @@ class HandAnalyzer:
                             best = shanten
         return best
 
-    def _chiitoitsu_shanten(self, hand_tiles: List[Tile]) -> int:
+    def _chiitoitsu_shanten(
+        self, hand_tiles: List[Tile], counts: Optional[List[int]] = None
+    ) -> int:
         """七对子向听（需门清，手牌 13 张听牌态 / 14 张和牌态）。
         标准公式: shanten = 6 - pairs + max(0, 7 - kinds) (种类不足需补种类)。
+        counts: 调用方已算好的 34 计数向量 (省去重复统计)。
         """
-        counts = _count_tiles_by_value(hand_tiles)
-        pairs = sum(1 for c in counts.values() if c >= 2)
-        kinds = len(counts)
+        if counts is None:
+            counts = _value_counts34(hand_tiles)
+        pairs = sum(1 for c in counts if c >= 2)
+        kinds = 34 - counts.count(0)
         if len(hand_tiles) == 14:
             if pairs == 7 and kinds == 7:
                 return -1
         # 13/14张通用: 6 - pairs + 种类不足惩罚
         return 6 - pairs + max(0, 7 - kinds)
 
-    def _kokushi_shanten(self, hand_tiles: List[Tile]) -> int:
-        """国士无双向听（需门清）。"""
-        counts = _count_tiles_by_value(hand_tiles)
-        term_honor_counts = {v: counts.get(v, 0) for v in self._kokushi_values}
-        kinds = sum(1 for c in term_honor_counts.values() if c >= 1)
-        has_pair = any(c >= 2 for c in term_honor_counts.values())
+    def _kokushi_shanten(
+        self, hand_tiles: List[Tile], counts: Optional[List[int]] = None
+    ) -> int:
+        """国士无双向听（需门清）。counts: 同 _chiitoitsu_shanten。"""
+        if counts is None:
+            counts = _value_counts34(hand_tiles)
+        kinds = 0
+        has_pair = False
+        for v in _KOKUSHI_VALUES:
+            c = counts[v]
+            if c:
+                kinds += 1
+                if c >= 2:
+                    has_pair = True
         if len(hand_tiles) == 14 and kinds == 13 and has_pair:
             return -1
         # 13 张：shanten = 13 - kinds - (1 if has_pair else 0)
         return 13 - kinds - (1 if has_pair else 0)
 
     def is_tenpai(self, hand_tiles: List[Tile], melds: List[Meld]) -> bool:
-        """13 张手牌是否听牌。"""
-        total = len(hand_tiles) + sum(len(m.tiles) for m in melds)
-        if total != 13:
-            return False
-        return self.calculate_shanten(hand_tiles, melds) == 0
+        """13 张手牌是否听牌 (与 find_wait_tiles 同一判定: 至少听一种 value)。"""
+        return bool(self.wait_mask(hand_tiles, melds))
 
     def find_wait_tiles(self, hand_tiles: List[Tile], melds: List[Meld]) -> Set[int]:
         """
         返回 13 张手牌所听的所有 value 集合（用于振听判定）。
         对每个候选 value，加入后若构成和牌形则该 value 是听的牌。
 
-        优化: 用 check_win_shape (回溯判存在性) 替代 calculate_shanten==-1，
-              因为"是否和牌"的回溯判定比算完整向听快得多。
+        优化: 听牌位掩码按手牌计数缓存 (_wait_mask), 手牌不变时重复查询 (立直后每巡、杠前后比较)
+              不再重新判定; 只需再剔除手牌 + 副露已持有 4 张的 value。
         """
-        waits: Set[int] = set()
+        mask = self.wait_mask(hand_tiles, melds)
+        return {v for v in range(34) if mask >> v & 1}
+
+    def wait_mask(self, hand_tiles: List[Tile], melds: List[Meld]) -> int:
+        """13 张手牌的听牌 value 位掩码 (bit v = 听 v), 已剔除持有 4 张的 value; 非 13 张时为 0。"""
         total = len(hand_tiles) + sum(len(m.tiles) for m in melds)
         if total != 13:
-            return waits
-
-        # 快速剪枝: 非听牌态 (shanten > 0) 不可能有听的牌
-        if self.calculate_shanten(hand_tiles, melds) > 0:
-            return waits
-
-        cur_counts = _count_tiles_by_value(hand_tiles + [t for m in melds for t in m.tiles])
-        is_menzen = not melds
-
-        for v in range(34):
-            # 已有 4 张的 value 不可能是听的牌
-            if cur_counts.get(v, 0) >= 4:
-                continue
-            test_tile = Tile(value=v, is_red=False)
-            # 用回溯判和牌形 (比完整 shanten 快)
-            if self.check_win_shape(hand_tiles + [test_tile], melds, test_tile):
-                waits.add(v)
-        return waits
+            return 0
+        counts = _value_counts34(hand_tiles)
+        mask = _wait_mask(tuple(counts), len(melds))
+        if not mask:
+            return 0
+        for m in melds:
+            for t in m.tiles:
+                counts[t.value] += 1
+        for v, c in enumerate(counts):
+            if c >= 4:
+                mask &= ~(1 << v)
+        return mask
+
+    def waits_on_any(
+        self,
+        hand_tiles: List[Tile],
+        melds: List[Meld],
+        values: Set[int],
+        known_wait: Optional[int] = None,
+    ) -> bool:
+        """
+        13 张手牌是否听 values 中的任一 value (等价于 bool(find_wait_tiles(...) & values))。
+        用于振听判定 (候选 = 弃牌河 value)。
+        known_wait: 调用方已验证过和牌形的听牌 value (如荣和牌), 命中时直接返回。
+        """
+        if not values:
+            return False
+        if known_wait is not None and known_wait in values:
+            total = len(hand_tiles) + sum(len(m.tiles) for m in melds)
+            return total == 13
+        mask = self.wait_mask(hand_tiles, melds)
+        return any(mask >> v & 1 for v in values)
 
     # ==================================================================
     # == 阶段 B: 实例级回溯分解 ==
@@ -450,58 +636,20 @@ class HandAnalyzer:
     ) -> bool:
         """
         检查 14 张牌（含 winning_tile）是否构成和牌形。
-        性能优化: 用存在性判定 (找到第一个分解即返回)，不枚举全部。
+        性能优化: 只做存在性判定, 且直接在 34 计数向量上判定 (按花色缓存), 不做 Tile 级回溯。
         """
-        is_menzen = not melds
-
-        # 特殊牌型（仅门清，快速判定）
-        if is_menzen:
-            if self._find_chiitoitsu_forms(hand_tiles, winning_tile):
-                return True
-            if self._find_kokushi_forms(hand_tiles, winning_tile):
-                return True
-
-        # 标准型: 存在性判定
-        open_components = [self._meld_to_component(m) for m in melds]
-        return self._has_standard_form(hand_tiles, open_components)
+        return _is_agari_counts(_value_counts34(hand_tiles), len(melds))
 
-    def _has_standard_form(
-        self, hand_tiles: List[Tile], open_components: List[HandComponent]
-    ) -> bool:
-        """快速判断是否存在至少一种标准型分解（找到即返回，不枚举全部）。"""
-        melds_needed = 4 - len(open_components)
-        if melds_needed < 0:
-            return False
-        value_counts = _count_tiles_by_value(hand_tiles)
-        possible_pairs = {v for v, c in value_counts.items() if c >= 2}
-        for pair_value in possible_pairs:
-            pair_tiles, remaining = self._take_n_tiles_by_value(hand_tiles, pair_value, 2)
-            if pair_tiles is None:
-                continue
-            if self._has_melds_decomposition(remaining, melds_needed):
-                return True
-        return False
-
-    def _has_melds_decomposition(self, tiles: List[Tile], k: int) -> bool:
-        """快速判断 tiles 能否分解为 k 个面子（找到即返回 True）。"""
-        if k == 0:
-            return not tiles
-        if not tiles:
-            return False
-        counts = _count_tiles_by_value(tiles)
-        min_val = min(counts.keys())
-        # 刻子
-        if counts[min_val] >= 3:
-            _, rest = self._take_n_tiles_by_value(tiles, min_val, 3)
-            if self._has_melds_decomposition(rest, k - 1):
-                return True
-        # 顺子
-        if min_val < 27 and min_val % 9 <= 6:
-            if counts.get(min_val + 1, 0) >= 1 and counts.get(min_val + 2, 0) >= 1:
-                seq, rest = self._take_sequence(tiles, min_val)
-                if seq is not None and self._has_melds_decomposition(rest, k - 1):
-                    return True
-        return False
+    def wins_on(self, hand_counts: List[int], num_melds: int, tile_value: int) -> bool:
+        """
+        手牌计数向量 (和了前, 不含副露) 加一张 tile_value 是否构成和牌形。
+        原地 +1 判定后复原, 不复制手牌, 供荣和预判在每次弃牌时调用。
+        """
+        hand_counts[tile_value] += 1
+        try:
+            return _is_agari_counts(hand_counts, num_melds)
+        finally:
+            hand_counts[tile_value] -= 1
 
     # ==================================================================
     # == 内部: 副露转换 ==
@@ -568,15 +716,15 @@ class HandAnalyzer:
         """
         从 tiles 中取出 n 张指定 value 的 Tile 实例。
         返回 (取出的列表, 剩余列表)。若不足 n 张返回 (None, tiles)。
+        单趟分拣: 前 n 张该 value 的牌进 taken, 其余按原顺序进 remaining (不再逐张 list.remove)。
         """
         taken: List[Tile] = []
-        remaining = list(tiles)
+        remaining: List[Tile] = []
         for t in tiles:
             if t.value == value and len(taken) < n:
                 taken.append(t)
-                remaining.remove(t)
-            if len(taken) == n:
-                break
+            else:
+                remaining.append(t)
         if len(taken) < n:
             return None, tiles
         return taken, remaining
@@ -621,19 +769,18 @@ class HandAnalyzer:
     def _take_sequence(
         self, tiles: List[Tile], v: int
     ) -> Tuple[Optional[List[Tile]], List[Tile]]:
-        """取 v, v+1, v+2 各一张（Tile 实例）。返回 (序列, 剩余)。"""
-        remaining = list(tiles)
-        seq: List[Tile] = []
-        for need in (v, v + 1, v + 2):
-            found = None
-            for t in remaining:
-                if t.value == need:
-                    found = t
-                    break
-            if found is None:
-                return None, tiles
-            seq.append(found)
-            remaining.remove(found)
+        """取 v, v+1, v+2 各一张（Tile 实例, 各取该 value 的第一张）。返回 (序列, 剩余)。"""
+        # 单趟分拣: 按 value - v 落槽, 不再三次查找 + list.remove
+        seq: List[Optional[Tile]] = [None, None, None]
+        remaining: List[Tile] = []
+        for t in tiles:
+            d = t.value - v
+            if 0 <= d <= 2 and seq[d] is None:
+                seq[d] = t
+            else:
+                remaining.append(t)
+        if seq[0] is None or seq[1] is None or seq[2] is None:
+            return None, tiles
         return seq, remaining
 
     # ==================================================================
@@ -8,7 +8,6 @@
 # Utility,"resolve_response_priorities(self, declarations: Dict[int, Action], game_state: GameState) -> Tuple[Optional[Action], Optional[int]]",委托 ActionValidator.resolve_response_priorities，解决多玩家响应时的冲突。
 from __future__ import annotations
 from typing import List, Dict, Optional, Tuple, Any, TYPE_CHECKING
-from dataclasses import dataclass, field
 
 # --------------------------------------------------------------------------
 # 假设的类型导入 (用于类型提示)
@@ -16,33 +15,48 @@ from dataclasses import dataclass, field
 # --------------------------------------------------------------------------
 
 from src.env.core.game_state import GameState, PlayerState, GamePhase
-from src.env.core.actions import Action, ActionType, Tile, KanType
+from src.env.core.actions import Action, ActionType, KanType
 from src.env.core.rules.action_validator import ActionValidator
-from src.env.core.rules.scoring import Scoring
+from src.env.core.rules.scoring import Scoring, WinDetails
 from src.env.core.rules.hand_analyzer import HandAnalyzer
 from src.env.core.rules.constants import TERMINAL_HONOR_VALUES, ACTION_PRIORITY, GAME_LENGTH_MAX_WIND, Wind
 
 # 模块内 print 重绑到 logger.debug (默认静默)
-from src.utils.logger import get_logger as _get_logger
-print = _get_logger(__name__).debug
+from src.utils.logger import get_env_logger as _get_logger
+_log = _get_logger(__name__)
+print = _log.debug
+
+# generate_candidate_actions 每次调用都要比较的阶段成员, 提升为模块常量
+_PLAYER_DISCARD = GamePhase.PLAYER_DISCARD
+_WAITING_FOR_RESPONSE = GamePhase.WAITING_FOR_RESPONSE
+
+# 已执行动作 -> 下一阶段 (determine_next_phase 查表)
+_NEXT_PHASE: Dict[ActionType, GamePhase] = {
+    # 和牌或流局，进入结算阶段
+    ActionType.TSUMO: GamePhase.HAND_OVER_SCORES,
+    ActionType.RON: GamePhase.HAND_OVER_SCORES,
+    ActionType.SPECIAL_DRAW: GamePhase.HAND_OVER_SCORES,
+    # 吃/碰，获得新牌后，进入打牌阶段
+    # GameController 负责将弃牌加入副露并设置 player.drawn_tile = None
+    ActionType.PON: GamePhase.PLAYER_DISCARD,
+    ActionType.CHI: GamePhase.PLAYER_DISCARD,
+    # 杠，进入动作处理阶段
+    # GameController 将在此阶段处理摸岭上牌，然后转回 PLAYER_DISCARD
+    ActionType.KAN: GamePhase.ACTION_PROCESSING,
+    # 打牌，游戏进入等待响应阶段 (牌山是否摸完的检查属于 GameController 的职责)
+    ActionType.DISCARD: GamePhase.WAITING_FOR_RESPONSE,
+    # 立直宣言伴随打牌 (apply_action 已处理 riichi_discard 弃牌)，
+    # 因此立直后同样进入等待响应阶段。
+    ActionType.RIICHI: GamePhase.WAITING_FOR_RESPONSE,
+    # 错过响应或无人响应: GameController 看到 PASS 后检查是否所有人都 PASS 了,
+    # 如果是，它将设置下一家摸牌，并转换到 PLAYER_DRAW
+    ActionType.PASS: GamePhase.PLAYER_DRAW,
+}
 
 # 假设常量定义在 constants.py
 # from .constants import ROUND_WIND_SOUTH, GAME_LENGTH_MAX_WIND
 
 
-# 假设的 WinDetails 数据结构 (可能移至 data.py 或 scoring.py)
-@dataclass
-class WinDetails:
-    is_valid_win: bool = False
-    winning_tile: Optional["Tile"] = None
-    yaku: List[str] = field(default_factory=list)
-    han: int = 0
-    fu: int = 0
-    score_points: int = 0
-    is_yakuman: bool = False
-    # ... 其他需要的结算细节
-
-
 # --------------------------------------------------------------------------
 
 
@@ -57,6 +71,9 @@ class RulesEngine:
     它自身不包含任何具体的规则判断逻辑 (如：能否Chi/Pon，如何算符)。
     """
 
+    # 显式 __slots__: 每步经 rules_engine.action_validator / scoring 委托, 属性访问走槽描述符
+    __slots__ = ("config", "game_rules_config", "hand_analyzer", "scoring", "action_validator")
+
     def __init__(self, config: Optional[Dict] = None):
         """
         构造函数：初始化规则配置并实例化所有规则子模块。
@@ -108,7 +125,7 @@ class RulesEngine:
         # -----------------------------------------------------------------
         # 阶段 1: 玩家摸牌后 (轮到自己)
         # -----------------------------------------------------------------
-        if phase == GamePhase.PLAYER_DISCARD:
+        if phase is _PLAYER_DISCARD:
             if player_index != game_state.current_player_index:
                 return []
 
@@ -118,14 +135,26 @@ class RulesEngine:
         # -----------------------------------------------------------------
         # 阶段 2: 响应他人弃牌时
         # -----------------------------------------------------------------
-        elif phase == GamePhase.WAITING_FOR_RESPONSE:
+        elif phase is _WAITING_FOR_RESPONSE:
             if player_index == game_state.last_discard_player_index:
                 return []
 
+            # 同一张弃牌的候选动作只算一次 (Env 提示 / PASS 振听判定复用), 打牌时由 GameState 清空
+            cache = getattr(game_state, "_response_candidates", None)
+            cached = cache is not None and getattr(game_state, "_response_cache_key", None) == (
+                game_state.last_discard_player_index,
+                game_state.last_discarded_tile,
+            )
+            if cached and player_index in cache:
+                return cache[player_index]
+
             # 委托 ActionValidator 生成 Ron/Pon/Kan/Chi/Pass 动作
-            return self.action_validator.get_legal_actions_on_response(
+            candidates = self.action_validator.get_legal_actions_on_response(
                 player, game_state
             )
+            if cached:
+                cache[player_index] = candidates
+            return candidates
 
         # -----------------------------------------------------------------
         # 阶段 3: 杠后摸岭上牌 (已在上一轮讨论中移除，合并到 ACTION_PROCESSING)
@@ -139,6 +168,15 @@ class RulesEngine:
             # ACTION_PROCESSING 等阶段，玩家不需要选择动作。
             return []
 
+    def any_response_possible(self, game_state: "GameState") -> bool:
+        """
+        【委托】当前弃牌是否有任一对手可以响应 (荣和/碰/杠/吃)。
+        """
+        if not self.action_validator:
+            raise RuntimeError("ActionValidator not initialized.")
+
+        return self.action_validator.any_response_possible(game_state)
+
     def resolve_response_priorities(
         self, response_declarations: Dict[int, "Action"], game_state: "GameState"
     ) -> Tuple[Optional["Action"], Optional[int]]:
@@ -226,14 +264,17 @@ class RulesEngine:
         elif end_reason == "EXHAUSTIVE_DRAW":
             # 荒牌流局 (牌山摸完)
             # 委托 Scoring 模块处理荒牌流局罚符 (Tenpai/Not Tenpai)
-            outcome["score_changes"] = self.scoring.calculate_ryuukyoku_penalty_tenpai(
-                game_state
-            )
-            # 附带 tenpai 玩家列表, 供 determine_next_hand_state 判断庄家连庄
-            outcome["tenpai_players"] = [
+            # 听牌判定只做一次: 同一份 tenpai_players 既用于听罚分配, 也供
+            # determine_next_hand_state 判断庄家连庄
+            analyzer = self.scoring.hand_analyzer
+            tenpai_players = [
                 p.player_index for p in game_state.players
-                if self.scoring.hand_analyzer.is_tenpai(p.hand, p.melds)
+                if analyzer.is_tenpai(p.hand, p.melds)
             ]
+            outcome["score_changes"] = self.scoring.calculate_ryuukyoku_penalty_tenpai(
+                game_state, tenpai_players
+            )
+            outcome["tenpai_players"] = tenpai_players
 
         elif end_reason == "SPECIAL_DRAW":
             # 特殊流局 (九种九牌等) 通常不进行听罚分配
@@ -258,43 +299,10 @@ class RulesEngine:
 
         (纠正：移除了 RINSHAN_DRAW 和 DRAW_WALL_EMPTY 检查)
         """
-        # 1. 检查导致本局结束的动作
-        if executed_action.type in {
-            ActionType.TSUMO,
-            ActionType.RON,
-            ActionType.SPECIAL_DRAW,
-        }:
-            # 和牌或流局，进入结算阶段
-            return GamePhase.HAND_OVER_SCORES
-
-        # 2. 检查鸣牌动作
-        elif executed_action.type in {ActionType.PON, ActionType.CHI}:
-            # 吃/碰，获得新牌后，进入打牌阶段
-            # GameController 负责将弃牌加入副露并设置 player.drawn_tile = None
-            return GamePhase.PLAYER_DISCARD
-
-        elif executed_action.type == ActionType.KAN:
-            # 杠，进入动作处理阶段
-            # GameController 将在此阶段处理摸岭上牌，然后转回 PLAYER_DISCARD
-            return GamePhase.ACTION_PROCESSING
-
-        # 3. 检查常规流程动作
-        elif executed_action.type == ActionType.DISCARD:
-            # 打牌，游戏进入等待响应阶段
-            # **注意：** 牌山是否摸完的检查
-            # 已被移除，它属于 GameController 的职责。
-            return GamePhase.WAITING_FOR_RESPONSE
-
-        elif executed_action.type == ActionType.RIICHI:
-            # 立直宣言伴随打牌 (apply_action 已处理 riichi_discard 弃牌)，
-            # 因此立直后同样进入等待响应阶段。
-            return GamePhase.WAITING_FOR_RESPONSE
-
-        elif executed_action.type == ActionType.PASS:
-            # 错过响应或无人响应
-            # GameController 看到 PASS 后，会检查是否所有人都 PASS 了
-            # 如果是，它将设置下一家摸牌，并转换到 PLAYER_DRAW
-            return GamePhase.PLAYER_DRAW
+        # 按动作类型查表 (替代逐个比较的 if/elif 链), 各类型的流转说明见 _NEXT_PHASE
+        next_phase = _NEXT_PHASE.get(executed_action.type)
+        if next_phase is not None:
+            return next_phase
 
         raise ValueError(f"无法确定 {executed_action.type} 后的下一阶段")
 
@@ -1,10 +1,12 @@
 # scoring.py
 
-from typing import List, Dict, Set, Optional, Any, Tuple, TYPE_CHECKING
-from dataclasses import dataclass, field
+from typing import List, Dict, Set, Optional, Any, Tuple, Iterable, Sequence, TYPE_CHECKING
+from dataclasses import dataclass, fields, MISSING
 import math
 from collections import Counter
 
+import numpy as np
+
 # 假设从 actions.py 和 game_state.py 导入
 from src.env.core.actions import Tile
 from src.env.core.game_state import GameState, PlayerState, Meld, Wall
@@ -25,28 +27,48 @@ from src.env.core.rules.constants import (
     DRAGON_WHITE,
     DRAGON_GREEN,
     DRAGON_RED,
-    MAN_1,
-    MAN_9,
-    PIN_1,
-    PIN_9,
     SOU_1,
-    SOU_9,
+    NEXT_DORA_VALUE,
+    TERMINAL_VALUES,
+    YAKU_BIT,
+    YAKUMAN_BIT,
 )
 
+# 风位 (0东 1南 2西 3北) -> 风牌 value, 场风/自风查表 (不再每次判定时建 dict)
+_WIND_TILES = (WIND_EAST, WIND_SOUTH, WIND_WEST, WIND_NORTH)
+
 # ======================================================================
 # 1. 计分数据结构 (Data Structures)
 # ======================================================================
 
 
-# ======================================================================
-# 1. 计分数据结构 (Data Structures)
-# ======================================================================
+# WinDetails 的定长记录格式 (批量评估 / 数据集落盘用): 每条 23 字节, 不含役种列表,
+# 役种只以位掩码保存 (位定义见 constants.YAKU_BIT / YAKUMAN_BIT)
+WIN_DTYPE = np.dtype(
+    [
+        ("is_valid_win", "?"),
+        ("is_tsumo", "?"),
+        ("han", "i2"),
+        ("fu", "i2"),
+        ("dora_count", "i1"),
+        ("total_han", "i2"),
+        ("score_points", "i4"),
+        ("yaku_mask", "u8"),
+        ("yakuman_mask", "u2"),
+    ]
+)
 
 
-@dataclass
+@dataclass(slots=True)  # slots: 每次荣和/自摸判定都会构造一个, 省去实例 __dict__
 class WinDetails:
     """
     存储一次和牌的详细分析结果。
+
+    yaku_list / yakuman_list 默认是共享的空 tuple (视为空), 只在判出役时整体赋值为列表,
+    无役 / 形状不成立的判定路径不再分配空列表; 调用方只读遍历, 不要原地 append。
+    score_payout 未计算时为 None。
+    yaku_mask / yakuman_mask 是与列表同步的役种位掩码 (位定义见 constants.YAKU_BIT /
+    YAKUMAN_BIT), 供 has_yaku 等成员判断 O(1) 查询。
     """
 
     is_valid_win: bool = False
@@ -55,7 +77,7 @@ class WinDetails:
 
     win_form: Optional[WinForm] = None  # 最终采用的分解形式
 
-    yaku_list: List[Tuple[str, int]] = field(default_factory=list)
+    yaku_list: Sequence[Tuple[str, int]] = ()
     han: int = 0
     fu: int = 0
 
@@ -63,10 +85,82 @@ class WinDetails:
     total_han: int = 0
 
     score_points: int = 0
-    score_payout: Dict[int, int] = field(default_factory=dict)
+    score_payout: Optional[Dict[int, int]] = None
 
     is_yakuman: bool = False
-    yakuman_list: List[str] = field(default_factory=list)
+    yakuman_list: Sequence[str] = ()
+
+    yaku_mask: int = 0
+    yakuman_mask: int = 0
+
+    def reset(self) -> None:
+        """把所有字段恢复为默认值 (Scoring 复用同一实例做合法性判定时调用);
+        字段表由 dataclasses.fields 生成 (_WIN_DETAILS_DEFAULTS), 新增字段自动纳入"""
+        for name, default, factory in _WIN_DETAILS_DEFAULTS:
+            setattr(self, name, default if factory is MISSING else factory())
+
+    def to_record(self) -> tuple:
+        """按 WIN_DTYPE 字段顺序导出的元组 (np.array(..., dtype=WIN_DTYPE) 可直接接收)"""
+        return (
+            self.is_valid_win,
+            self.is_tsumo,
+            self.han,
+            self.fu,
+            self.dora_count,
+            self.total_han,
+            self.score_points,
+            self.yaku_mask,
+            self.yakuman_mask,
+        )
+
+    @classmethod
+    def from_record(cls, rec) -> "WinDetails":
+        """由 WIN_DTYPE 记录还原数值字段与掩码; 役种列表不在记录里, 保持默认空"""
+        return cls(
+            is_valid_win=bool(rec["is_valid_win"]),
+            is_tsumo=bool(rec["is_tsumo"]),
+            han=int(rec["han"]),
+            fu=int(rec["fu"]),
+            dora_count=int(rec["dora_count"]),
+            total_han=int(rec["total_han"]),
+            score_points=int(rec["score_points"]),
+            is_yakuman=bool(rec["yakuman_mask"]),
+            yaku_mask=int(rec["yaku_mask"]),
+            yakuman_mask=int(rec["yakuman_mask"]),
+        )
+
+    def has_yaku(self, name: str) -> bool:
+        """是否含指定役 (普通役或役满, 按位掩码判断)"""
+        return bool(
+            self.yaku_mask & YAKU_BIT.get(name, 0)
+            or self.yakuman_mask & YAKUMAN_BIT.get(name, 0)
+        )
+
+
+# WinDetails.reset 用的 (字段名, 默认值, 默认工厂) 表, 由 dataclass 字段定义生成
+_WIN_DETAILS_DEFAULTS: Tuple[Tuple[str, Any, Any], ...] = tuple(
+    (f.name, f.default, f.default_factory) for f in fields(WinDetails)
+)
+
+
+def pack_win_details(details: Iterable["WinDetails"]) -> np.ndarray:
+    """
+    把一批 WinDetails 打包为 WIN_DTYPE 结构化数组。
+
+    批量统计直接在数组上做, 例如立直和了数:
+    np.count_nonzero(records["yaku_mask"] & YAKU_BIT["Riichi"])
+    """
+    return np.array([d.to_record() for d in details], dtype=WIN_DTYPE)
+
+
+def count_dora(hand34: np.ndarray, dora_ids: Iterable[int]) -> int:
+    """
+    宝牌张数: 34 维牌计数向量按宝牌 value 一次 gather 后求和。
+
+    dora_ids 是宝牌 (不是指示牌) 的 value; 同一 value 出现几次就计几次。
+    """
+    ids = np.fromiter(dora_ids, dtype=np.intp)
+    return int(hand34[ids].sum()) if ids.size else 0
 
 
 # ======================================================================
@@ -118,6 +212,11 @@ class Scoring:
         }
         self.yakuman_multiplier = 32000
 
+        # is_valid_win 专用的可复用 WinDetails (只读 is_valid_win, 不外泄; 每次判定前 reset)
+        self._scratch_details = WinDetails()
+        # (总番, 符, 是否庄家) -> 基础点数; 点数只取决于这三个整数, 算过一次即查表
+        self._points_cache: Dict[Tuple[int, int, bool], int] = {}
+
     # ======================================================================
     # == 公共 API (Public API) ==
     # ======================================================================
@@ -132,7 +231,25 @@ class Scoring:
         """
         【主入口】计算完整的和牌详情。
         """
-        details = WinDetails(winning_tile=winning_tile, is_tsumo=is_tsumo)
+        return self._evaluate_win(
+            WinDetails(), player, winning_tile, is_tsumo, game_state, full=True
+        )
+
+    def _evaluate_win(
+        self,
+        details: "WinDetails",
+        player: "PlayerState",
+        winning_tile: "Tile",
+        is_tsumo: bool,
+        game_state: "GameState",
+        full: bool,
+    ) -> "WinDetails":
+        """
+        把和牌分析写入 details (须为默认状态)。
+        full=False 时只判定合法性 (形状 + 役 + 振听), 跳过宝牌与点数计算。
+        """
+        details.winning_tile = winning_tile
+        details.is_tsumo = is_tsumo
 
         # 1. 准备手牌 (14张, 含 winning_tile)
         # 手牌(不含副露)应为 13 张, 加 winning_tile 凑 14 张。
@@ -162,7 +279,8 @@ class Scoring:
             return details  # 形状无效
 
         # 4. 先检查役满 (Yakuman): 状况役满 + 对每个 form 的结构性役满
-        all_yakuman: List[str] = list(self._find_yakuman(final_hand, player.melds, context))
+        # _find_yakuman 每次返回新列表, 直接在其上追加, 不再复制一份
+        all_yakuman: List[str] = self._find_yakuman(final_hand, player.melds, context)
         if not all_yakuman:
             for form in win_forms:
                 all_yakuman.extend(self._find_yakuman_for_form(form, context))
@@ -171,55 +289,87 @@ class Scoring:
 
         if all_yakuman:
             details.yakuman_list = all_yakuman
+            mask = 0
+            for name in all_yakuman:
+                mask |= YAKUMAN_BIT.get(name, 0)
+            details.yakuman_mask = mask
             details.is_yakuman = True
             details.han = 13 * len(all_yakuman)
-            details.total_han = details.han
-            details.score_points = self.yakuman_multiplier * len(all_yakuman)
-        else:
-            # 5. 非役满: 遍历所有分解, 找 (番最大, 符最大) 的最优形
-            best_form = None
-            best_han = -1
-            best_fu = -1
-            best_yaku_list: List[Tuple[str, int]] = []
-
+            if full:
+                details.total_han = details.han
+                details.score_points = self.yakuman_multiplier * len(all_yakuman)
+            return self._finish_validity(details, player, winning_tile, is_tsumo, game_state)
+
+        # 5a. 只判合法性: 每个役至少 1 番, 任一分解有役即满足一番缚;
+        # 找到即停, 不算符、不挑最优形、不写役种列表/掩码
+        if not full:
             for form in win_forms:
                 yaku_list = self._find_yaku(form, context)
-                han = sum(h for _, h in yaku_list)
-                fu = self._calculate_fu(form, context, player.melds)
-
-                if han > best_han or (han == best_han and fu > best_fu):
-                    best_han = han
-                    best_fu = fu
-                    best_yaku_list = yaku_list
-                    best_form = form
-
-            details.yaku_list = best_yaku_list
-            details.han = best_han
-            details.fu = best_fu
-            details.win_form = best_form
-
-            # 6. 检查一番缚 (Ippan Shibari)
-            if details.han == 0:
+                if yaku_list:
+                    details.han = sum(h for _, h in yaku_list)
+                    break
+            else:
                 details.is_valid_win = False  # 无役!
                 return details
+            return self._finish_validity(details, player, winning_tile, is_tsumo, game_state)
+
+        # 5b. 非役满: 遍历所有分解, 找 (番最大, 符最大) 的最优形
+        best_form = None
+        best_han = -1
+        best_fu = -1
+        best_yaku_list: Sequence[Tuple[str, int]] = ()  # 共享空 tuple, 命中役时整体替换
+
+        for form in win_forms:
+            yaku_list = self._find_yaku(form, context)
+            han = sum(h for _, h in yaku_list)
+            fu = self._calculate_fu(form, context, player.melds)
+
+            if han > best_han or (han == best_han and fu > best_fu):
+                best_han = han
+                best_fu = fu
+                best_yaku_list = yaku_list
+                best_form = form
+
+        details.yaku_list = best_yaku_list
+        mask = 0
+        for name, _ in best_yaku_list:
+            mask |= YAKU_BIT.get(name, 0)
+        details.yaku_mask = mask
+        details.han = best_han
+        details.fu = best_fu
+        details.win_form = best_form
+
+        # 6. 检查一番缚 (Ippan Shibari)
+        if details.han == 0:
+            details.is_valid_win = False  # 无役!
+            return details
 
-            # 7. 计算宝牌 (Dora)
-            details.dora_count = self._calculate_dora(
-                final_hand, player.melds, game_state, context
-            )
-            details.total_han = details.han + details.dora_count
+        # 7. 计算宝牌 (Dora)
+        details.dora_count = self._calculate_dora(
+            final_hand, player.melds, game_state, context
+        )
+        details.total_han = details.han + details.dora_count
 
-            # 8. 计算最终点数 (Score)
-            details.score_points = self._calculate_points(
-                details.total_han, details.fu, context
-            )
+        # 8. 计算最终点数 (Score)
+        details.score_points = self._calculate_points(
+            details.total_han, details.fu, context
+        )
 
-        # 9. 检查振听 (Furiten)
-        if not is_tsumo and self._is_furiten(player, winning_tile, game_state):
-            details.is_valid_win = False
-            return details
+        return self._finish_validity(details, player, winning_tile, is_tsumo, game_state)
 
-        details.is_valid_win = True
+    def _finish_validity(
+        self,
+        details: "WinDetails",
+        player: "PlayerState",
+        winning_tile: "Tile",
+        is_tsumo: bool,
+        game_state: "GameState",
+    ) -> "WinDetails":
+        """9. 检查振听 (Furiten), 写入最终的 is_valid_win"""
+        # (和牌形已由 win_forms 验证, 振听判定无需再做向听剪枝)
+        details.is_valid_win = is_tsumo or not self._is_furiten(
+            player, winning_tile, game_state, shape_checked=True
+        )
         return details
 
     def is_valid_win(
@@ -232,9 +382,13 @@ class Scoring:
         """
         【ActionValidator调用的辅助函数】
         检查和牌是否合法 (有役 + 非振听)。
+        复用 _scratch_details 且不算宝牌/点数 (候选动作生成时每张可和的牌都会走这里)。
         """
-        details = self.calculate_win_details(player, winning_tile, is_tsumo, game_state)
-        return details.is_valid_win
+        details = self._scratch_details
+        details.reset()
+        return self._evaluate_win(
+            details, player, winning_tile, is_tsumo, game_state, full=False
+        ).is_valid_win
 
     def get_final_score_and_payout(
         self,
@@ -300,9 +454,12 @@ class Scoring:
 
         return payout
 
-    def calculate_ryuukyoku_penalty_tenpai(self, game_state: "GameState") -> Dict[int, int]:
+    def calculate_ryuukyoku_penalty_tenpai(
+        self, game_state: "GameState", tenpai_indices: Optional[Iterable[int]] = None
+    ) -> Dict[int, int]:
         """
         荒牌流局罚符（3000点）分配 + 流局满贯判定。
+        tenpai_indices: 调用方已算好的听牌玩家索引 (避免重复听牌判定); None 时在此计算。
         - 流局满贯 (近似): 某玩家弃牌河全是幺九字牌 -> 该玩家获满贯点数(8000),
           由其它玩家分摊。注: 准确规则要求弃牌河中牌均未被鸣, 当前无被鸣追踪,
           此处近似为"全幺九字即流局满贯", 保守偏宽。
@@ -327,8 +484,18 @@ class Scoring:
                 payout[winner.player_index] += sum(share for _ in others)
             return payout
 
-        tenpai_players = [p for p in game_state.players if self.hand_analyzer.is_tenpai(p.hand, p.melds)]
-        noten_players = [p for p in game_state.players if p not in tenpai_players]
+        # 按索引集合单趟划分听牌/未听牌 (不再对 PlayerState 列表做线性 `in` 比较)
+        if tenpai_indices is None:
+            tenpai_set = {
+                p.player_index for p in game_state.players
+                if self.hand_analyzer.is_tenpai(p.hand, p.melds)
+            }
+        else:
+            tenpai_set = set(tenpai_indices)
+        tenpai_players = []
+        noten_players = []
+        for p in game_state.players:
+            (tenpai_players if p.player_index in tenpai_set else noten_players).append(p)
 
         if not tenpai_players or not noten_players:
             return payout
@@ -360,11 +527,10 @@ class Scoring:
         补全状况役所需的全部字段 (见 YAKU_AND_SCORING_DESIGN §2)。
         """
         # 确定场风/自风
-        wind_map = {0: WIND_EAST, 1: WIND_SOUTH, 2: WIND_WEST, 3: WIND_NORTH}
-        round_wind_tile = wind_map.get(game_state.round_wind, WIND_EAST)
-        # 自风 = (玩家位置 - 庄家位置) % 4 -> 0东 1南 2西 3北
-        seat_offset = (player.player_index - game_state.dealer_index) % 4
-        player_wind_tile = wind_map.get(seat_offset, WIND_EAST)
+        round_wind = game_state.round_wind
+        round_wind_tile = _WIND_TILES[round_wind] if 0 <= round_wind < 4 else WIND_EAST
+        # 自风 = (玩家位置 - 庄家位置) % 4 -> 0东 1南 2西 3北 (& 3 与非负取模等价, 负数同样落在 0..3)
+        player_wind_tile = _WIND_TILES[(player.player_index - game_state.dealer_index) & 3]
 
         # —— 状况判定 ——
         is_first_turn = game_state.turn_number <= 1
@@ -513,7 +679,7 @@ class Scoring:
             yaku.append("Ryuuiisou")
 
         # —— 清老头 (全幺九数牌的刻子, 即 1m9m1p9p1s9s 的刻/杠) ——
-        terminal_num = {MAN_1, MAN_9, PIN_1, PIN_9, SOU_1, SOU_9}
+        terminal_num = TERMINAL_VALUES
         if (
             form.hand_type == "standard"
             and all(c.type in ("koutsu", "kantsu") for c in melds_comps)
@@ -758,7 +924,8 @@ class Scoring:
         shuntsu_keys = []
         for c in form.components:
             if c.type == "shuntsu":
-                shuntsu_keys.append(tuple(sorted(t.value for t in c.tiles)))
+                # HandComponent 保证顺子 tiles 按 value 有序, 无需再排序
+                shuntsu_keys.append(tuple(t.value for t in c.tiles))
         counts: Counter = Counter(shuntsu_keys)
         return any(v >= 2 for v in counts.values())
 
@@ -784,8 +951,7 @@ class Scoring:
         suit_shuntsu = defaultdict(set)
         for c in form.components:
             if c.type == "shuntsu":
-                cvals = sorted(t.value for t in c.tiles)
-                lo = cvals[0]
+                lo = c.tiles[0].value  # 顺子 tiles 已按 value 有序, 首张即最小
                 num = lo % 9  # 顺子的起始数 (0-6)
                 if lo <= 8:
                     suit_shuntsu[0].add(num)
@@ -805,8 +971,7 @@ class Scoring:
         suit_sequences = defaultdict(set)
         for c in form.components:
             if c.type == "shuntsu":
-                cvals = sorted(t.value for t in c.tiles)
-                lo = cvals[0]
+                lo = c.tiles[0].value  # 顺子 tiles 已按 value 有序, 首张即最小
                 start_num = lo % 9
                 if start_num in (0, 3, 6):  # 123/456/789 的起始
                     suit = (lo // 9) * 9
@@ -826,7 +991,7 @@ class Scoring:
             cvals = [t.value for t in c.tiles]
             if c.type == "pair":
                 if pure:
-                    if cvals[0] not in {MAN_1, MAN_9, PIN_1, PIN_9, SOU_1, SOU_9}:
+                    if cvals[0] not in TERMINAL_VALUES:
                         return False
                 else:
                     if cvals[0] not in TERMINAL_HONOR_VALUES:
@@ -834,8 +999,7 @@ class Scoring:
             else:
                 # 面子: 至少含一张幺九 (pure 时仅数牌幺九)
                 if pure:
-                    target = {MAN_1, MAN_9, PIN_1, PIN_9, SOU_1, SOU_9}
-                    if not any(v in target for v in cvals):
+                    if not any(v in TERMINAL_VALUES for v in cvals):
                         return False
                 else:
                     if not any(v in TERMINAL_HONOR_VALUES for v in cvals):
@@ -943,7 +1107,7 @@ class Scoring:
         # 顺子听: 找含 winning_tile 的顺子
         for c in melds_comps:
             if c.type == "shuntsu":
-                cvals = sorted(t.value for t in c.tiles)
+                cvals = [t.value for t in c.tiles]  # 顺子 tiles 已按 value 有序
                 if wt_val in cvals:
                     lo, hi = cvals[0], cvals[2]
                     if wt_val == lo + 1:  # 中间 -> 嵌张
@@ -966,13 +1130,20 @@ class Scoring:
     # ======================================================================
 
     def _is_furiten(
-        self, player: "PlayerState", winning_tile: "Tile", game_state: "GameState"
+        self,
+        player: "PlayerState",
+        winning_tile: "Tile",
+        game_state: "GameState",
+        shape_checked: bool = False,
     ) -> bool:
         """
         检查振听 (仅荣和时调用)。三种振听:
         1. 舍牌振听 (永久): 听的牌任一在自己弃牌河中。
         2. 同巡振听: 本巡曾对可荣和的牌 PASS (player.temporary_furiten)。
         3. 立直振听: 立直后曾对可荣和的牌 PASS (player.riichi_furiten, 永久)。
+
+        shape_checked=True: 调用方已确认 手牌+winning_tile 构成和牌形, 即 winning_tile
+        本身就是听的牌, 不必重复做向听/和牌形判定。
         """
         # 同巡振听 / 立直振听 (由 ActionValidator 在 PASS 时设置标记)
         if getattr(player, "temporary_furiten", False):
@@ -980,17 +1151,22 @@ class Scoring:
         if getattr(player, "riichi_furiten", False):
             return True
 
-        # 舍牌振听: 听的牌任一在弃牌河
+        # 舍牌振听: 听的牌任一在弃牌河 (只对弃牌河中的 value 判和牌形)
+        mask = getattr(player, "discards_mask", None)
+        if mask is None:
+            mask = 0
+            for t in player.discards:
+                mask |= 1 << t.value
+        if not mask:
+            return False
+        # 荣和牌本身在弃牌河: 位与即可判定, 无需展开
+        if shape_checked and mask >> winning_tile.value & 1:
+            return True
+        # 听牌位掩码按手牌缓存, 与弃牌河位掩码求交即可
         try:
-            waits = self.hand_analyzer.find_wait_tiles(player.hand, player.melds)
+            return bool(self.hand_analyzer.wait_mask(player.hand, player.melds) & mask)
         except Exception:
             return False
-        if not waits:
-            return False
-        discard_values = {t.value for t in player.discards}
-        if waits & discard_values:
-            return True
-        return False
 
     def _calculate_dora(
         self,
@@ -1000,54 +1176,32 @@ class Scoring:
         context: Dict,
     ) -> int:
         """计算宝牌 (Dora)"""
-        count = 0
         # 这里的 hand 已经是包含 winning_tile 的完整手牌
         # 加上副露中的牌
         all_tiles = hand + [tile for meld in melds for tile in meld.tiles]
 
         # 1. 赤宝牌
-        count += sum(1 for tile in all_tiles if tile.is_red)
+        count = sum(1 for tile in all_tiles if tile.is_red)
 
-        dora_indicators = context.get("dora_indicators", [])
-        dora_values = self._get_dora_values_from_indicators(dora_indicators)
+        # 34 维牌计数向量, 表/里宝牌都对它做一次 gather 求和
+        hand34 = np.bincount([tile.value for tile in all_tiles], minlength=34)
 
         # 2. 表宝牌
-        count += sum(1 for tile in all_tiles if tile.value in dora_values)
+        dora_indicators = context.get("dora_indicators", [])
+        count += count_dora(hand34, self._get_dora_values_from_indicators(dora_indicators))
 
         # 3. 里宝牌
         if context.get("is_riichi", False):
             ura_dora_indicators = context.get("ura_dora_indicators", [])
-            ura_dora_values = self._get_dora_values_from_indicators(ura_dora_indicators)
-            count += sum(1 for tile in all_tiles if tile.value in ura_dora_values)
+            count += count_dora(
+                hand34, self._get_dora_values_from_indicators(ura_dora_indicators)
+            )
 
         return count
 
     def _get_dora_values_from_indicators(self, indicators: List[Tile]) -> Set[int]:
-        """(Helper) 根据指示牌计算宝牌的值"""
-        dora_values = set()
-        for ind in indicators:
-            val = ind.value
-            if MAN_1 <= val <= MAN_9 - 1:
-                dora_values.add(val + 1)
-            elif val == MAN_9:
-                dora_values.add(MAN_1)
-            elif PIN_1 <= val <= PIN_9 - 1:
-                dora_values.add(val + 1)
-            elif val == PIN_9:
-                dora_values.add(PIN_1)
-            elif SOU_1 <= val <= SOU_9 - 1:
-                dora_values.add(val + 1)
-            elif val == SOU_9:
-                dora_values.add(SOU_1)
-            elif WIND_EAST <= val <= WIND_WEST:
-                dora_values.add(val + 1)
-            elif val == WIND_NORTH:
-                dora_values.add(WIND_EAST)
-            elif DRAGON_WHITE <= val <= DRAGON_GREEN:
-                dora_values.add(val + 1)
-            elif val == DRAGON_RED:
-                dora_values.add(DRAGON_WHITE)
-        return dora_values
+        """(Helper) 根据指示牌计算宝牌的值 (NEXT_DORA_VALUE 查表)"""
+        return {NEXT_DORA_VALUE[ind.value] for ind in indicators}
 
     # ======================================================================
     # == 点数计算 (Points Engine) ==
@@ -1060,9 +1214,16 @@ class Scoring:
         return math.ceil(points / 100) * 100
 
     def _calculate_points(self, total_han: int, fu: int, context: Dict) -> int:
-        """计算基础点数"""
-        is_dealer = context.get("is_dealer", False)
-
+        """计算基础点数 (按 (总番, 符, 是否庄家) 记忆化)"""
+        is_dealer = bool(context.get("is_dealer", False))
+        key = (total_han, fu, is_dealer)
+        points = self._points_cache.get(key)
+        if points is None:
+            points = self._points_cache[key] = self._compute_points(total_han, fu, is_dealer)
+        return points
+
+    def _compute_points(self, total_han: int, fu: int, is_dealer: bool) -> int:
+        """(Helper) 纯整数的点数计算, 结果由 _calculate_points 缓存"""
         if total_han >= 13:
             return self.yakuman_multiplier
         if total_han >= 5:
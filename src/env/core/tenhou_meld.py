@@ -23,7 +23,7 @@ from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)  # 牌谱解析时每个副露一个实例, slots 省去实例 __dict__
 class TenhouMeld:
     """解码后的鸣牌。所有 tile 字段存【Hai 布局 id】(0-135), 由调用方 >>2 转牌型。"""
     kind: str                        # 'chi'|'pon'|'kakan'|'ankan'|'daiminkan'
@@ -4,13 +4,17 @@ import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
 
-from src.env.core.game_state import GameState
+from src.env.core.game_state import GameState, GamePhase
 from src.env.core.GameController import GameController
 
 # from src.env.core.actions import Action
 from src.env.state_encoder import StateEncoder
 from src.env.renderer import Renderer
 
+# 每步都要比较的阶段成员, 提升为模块常量
+_WAITING_FOR_RESPONSE = GamePhase.WAITING_FOR_RESPONSE
+_GAME_OVER = GamePhase.GAME_OVER
+
 
 class MahjongEnv(gym.Env):
     """基于扁平化候选动作空间的麻将环境"""
@@ -56,12 +60,11 @@ class MahjongEnv(gym.Env):
 
     def reset(self, seed=None, options=None):
         """重置环境并返回初始观察。
-        seed 用于复现: 注入独立 random.Random 到 Wall, 保证洗牌可复现 (GAME_FLOW §10.6)。
+        seed 用于复现: 注入独立 numpy Generator 到 Wall, 保证洗牌可复现 (GAME_FLOW §10.6)。
         """
-        import random as _random
         if seed is not None:
             # 注入带 seed 的 rng 到 Wall, 使整局洗牌/发牌可复现
-            self.controller.wall.rng = _random.Random(seed)
+            self.controller.wall.rng = np.random.default_rng(seed)
             super().reset(seed=seed)  # gymnasium 规范: 同步内部 np_random
 
         self.controller.reset()  # Controller 执行发牌等流程
@@ -107,8 +110,7 @@ class MahjongEnv(gym.Env):
             reward = -abs(self.step_penalty)
 
         # 终止判定: _game_over_flag 或 game_phase==GAME_OVER 任一为真 (防御不一致)
-        from src.env.core.game_state import GamePhase
-        terminated = state._game_over_flag or (state.game_phase == GamePhase.GAME_OVER)
+        terminated = state._game_over_flag or (state.game_phase is _GAME_OVER)
         truncated = False
 
         # 6. 获取新状态 (会更新 self._acting_player_idx)
@@ -139,11 +141,9 @@ class MahjongEnv(gym.Env):
           (由 _next_responder 计算, 仅写入 self._acting_player_idx 和 info,
           绝不写 GameState.current_player_index, 避免干扰 Controller 状态机)。
         """
-        from src.env.core.game_state import GamePhase
-
         state = self.controller.gamestate
 
-        if state.game_phase == GamePhase.WAITING_FOR_RESPONSE:
+        if state.game_phase is _WAITING_FOR_RESPONSE:
             current_player_idx = self._next_responder(state)
             if current_player_idx is None:
                 # 所有响应者都已表态 (Controller 理论上已收齐推进; 兜底用打牌者)
@@ -162,32 +162,26 @@ class MahjongEnv(gym.Env):
             )
         )
 
-        # 生成动作掩码
-        self.action_mask = np.zeros(self.max_candidates, dtype=np.int8)
+        # 生成动作掩码 (原地复用同一缓冲区, 每步不再分配新数组;
+        # 调用方需在下一次 step() 前消费, 如需保留请自行 copy)
+        mask = self.action_mask
+        mask.fill(0)
         valid_count = min(len(self.current_candidates), self.max_candidates)
-        self.action_mask[:valid_count] = 1
+        mask[:valid_count] = 1
 
         return {
             "action_mask": self.action_mask,
             "valid_actions": self.current_candidates,
             "current_player": current_player_idx,
-            "current_phase": state.game_phase.name,
+            # _name_ 是 Enum 存名字的普通属性; .name 每次走描述符, 每步调用时明显更慢
+            "current_phase": state.game_phase._name_,
         }
 
     def _next_responder(self, state) -> Optional[int]:
-        """在 WAITING_FOR_RESPONSE 阶段，找出第一个尚未响应（不在
-        controller.pending_responses 中）且非打牌者的玩家索引。
+        """在 WAITING_FOR_RESPONSE 阶段，找出第一个尚未响应且非打牌者的玩家索引
+        (委托 Controller, 响应状态只在 Controller 一处维护)。
         返回 None 表示所有响应者都已表态。"""
-        discarder = state.last_discard_player_index
-        pending = self.controller.pending_responses
-        for offset in range(1, state.num_players):
-            cand_idx = (discarder + offset) % state.num_players
-            if cand_idx == discarder:
-                continue
-            if cand_idx in pending:
-                continue  # 该玩家已响应
-            return cand_idx
-        return None
+        return self.controller.next_responder()
 
     def _player_shanten(self, player_idx: int) -> int:
         """计算玩家当前向听数 (含 drawn_tile)。健壮处理边界。"""
@@ -1,4 +1,10 @@
+import operator
+
 from src.env.core.actions import Action, ActionType, Tile, KanType
+from src.env.core.game_state import round_name
+
+# 按 value 排序的取键函数 (C 层比较整数, 不逐对调用 Tile.__lt__)
+_tile_value = operator.attrgetter("value")
 
 
 class Renderer:
@@ -126,9 +132,8 @@ class Renderer:
 
     def _render_text(self, game_state):
         print("\n" + "=" * 50)
-        wind_str = ["东", "南", "西", "北"][game_state.round_wind % 4]
         print(
-            f"场风: {wind_str}{game_state.round_number}局   本场数: {game_state.honba}   立直棒: {game_state.riichi_sticks}"
+            f"场风: {round_name(game_state.round_wind, game_state.round_number)}局   本场数: {game_state.honba}   立直棒: {game_state.riichi_sticks}"
         )
         print(f"剩余牌数: {game_state.wall.get_remaining_live_tiles_count()}")
 
@@ -171,8 +176,8 @@ class Renderer:
             if player.hand:
                 hand_parts = []
                 # 排序手牌并添加dora标记
-                # 遍历 sorted(player.hand) 确保按规则排序
-                for tile in sorted(player.hand):
+                # 按 value 排序 (与 Tile.__lt__ 同序, 稳定排序下同 value 保持手牌顺序)
+                for tile in sorted(player.hand, key=_tile_value):
                     tile_str = self._get_tile_string(
                         tile
                     )  # 获取基础字符串 (含 'r' 如果是红宝牌)
@@ -1,7 +1,21 @@
 import numpy as np
 from gymnasium import spaces
 from typing import List
-from src.env.core.actions import Action
+from src.env.core.actions import Action, ActionType
+from src.utils.logger import get_env_logger as _get_logger
+
+_log = _get_logger(__name__)
+
+# 动作类型 -> 该动作关联牌所在的字段 (编码 last_action 时查表, 不再逐个比较类型名)
+_LAST_ACTION_TILE_FIELD = {
+    ActionType.DISCARD: "tile",
+    ActionType.PON: "tile",
+    ActionType.KAN: "tile",
+    ActionType.CHI: "tile",  # 被吃的牌 (若存在)
+    ActionType.RIICHI: "riichi_discard",
+    ActionType.TSUMO: "winning_tile",
+    ActionType.RON: "winning_tile",
+}
 
 
 class StateEncoder:
@@ -9,6 +23,9 @@ class StateEncoder:
     状态编码器类，支持候选动作特征编码
     """
 
+    # 每步 encode 读取这些配置字段, 显式 __slots__ 去掉实例 __dict__
+    __slots__ = ("config", "tile_types", "max_actions", "action_feature_dim")
+
     def __init__(self, config):
         self.config = config or {}
         self.tile_types = 34  # 基本牌型数量
@@ -69,8 +86,11 @@ class StateEncoder:
             np.stack([self._encode_tiles(p.discards) for p in game_state.players])
             .astype(np.float32) / 4.0
         )
-        state_features["dora"] = (self._encode_tiles(game_state.wall.dora_indicators)
-                                  .astype(np.float32) / 4.0)
+        # 指示牌 value 直接取牌墙的 int8 数组做计数, 不逐张遍历 Tile
+        state_features["dora"] = (
+            np.bincount(game_state.wall.get_dora_indicator_ids(), minlength=self.tile_types)
+            .astype(np.float32) / 4.0
+        )
 
         # --- 副露完整编码 (已是 0/1, 原样转 float32) ---
         state_features["melds_full"] = self._encode_all_melds(game_state, player_index).astype(np.float32)
@@ -124,10 +144,12 @@ class StateEncoder:
         state_features["last_action"] = last_act
 
         # scores: 居中归一化 (s - 初始) / 初始 → 约 -0.9~1.3
-        state_features["scores"] = np.array(
-            [(p.score - initial_score) / initial_score for p in game_state.players],
-            dtype=np.float32,
-        )
+        # 直接把整型分数流入 float32 数组, 再原地做一次向量化归一化 (不为每家构造中间 float)
+        players = game_state.players
+        scores = np.fromiter((p.score for p in players), dtype=np.float32, count=len(players))
+        scores -= initial_score
+        scores /= initial_score
+        state_features["scores"] = scores
 
         return state_features
 
@@ -139,13 +161,15 @@ class StateEncoder:
         """
         encoded = np.zeros((4, 4, 38), dtype=np.uint8)
         for i, p in enumerate(game_state.players):
+            # 优先读 PlayerState 维护的种类编码列表, 无此索引的玩家对象 (测试桩) 现场计算
+            kinds = getattr(p, "meld_kinds", None)
             for j, meld in enumerate(p.melds[:4]):   # 最多4组
                 slot = encoded[i, j]
                 # tiles one-hot (34): 该组副露包含哪些牌型
                 for tile in meld.tiles:
                     slot[tile.value] = 1
                 # type one-hot (4)
-                type_idx = self._meld_type_index(meld, i)
+                type_idx = kinds[j] if kinds is not None else self._meld_type_index(meld, i)
                 slot[34 + type_idx] = 1
         return encoded
 
@@ -181,7 +205,8 @@ class StateEncoder:
                 )
                 encoded[i, :] = action_vec
             except ValueError as e:
-                print(f"警告: 编码动作 {action} 时发生错误: {e}")
+                # 走 env logger 且延迟格式化: 静默训练时不构造消息, 也不写 stdout
+                _log.warning("警告: 编码动作 %s 时发生错误: %s", action, e)
                 # 可以选择跳过此动作或将其编码为零向量
 
         return encoded
@@ -219,16 +244,9 @@ class StateEncoder:
 
         action_obj = info.get("action_obj")
         if action_obj is not None:
-            # 从 Action 对象中提取关联的 tile (不同动作类型字段不同)
-            tile = None
-            if action_obj.type.name in ("DISCARD", "PON", "KAN"):
-                tile = action_obj.tile
-            elif action_obj.type.name == "RIICHI":
-                tile = action_obj.riichi_discard
-            elif action_obj.type.name in ("TSUMO", "RON"):
-                tile = action_obj.winning_tile
-            elif action_obj.type.name == "CHI":
-                tile = action_obj.tile  # 被吃的牌 (若存在)
+            # 从 Action 对象中提取关联的 tile (不同动作类型字段不同, 查表取字段名)
+            field = _LAST_ACTION_TILE_FIELD.get(action_obj.type)
+            tile = getattr(action_obj, field) if field is not None else None
 
             if tile is not None and hasattr(tile, "value"):
                 encoded[tile.value] = 1
@@ -7,6 +7,7 @@
 
 from __future__ import annotations
 import logging
+import logging.handlers
 import sys
 from typing import Optional
 
@@ -24,6 +25,15 @@ def get_logger(name: Optional[str] = None) -> logging.Logger:
     return logger
 
 
+def get_env_logger(module: str) -> logging.Logger:
+    """env 内部模块的 logger, 挂在 mjagent 之下, 受 quiet()/verbose() 统一控制。
+
+    按 __name__ 直接取的 logger ("src.env.core...") 不在 mjagent 层级内,
+    verbose() 打不开它们的 DEBUG, 只能靠根 logger 的 WARNING 碰巧静默。
+    """
+    return get_logger(f"{_LOGGER_NAME}.env.{module.rsplit('.', 1)[-1]}")
+
+
 def _configure_default():
     """默认配置: INFO 级别。
     - 训练进度 (Trainer log.info) 可见。
@@ -51,3 +61,24 @@ def quiet():
 def verbose():
     """详细: DEBUG 级别 (含 env 内部 print, 调试规则时用)。"""
     set_level("DEBUG")
+
+
+def buffered(capacity: int = 8192):
+    """批量输出: mjagent 的输出 handler 外包一层 MemoryHandler。
+
+    攒满 capacity 条或遇到 WARNING 以上时才整批写出, verbose() 调试长对局时
+    不再每条日志都同步写 stdout。重复调用不会重复包裹。
+    """
+    logger = get_logger()
+    for i, h in enumerate(logger.handlers):
+        if isinstance(h, logging.handlers.MemoryHandler):
+            continue
+        logger.handlers[i] = logging.handlers.MemoryHandler(
+            capacity, flushLevel=logging.WARNING, target=h
+        )
+
+
+def flush():
+    """立即写出 buffered() 积攒的日志 (回合结束 / 程序退出前调用)。"""
+    for h in get_logger().handlers:
+        h.flush()
@@ -110,6 +110,16 @@ class TestApplyActionKan:
         # hand应减1(移走1张27)
         assert len(p.hand) == 10  # 原11-1=10
 
+    def test_added_kan_takes_first_hand_instance(self):
+        """加杠用手牌: 取手牌顺序中该 value 的第一张实例 (赤五优先), 计数同步"""
+        pon = Meld(type=ActionType.PON, tiles=tuple(H([4,4,4])), from_player=1, called_tile=T(4))
+        red = T(4, red=True)
+        gs = self._make_gs(H([0,1,2]) + [red] + H([9,10,11]), drawn=T(28), melds=[pon])
+        p = gs.players[0]
+        gs.apply_action(0, Action(type=ActionType.KAN, kan_type=KanType.ADDED, tile=T(4)))
+        assert p.melds[0].tiles[-1] is red
+        assert p.hand_counts[4] == 0 and not p.red_fives and len(p.hand) == 6
+
     def test_added_kan_no_pon_raises(self):
         """加杠但无对应PON应报错"""
         gs = self._make_gs(H([0,1,2,9,10,11,18,19,20, 27, 5, 6, 7]), drawn=T(28))
@@ -199,6 +209,23 @@ class TestSeedReproducibility:
         assert not np.array_equal(obs1["state"]["hand"], obs2["state"]["hand"]), \
             "不同seed应产生不同手牌"
 
+    def test_bulk_deal_matches_draw_order(self):
+        """一次切出后按座位取牌, 与逐张摸牌 (4-4-4-1 轮流) 的配牌一致"""
+        from src.env.core.GameController import GameController
+        from src.env.core.game_state import Wall
+        ctrl = GameController({"num_players": 4, "seed": 5})
+        ctrl.reset()
+        ref = Wall({"seed": 5})
+        ref.shuffle_and_setup()
+        hands = [[] for _ in range(4)]
+        for r in range(3):
+            for pid in range(4):
+                hands[pid] += [ref.draw_tile() for _ in range(4)]
+        for pid in range(4):
+            hands[pid].append(ref.draw_tile())
+        for pid, p in enumerate(ctrl.gamestate.players):
+            assert sorted(t.value for t in p.hand) == sorted(t.value for t in hands[pid])
+
 
 class TestResponsePriority:
     """响应优先级 + 头跳测试。"""
@@ -264,6 +291,22 @@ class TestResponsePriority:
         action, idx = av.resolve_response_priorities(decls, discarder_index=0, num_players=4)
         assert idx == 1, "头跳: 玩家1(打牌者上家)应优先于玩家3"
 
+    def test_chi_only_from_next_player(self):
+        """非下家的 CHI 声明被忽略; 同级 PON/KAN 按座位顺序取第一个"""
+        from src.env.core.rules.action_validator import ActionValidator
+        from src.env.core.rules.hand_analyzer import HandAnalyzer
+        from src.env.core.rules.scoring import Scoring
+        ha = HandAnalyzer()
+        sc = Scoring(ha, {})
+        av = ActionValidator(ha, sc, {})
+        decls = {0: Action(type=ActionType.CHI, chi_tiles=(T(0), T(1)), tile=T(2)),
+                 1: Action(type=ActionType.PASS)}
+        action, idx = av.resolve_response_priorities(decls, discarder_index=2, num_players=4)
+        assert action is None and idx is None
+        decls = {0: Action(type=ActionType.KAN, tile=T(2), kan_type=KanType.OPEN), 3: Action(type=ActionType.PON, tile=T(2))}
+        action, idx = av.resolve_response_priorities(decls, discarder_index=2, num_players=4)
+        assert idx == 3
+
 
 class TestDoraReveal:
     """杠后翻新宝牌(reveal_new_dora)测试。"""
@@ -302,6 +345,160 @@ class TestDoraReveal:
 class TestFlowIntegration:
     """端到端流程测试: 开局→打牌→响应→摸牌循环。"""
 
+    def _controller_after_deal(self, opponent_hand, num_players=4):
+        from src.env.core.GameController import GameController
+        from src.utils.logger import quiet
+        quiet()
+        ctrl = GameController({"num_players": num_players})
+        ctrl.reset()
+        gs = ctrl.gamestate
+        dealer = gs.dealer_index
+        for i, p in enumerate(gs.players):
+            if i != dealer:
+                p.hand = H(opponent_hand)
+        gs.players[dealer].drawn_tile = T(31)
+        return ctrl, gs, dealer
+
+    def test_unclaimable_discard_skips_response_phase(self):
+        """无人可荣和/鸣牌的弃牌: 不进入响应阶段, 直接由下家摸牌"""
+        ctrl, gs, dealer = self._controller_after_deal(
+            [0, 2, 4, 6, 8, 10, 12, 14, 16, 19, 21, 23, 25])
+        ctrl.step(dealer, Action(type=ActionType.DISCARD, tile=T(31)))
+        assert gs.game_phase == GamePhase.PLAYER_DISCARD
+        assert gs.current_player_index == (dealer + 1) % 4
+        assert gs.players[(dealer + 1) % 4].drawn_tile is not None
+        assert not ctrl.pending_responses
+
+    def test_draw_clears_temporary_furiten(self):
+        """下家摸牌时解除其同巡振听, 立直振听保持"""
+        ctrl, gs, dealer = self._controller_after_deal(
+            [0, 2, 4, 6, 8, 10, 12, 14, 16, 19, 21, 23, 25])
+        nxt = gs.players[(dealer + 1) % 4]
+        nxt.temporary_furiten = True
+        nxt.riichi_furiten = True
+        ctrl.step(dealer, Action(type=ActionType.DISCARD, tile=T(31)))
+        assert nxt.drawn_tile is not None
+        assert not nxt.temporary_furiten and nxt.riichi_furiten
+
+    def test_claimable_discard_enters_response_phase(self):
+        """有人可碰时仍进入响应阶段"""
+        ctrl, gs, dealer = self._controller_after_deal(
+            [0, 2, 4, 6, 8, 10, 12, 14, 16, 19, 21, 31, 31])
+        ctrl.step(dealer, Action(type=ActionType.DISCARD, tile=T(31)))
+        assert gs.game_phase == GamePhase.WAITING_FOR_RESPONSE
+
+    def test_any_response_checks_calls_before_ron(self):
+        """任一对手可碰时直接判定可响应, 不为任何人做荣和判定"""
+        ctrl, gs, dealer = self._controller_after_deal(
+            [0, 2, 4, 6, 8, 10, 12, 14, 16, 19, 21, 23, 25])
+        gs.players[(dealer + 3) % 4].hand = H([0, 2, 4, 6, 8, 10, 12, 14, 16, 19, 21, 31, 31])
+        gs.players[dealer].add_discard(T(31))
+        gs.last_discarded_tile = T(31)
+        gs.last_discard_player_index = dealer
+        validator = ctrl.rules_engine.action_validator
+
+        def _no_ron(*args):
+            raise AssertionError("不应判荣和")
+
+        validator._can_ron = _no_ron
+        assert ctrl.rules_engine.any_response_possible(gs)
+
+    def test_next_responder_follows_seat_order(self):
+        """响应阶段按下家→对家→上家顺序询问, 已表态者被跳过"""
+        ctrl, gs, dealer = self._controller_after_deal(
+            [0, 2, 4, 6, 8, 10, 12, 14, 16, 19, 21, 31, 31])
+        ctrl.step(dealer, Action(type=ActionType.DISCARD, tile=T(31)))
+        assert ctrl.next_responder() == (dealer + 1) % 4
+        ctrl.step((dealer + 1) % 4, Action(type=ActionType.PASS))
+        assert ctrl.next_responder() == (dealer + 2) % 4
+
+    def test_next_responder_cursor_handles_out_of_order(self):
+        """游标只越过已表态的座位: 乱序表态时仍返回第一个未响应者, 新弃牌时游标归零"""
+        ctrl, gs, dealer = self._controller_after_deal(
+            [0, 2, 4, 6, 8, 10, 12, 14, 16, 19, 21, 31, 31])
+        ctrl.step(dealer, Action(type=ActionType.DISCARD, tile=T(31)))
+        ctrl.step((dealer + 2) % 4, Action(type=ActionType.PASS))
+        assert ctrl.next_responder() == (dealer + 1) % 4
+        ctrl.step((dealer + 1) % 4, Action(type=ActionType.PASS))
+        assert ctrl.next_responder() == (dealer + 3) % 4
+        ctrl._clear_responses()
+        assert ctrl._responder_cursor == 0
+        assert ctrl.next_responder() == (dealer + 1) % 4
+
+    def test_response_bookkeeping_predeclared(self):
+        """响应簿记在构造时建好并跨弃牌原地复用; Controller 无实例 __dict__"""
+        ctrl, gs, dealer = self._controller_after_deal(
+            [0, 2, 4, 6, 8, 10, 12, 14, 16, 19, 21, 31, 31])
+        assert not hasattr(ctrl, "__dict__")
+        pending, priority = ctrl.pending_responses, ctrl._response_priority
+        ctrl.step(dealer, Action(type=ActionType.DISCARD, tile=T(31)))
+        ctrl.step((dealer + 1) % 4, Action(type=ActionType.PASS))
+        assert ctrl.pending_responses is pending and ctrl._response_priority is priority
+
+    def test_three_player_round_waits_for_two_responders(self):
+        """3 人局每张弃牌只需收齐 2 份响应"""
+        ctrl, gs, dealer = self._controller_after_deal(
+            [0, 2, 4, 6, 8, 10, 12, 14, 16, 19, 21, 31, 31], num_players=3)
+        ctrl.step(dealer, Action(type=ActionType.DISCARD, tile=T(31)))
+        assert gs.game_phase == GamePhase.WAITING_FOR_RESPONSE
+        ctrl.step((dealer + 1) % 3, Action(type=ActionType.PASS))
+        assert gs.game_phase == GamePhase.WAITING_FOR_RESPONSE
+        ctrl.step((dealer + 2) % 3, Action(type=ActionType.PASS))
+        assert gs.game_phase == GamePhase.PLAYER_DISCARD
+        assert gs.current_player_index == (dealer + 1) % 3
+
+    def test_all_pass_advances_and_resets_priorities(self):
+        """全员 PASS 后流转到下家摸牌, 响应优先级码在下一张弃牌前清零"""
+        ctrl, gs, dealer = self._controller_after_deal(
+            [0, 2, 4, 6, 8, 10, 12, 14, 16, 19, 21, 31, 31])
+        ctrl.step(dealer, Action(type=ActionType.DISCARD, tile=T(31)))
+        for i in range(1, 4):
+            ctrl.step((dealer + i) % 4, Action(type=ActionType.PASS))
+        assert gs.game_phase == GamePhase.PLAYER_DISCARD
+        assert gs.current_player_index == (dealer + 1) % 4
+        nxt = gs.players[(dealer + 1) % 4]
+        ctrl.step((dealer + 1) % 4, Action(type=ActionType.DISCARD, tile=nxt.drawn_tile))
+        assert ctrl._response_priority == [0, 0, 0, 0]
+
+    def test_response_candidates_cached_per_discard(self):
+        """同一张弃牌的候选动作只生成一次; 新的弃牌使缓存失效"""
+        ctrl, gs, dealer = self._controller_after_deal(
+            [0, 2, 4, 6, 8, 10, 12, 14, 16, 19, 21, 31, 31])
+        ctrl.step(dealer, Action(type=ActionType.DISCARD, tile=T(31)))
+        nxt = (dealer + 1) % 4
+        first = ctrl.rules_engine.generate_candidate_actions(gs, nxt)
+        assert ActionType.PON in {a.type for a in first}
+        assert ctrl.rules_engine.generate_candidate_actions(gs, nxt) is first
+        gs.apply_action(dealer, Action(type=ActionType.DISCARD, tile=gs.players[dealer].hand[0]))
+        assert ctrl.rules_engine.generate_candidate_actions(gs, nxt) is not first
+
+    def test_response_round_generates_candidates_once_per_responder(self):
+        """一轮响应 (提示候选 + PASS 振听判定) 每个响应者只生成一次候选动作"""
+        ctrl, gs, dealer = self._controller_after_deal(
+            [0, 2, 4, 6, 8, 10, 12, 14, 16, 19, 21, 31, 31])
+        av = ctrl.rules_engine.action_validator
+        calls = []
+        orig = av.get_legal_actions_on_response
+        av.get_legal_actions_on_response = lambda p, g: calls.append(p.player_index) or orig(p, g)
+        ctrl.step(dealer, Action(type=ActionType.DISCARD, tile=T(31)))
+        for i in range(1, 4):
+            seat = (dealer + i) % 4
+            ctrl.rules_engine.generate_candidate_actions(gs, seat)
+            ctrl.step(seat, Action(type=ActionType.PASS))
+        assert sorted(calls) == sorted((dealer + i) % 4 for i in range(1, 4))
+
+    def test_action_mask_buffer_reused(self):
+        """动作掩码缓冲区跨 step 复用, 内容随候选数刷新"""
+        from src.env.mahjong_env import MahjongEnv
+        from src.utils.logger import quiet
+        quiet()
+        env = MahjongEnv({"num_players": 4, "initial_score": 25000})
+        _, info = env.reset(seed=7)
+        buf = info["action_mask"]
+        _, _, _, _, info = env.step(0)
+        assert info["action_mask"] is buf
+        assert int(buf.sum()) == min(len(info["valid_actions"]), env.max_candidates)
+
     def test_full_hand_no_crash(self):
         """一局从reset到terminated不崩"""
         from src.env.mahjong_env import MahjongEnv
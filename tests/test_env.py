@@ -6,6 +6,8 @@ ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
+import numpy as np
+
 from src.env.mahjong_env import MahjongEnv
 
 
@@ -57,3 +59,43 @@ def test_env_multi_step_smoke():
         assert not truncated
         if terminated:
             break
+
+
+def test_scores_feature_normalized():
+    env = MahjongEnv(_config())
+    env.reset()
+    gs = env.controller.gamestate
+    gs.players[1].score = 30000
+    obs = env._get_observation()
+    scores = obs["state"]["scores"]
+    assert scores.dtype.name == "float32"
+    assert np.allclose(scores, [0.0, 0.2, 0.0, 0.0])
+
+
+def test_info_phase_name():
+    env = MahjongEnv(_config())
+    _, info = env.reset()
+    gs = env.controller.gamestate
+    assert info["current_phase"] == gs.game_phase.name == "PLAYER_DISCARD"
+    assert gs.get_info()["phase"] == "PLAYER_DISCARD"
+
+
+def test_last_action_encodes_tile_by_type():
+    from src.env.core.actions import Action, ActionType, Tile
+    env = MahjongEnv(_config())
+    env.reset()
+    gs = env.controller.gamestate
+    enc = env.state_encoder
+    gs.last_action_info = {"player": 2, "type": "RIICHI",
+                           "action_obj": Action(type=ActionType.RIICHI, riichi_discard=Tile(7))}
+    encoded = enc._encode_last_action(gs)
+    assert encoded[7] == 1 and encoded[-1] == 2 and encoded[:34].sum() == 1
+    gs.last_action_info = {"player": 1, "type": "PASS", "action_obj": Action(type=ActionType.PASS)}
+    assert enc._encode_last_action(gs)[:34].sum() == 0
+
+
+def test_env_components_are_slotted():
+    env = MahjongEnv(_config())
+    rules = env.controller.rules_engine
+    for obj in (env.state_encoder, rules, rules.hand_analyzer):
+        assert not hasattr(obj, "__dict__"), type(obj).__name__
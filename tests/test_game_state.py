@@ -0,0 +1,739 @@
+"""
+GameState / Wall / PlayerState 数据层测试。
+
+覆盖:
+- reset_new_hand 座位风分配
+- 牌组模板缓存
+- 宝牌缓存失效
+- _remove_tiles_from_hand 单张/多张移除, 失败时手牌不变
+- PlayerState.hand_counts 计数索引与 hand 同步
+- Wall 游标摸牌 / 带 seed 洗牌复现
+- PlayerState.pon_values / kan_count / meld_kinds 副露索引, GameState.total_kans
+- apply_action / determine_next_phase 动作分派表
+- PlayerState.discards_mask 弃牌位掩码
+- env logger 受全局日志级别控制
+- get_info 牌面字符串查表
+
+运行: pytest tests/test_game_state.py -v
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+import numpy as np
+from src.env.core.actions import Tile, Action, ActionType, KanType
+from src.env.core.game_state import GameState, Wall, Meld, GamePhase
+
+
+def T(v, red=False):
+    return Tile(value=v, is_red=red)
+
+def H(values):
+    return [T(v) for v in values]
+
+
+class TestSeatWind:
+    """reset_new_hand 的自风查表。"""
+
+    @pytest.mark.parametrize("dealer", [0, 1, 2, 3])
+    def test_seat_wind_follows_dealer(self, dealer):
+        gs = GameState({"num_players": 4}, Wall())
+        gs.dealer_index = dealer
+        gs.reset_new_hand()
+        winds = [p.seat_wind for p in gs.players]
+        assert winds == [(i - dealer) % 4 for i in range(4)]
+        assert gs.players[dealer].seat_wind == 0
+
+    def test_responder_order_table(self):
+        from src.env.core.game_state import responder_order
+        assert responder_order(0, 4) == (1, 2, 3)
+        assert responder_order(2, 4) == (3, 0, 1)
+        assert responder_order(2, 3) == (0, 1)
+        assert responder_order(1, 4) is responder_order(1, 4)
+
+    def test_seat_winds_table_cached(self):
+        from src.env.core.game_state import seat_winds
+        assert seat_winds(1, 4) == (3, 0, 1, 2)
+        assert seat_winds(2, 3) == (1, 2, 0)
+        assert seat_winds(3, 4) is seat_winds(3, 4)
+
+    def test_next_seat_table(self):
+        """下家表与取模一致, 3 人局同样适用"""
+        from src.env.core.game_state import next_seats
+        for n in (3, 4):
+            gs = GameState({"num_players": n}, Wall())
+            assert gs.next_seat == tuple((i + 1) % n for i in range(n))
+            assert gs.next_seat is next_seats(n)
+
+    def test_seat_wind_three_players(self):
+        gs = GameState({"num_players": 3}, Wall())
+        gs.dealer_index = 2
+        gs.reset_new_hand()
+        assert [p.seat_wind for p in gs.players] == [1, 2, 0]
+
+
+class TestTileTemplate:
+    """_generate_tiles 复用缓存模板, 但每次返回独立列表。"""
+
+    def test_red_fives_config(self):
+        red = Wall({"use_red_fives": True})._generate_tiles()
+        plain = Wall({"use_red_fives": False})._generate_tiles()
+        assert sorted(t.value for t in red if t.is_red) == [4, 13, 22]
+        assert not any(t.is_red for t in plain)
+        assert len(red) == len(plain) == 136
+
+    def test_template_reuses_interned_tiles(self):
+        tiles = Wall({"use_red_fives": True})._generate_tiles()
+        fives = [t for t in tiles if t.value == 4 and not t.is_red]
+        assert all(t is fives[0] for t in fives)
+
+    def test_slotted_tile_roundtrip(self):
+        import copy
+        import pickle
+        t = T(13, red=True)
+        assert not hasattr(t, "__dict__")
+        assert pickle.loads(pickle.dumps(t)) == t
+        assert copy.deepcopy(t) == t
+
+    def test_tile_id_equality_and_hash(self):
+        """Tile 的相等/哈希由预计算 tid 决定: 赤五与普通五不同, 与牌山 id 一致"""
+        assert T(13, red=True).tid == 35 and T(13).tid == 13
+        assert T(13, red=True) != T(13)
+        assert hash(T(4, red=True)) == T(4, red=True).tid
+        assert {T(4), T(4), T(4, red=True)} == {T(4), T(4, red=True)}
+        assert T(4) != 4
+
+    def test_tile_str_from_interned_table(self):
+        """str(Tile) 查预格式化表, 同 id 返回同一字符串对象"""
+        assert str(T(5)) is str(T(5)) and str(T(5)) == "T(5)"
+        assert str(T(13, red=True)) == "T(13r)" and repr(T(3, red=True)) == "T(3r)"
+
+    def test_shuffle_only_uses_pooled_tiles(self):
+        """洗牌后牌墙里的每张牌都是预建单例, 每局不构造新的 Tile"""
+        from src.env.core.game_state import _ID_TO_TILE
+        pooled = {id(t) for t in _ID_TO_TILE}
+        wall = Wall({"use_red_fives": True}, rng=np.random.default_rng(0))
+        wall.shuffle_and_setup()
+        assert all(id(t) in pooled for t in wall.live_tiles + wall.dead_wall_tiles)
+
+    def test_make_tile_shares_wall_instances(self):
+        """make_tile 返回与牌墙相同的共享实例; 非法 value 照常报错"""
+        from src.env.core.actions import make_tile
+        from src.env.core.game_state import _ID_TO_TILE
+        assert make_tile(7) is _ID_TO_TILE[7]
+        assert make_tile(13, True) is _ID_TO_TILE[35]
+        assert make_tile(3, True) == T(3, red=True)
+        with pytest.raises(ValueError):
+            make_tile(-1)
+
+    def test_returns_fresh_list(self):
+        wall = Wall()
+        a = wall._generate_tiles()
+        a.clear()
+        assert len(wall._generate_tiles()) == 136
+
+
+class TestGetInfo:
+    """get_info 的牌面字符串走查表, 与 str(Tile) 一致。"""
+
+    def test_info_strings_match_tile_str(self):
+        gs = GameState({"num_players": 4}, Wall())
+        gs.wall.shuffle_and_setup()
+        gs.last_discarded_tile = T(22, red=True)
+        info = gs.get_info()
+        assert info["dora_indicators"] == [str(t) for t in gs.wall.dora_indicators]
+        assert info["last_discard"] == "T(22r)"
+        assert info["round"].startswith("东")
+
+    def test_round_name_cached(self):
+        """局名按 (场风, 局数) 缓存, get_info 复用同一字符串对象"""
+        from src.env.core.game_state import round_name
+        gs = GameState({"num_players": 4}, Wall())
+        gs.wall.shuffle_and_setup()
+        gs.round_wind, gs.round_number = 1, 3
+        assert gs.get_info()["round"] == "南3"
+        assert gs.get_info()["round"] is round_name(1, 3)
+
+    def test_info_is_plain_json(self):
+        """get_info 只含 JSON 原生类型, 标准 json 无需 default 钩子即可序列化"""
+        import json
+        gs = GameState({"num_players": 4}, Wall())
+        gs.wall.shuffle_and_setup()
+        gs.last_discarded_tile = T(5)
+        info = gs.get_info()
+        assert json.loads(json.dumps(info)) == info
+
+    def test_dora_strings_follow_reveal(self):
+        """指示牌字符串随翻新宝牌 / 直接赋值更新"""
+        gs = GameState({"num_players": 4}, Wall())
+        gs.wall.shuffle_and_setup()
+        assert len(gs.get_info()["dora_indicators"]) == 1
+        gs.wall.reveal_new_dora()
+        assert gs.get_info()["dora_indicators"] == [str(t) for t in gs.wall.dora_indicators]
+        gs.wall.dora_indicators = [T(0)]
+        assert gs.get_info()["dora_indicators"] == ["T(0)"]
+
+    def test_state_ids_match_info(self):
+        """get_state_ids 与 get_info 描述同一状态, 但只给整数 id"""
+        gs = GameState({"num_players": 4}, Wall())
+        gs.wall.shuffle_and_setup()
+        ids = gs.get_state_ids()
+        assert ids["last_discard"] == -1 and ids["phase"] == gs.game_phase.value
+        assert ids["dora_indicators"].tolist() == [t.value for t in gs.wall.dora_indicators]
+        gs.last_discarded_tile = T(22, red=True)
+        info, ids = gs.get_info(), gs.get_state_ids()
+        assert ids["last_discard"] == 22 and info["last_discard"] == "T(22r)"
+        assert ids["scores"] == info["scores"]
+
+    def test_state_ids_dora_is_a_snapshot(self):
+        """get_state_ids 的宝牌数组是副本: 改写它不影响牌墙, 翻新宝牌后旧快照不变"""
+        gs = GameState({"num_players": 4}, Wall())
+        gs.wall.shuffle_and_setup()
+        first = gs.get_state_ids()["dora_indicators"]
+        expected = [t.value for t in gs.wall.dora_indicators]
+        first[0] = -1
+        assert gs.wall.get_dora_indicator_ids().tolist() == expected
+        gs.wall.reveal_new_dora()
+        assert first.tolist() == [-1]
+        assert gs.get_state_ids()["dora_indicators"].tolist() == [
+            t.value for t in gs.wall.dora_indicators
+        ]
+
+
+class TestDoraCache:
+    """get_current_dora_tiles 按版本号缓存, 指示牌变化后必须失效。"""
+
+    def test_cache_invalidated_on_reveal(self):
+        wall = Wall()
+        wall.shuffle_and_setup()
+        first = wall.get_current_dora_tiles()
+        assert wall.get_current_dora_tiles() == first
+        wall.reveal_new_dora()
+        assert len(wall.get_current_dora_tiles()) == 2
+
+    def test_cache_invalidated_on_direct_assignment(self):
+        wall = Wall()
+        wall.dora_indicators = [T(0)]
+        assert wall.get_current_dora_tiles() == [T(1)]
+        wall.dora_indicators = [T(33)]
+        assert wall.get_current_dora_tiles() == [T(31)]
+        wall.dora_indicators.append(T(8))
+        assert wall.get_current_dora_tiles() == [T(31), T(0)]
+
+    def test_indicator_ids_follow_indicators(self):
+        """指示牌 id 数组与 dora_indicators 同步, 定长 int8 缓冲按需重写"""
+        wall = Wall()
+        wall.shuffle_and_setup()
+        ids = wall.get_dora_indicator_ids()
+        assert ids.dtype == np.int8 and ids.tolist() == [wall.dora_indicators[0].value]
+        wall.reveal_new_dora()
+        assert wall.get_dora_indicator_ids().tolist() == [t.value for t in wall.dora_indicators]
+        wall.dora_indicators = [T(33)]
+        assert wall.get_dora_indicator_ids().tolist() == [33]
+        wall.dora_indicators.append(T(8))
+        assert wall.get_dora_indicator_ids().tolist() == [33, 8]
+
+    def test_next_dora_table_matches_rule(self):
+        from src.env.core.rules.constants import NEXT_DORA_VALUE
+        expected = [(v // 9) * 9 + (v % 9 + 1) % 9 for v in range(27)] + [28, 29, 30, 27, 32, 33, 31]
+        assert list(NEXT_DORA_VALUE) == expected
+        wall = Wall()
+        assert all(wall._calculate_next_tile_value(v) == expected[v] for v in range(34))
+        with pytest.raises(ValueError):
+            wall._calculate_next_tile_value(34)
+
+    def test_returned_list_is_a_copy(self):
+        wall = Wall()
+        wall.dora_indicators = [T(27)]
+        wall.get_current_dora_tiles().clear()
+        assert wall.get_current_dora_tiles() == [T(28)]
+
+
+class TestRemoveTilesFromHand:
+    """单张走计数校验, 多张单趟移除; 失败时不改动手牌。"""
+
+    def _gs(self, values):
+        gs = GameState({"num_players": 4}, Wall())
+        gs.players[0].hand = H(values)
+        return gs, gs.players[0]
+
+    def test_remove_ok(self):
+        gs, p = self._gs([1, 1, 2, 3])
+        assert gs._remove_tiles_from_hand(p, [T(1), T(3)])
+        assert p.hand == H([1, 2])
+
+    def test_single_failure_returns_false(self):
+        gs, p = self._gs([1, 2, 3])
+        assert not gs._remove_tiles_from_hand(p, [T(4)])
+
+    def test_multi_failure_leaves_hand_intact(self):
+        """多张移除失败时不改动手牌与计数"""
+        gs, p = self._gs([1, 2, 3])
+        assert not gs._remove_tiles_from_hand(p, [T(1), T(1)])
+        assert p.hand == H([1, 2, 3]) and p.hand_counts[1] == 1
+
+    def test_multi_keeps_red_five_bookkeeping(self):
+        gs, p = self._gs([3, 4, 5, 6])
+        p.hand = [T(3), T(4, red=True), T(4), T(6)]
+        assert gs._remove_tiles_from_hand(p, [T(3), T(4, red=True)])
+        assert p.hand == [T(4), T(6)]
+        assert p.hand_counts[4] == 1 and p.red_fives == 0
+
+    def test_red_five_distinct(self):
+        gs, p = self._gs([4, 5])
+        assert not gs._remove_tiles_from_hand(p, [T(4, red=True)])
+
+    def test_discard_missing_tile_raises_and_keeps_hand(self):
+        """手切不在手牌中的牌报错, 手牌 (含并入的摸牌) 与计数保持一致"""
+        gs, p = self._gs([1, 2, 3])
+        p.drawn_tile = T(9)
+        with pytest.raises(RuntimeError):
+            gs.apply_action(0, Action(type=ActionType.DISCARD, tile=T(5)))
+        assert p.hand == H([1, 2, 3, 9]) and p.hand_counts[5] == 0
+        assert p.discards == []
+
+
+class TestHandCounts:
+    """hand_counts / red_fives 必须始终与 hand 列表一致。"""
+
+    def _assert_synced(self, p):
+        expected = [0] * 34
+        for t in p.hand:
+            expected[t.value] += 1
+        assert p.hand_counts == expected
+        reds = {t.value for t in p.hand if t.is_red}
+        assert bool(p.red_fives & 1) == (4 in reds)
+        assert bool(p.red_fives & 2) == (13 in reds)
+        assert bool(p.red_fives & 4) == (22 in reds)
+        assert p.discards_mask == sum(1 << v for v in {t.value for t in p.discards})
+
+    def test_assignment_rebuilds(self):
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        p.hand = H([0, 0, 27]) + [T(4, red=True)]
+        self._assert_synced(p)
+        assert p.count_in_hand(0) == 2
+        assert p.has_tile(T(4, red=True)) and not p.has_tile(T(4))
+
+    def test_list_properties_rebuild_without_setattr_hook(self):
+        """hand / melds / discards 是 property, 整体赋值重建索引; 其余字段写入不经过 __setattr__ 钩子"""
+        from src.env.core.game_state import PlayerState
+        assert PlayerState.__setattr__ is object.__setattr__
+        p = GameState({"num_players": 4}, Wall()).players[0]
+        p.melds = [Meld(type=ActionType.PON, tiles=tuple(H([27, 27, 27])), from_player=1, called_tile=T(27))]
+        p.discards = H([3, 3])
+        assert p.pon_values == {27} and p.discards_mask == 1 << 3
+
+    def test_assigned_hand_offers_pon(self):
+        """直接赋值手牌后响应候选按新计数生成: 手有两张 6m 时对 6m 弃牌可碰"""
+        from src.env.core.rules.rules_engine import RulesEngine
+        gs = GameState({"num_players": 4}, Wall())
+        gs.wall.shuffle_and_setup()
+        p = gs.players[0]
+        p.hand = H([5, 5, 9, 10, 11, 18, 19, 20, 27, 28, 29, 30, 31])
+        gs.game_phase = GamePhase.WAITING_FOR_RESPONSE
+        gs.last_discarded_tile = T(5)
+        gs.last_discard_player_index = 3
+        validator = RulesEngine({}).action_validator
+        cands = validator.get_legal_actions_on_response(p, gs)
+        assert ActionType.PON in {c.type for c in cands}
+
+    def test_slotted_state_copies_keep_index(self):
+        """PlayerState / Wall 走 __slots__; 深拷贝后计数索引仍同步"""
+        import copy
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        p.hand = H([1, 1]) + [T(4, red=True)]
+        assert not hasattr(p, "__dict__") and not hasattr(gs.wall, "__dict__")
+        q = copy.deepcopy(p)
+        self._assert_synced(q)
+        assert q.hand == p.hand and q.hand is not p.hand
+
+    def test_slotted_game_state_and_action(self):
+        """GameState / Action 无实例 __dict__, 深拷贝 / pickle 仍可用"""
+        import copy
+        import pickle
+        gs = GameState({"num_players": 4}, Wall())
+        gs.reset_new_hand()
+        a = Action(type=ActionType.DISCARD, tile=T(3))
+        assert not hasattr(gs, "__dict__") and not hasattr(a, "__dict__")
+        assert pickle.loads(pickle.dumps(a)) == a
+        g2 = copy.deepcopy(gs)
+        assert g2.players[0].hand == gs.players[0].hand and g2.dealer_index == gs.dealer_index
+
+    def test_take_by_value(self):
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        p.hand = [T(4, red=True)] + H([1, 4, 4, 9])
+        hand_ref = p.hand
+        assert p.take_by_value(4, 4) is None
+        assert len(p.hand) == 5
+        taken = p.take_by_value(4, 2)
+        assert taken == [T(4, red=True), T(4)]
+        assert p.hand is hand_ref and p.hand == H([1, 4, 9])
+        self._assert_synced(p)
+
+    def test_take_by_value_sorted_run(self):
+        """有序手牌切片取牌, 取走的是该 value 段的前 n 张 (与单趟扫描一致)"""
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        red = T(13, red=True)
+        p.hand = H([2, 3]) + [red] + H([13, 13, 20])
+        hand_ref = p.hand
+        taken = p.take_by_value(13, 2)
+        assert taken[0] is red and taken[1] == T(13)
+        assert p.hand is hand_ref and p.hand == H([2, 3, 13, 20])
+        self._assert_synced(p)
+
+    def test_take_by_value_keeps_other_red_five(self):
+        """取走非赤五的牌不影响其他花色的赤五位"""
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        p.hand = [T(4, red=True)] + H([13, 13, 13])
+        assert p.take_by_value(13, 2) is not None
+        assert p.red_fives == 1
+        self._assert_synced(p)
+
+    def test_sort_hand_matches_sort(self):
+        import random
+        rng = random.Random(1)
+        tiles = Wall({"use_red_fives": True})._generate_tiles()
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        for _ in range(50):
+            p.hand = rng.sample(tiles, 13)
+            expected = sorted(p.hand)
+            p.sort_hand()
+            assert [t.value for t in p.hand] == [t.value for t in expected]
+            assert sorted(p.hand, key=lambda t: (t.value, t.is_red)) == \
+                sorted(expected, key=lambda t: (t.value, t.is_red))
+            self._assert_synced(p)
+
+    def test_insert_sorted_matches_append_and_sort(self):
+        """有序手牌二分插入与 append + sort 结果逐实例一致 (同 value 插在已有牌之后)"""
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        p.hand = H([1, 4, 4, 9, 30])
+        red = T(4, red=True)
+        expected = sorted(p.hand + [red])
+        p.insert_sorted(red)
+        assert [id(t) for t in p.hand] == [id(t) for t in expected]
+        assert p.hand[3] is red and p.has_tile(red)
+        self._assert_synced(p)
+
+    def test_remove_from_hand_by_bisect(self):
+        """有序手牌按二分删除指定实例 (赤五与普通五区分); 乱序手牌退回线性删除"""
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        red = T(4, red=True)
+        p.hand = H([1, 4]) + [red] + H([4, 9])
+        assert p.remove_from_hand(red)
+        assert [(t.value, t.is_red) for t in p.hand] == [(1, False), (4, False), (4, False), (9, False)]
+        assert not p.remove_from_hand(red)
+        p.hand = H([9, 1, 4])
+        assert p.remove_from_hand(T(1)) and [t.value for t in p.hand] == [9, 4]
+        self._assert_synced(p)
+
+    def test_reset_clears(self):
+        gs = GameState({"num_players": 4}, Wall())
+        gs.players[1].hand = H([1, 2, 3])
+        gs.reset_new_hand()
+        assert gs.players[1].hand_counts == [0] * 34
+        assert gs.players[1].red_fives == 0
+
+    def test_synced_through_full_hand(self):
+        """整局随机对打后每位玩家的计数索引仍与手牌一致"""
+        from src.env.mahjong_env import MahjongEnv
+        from src.agent.random_agent import RandomAgent
+        from src.utils.logger import quiet
+        quiet()
+        env = MahjongEnv({"num_players": 4, "initial_score": 25000})
+        agents = [RandomAgent({"seed": i}, i) for i in range(4)]
+        obs, info = env.reset(seed=7)
+        for _ in range(3000):
+            valid = info.get("valid_actions", [])
+            if not valid:
+                break
+            cp = info["current_player"]
+            idx = agents[cp].select_action(obs, info["action_mask"], valid)
+            obs, r, term, trunc, info = env.step(idx)
+            for p in env.controller.gamestate.players:
+                self._assert_synced(p)
+            if term or trunc:
+                break
+
+
+class TestWallCursor:
+    """draw_tile 走游标, 摸牌顺序与余牌数不变。"""
+
+    def test_draw_order_and_count(self):
+        wall = Wall()
+        wall.shuffle_and_setup()
+        expected = wall.live_tiles
+        drawn = []
+        while True:
+            t = wall.draw_tile()
+            if t is None:
+                break
+            drawn.append(t)
+            assert wall.get_remaining_live_tiles_count() == len(expected) - len(drawn)
+        assert drawn == expected
+        assert wall.live_tiles == []
+
+    def test_draw_does_not_shift_storage(self):
+        """摸牌只移动游标, 底层 id 列表既不移位也不重建 (每次摸牌 O(1))"""
+        wall = Wall()
+        wall.shuffle_and_setup()
+        ids = wall._live_ids
+        snapshot = list(ids)
+        for _ in range(10):
+            wall.draw_tile()
+        assert wall._live_ids is ids and ids == snapshot
+        assert wall._live_cursor == 10
+
+    def test_remaining_count_after_assignment(self):
+        """直接赋值 live_tiles / 批量摸牌后余牌数同步"""
+        wall = Wall()
+        wall.live_tiles = H([0, 1, 2])
+        assert wall.get_remaining_live_tiles_count() == 3
+        assert wall.draw_tiles(5) == H([0, 1, 2])
+        assert wall.get_remaining_live_tiles_count() == 0
+        assert wall.draw_tile() is None
+
+    def test_seeded_shuffle_reproducible(self):
+        import numpy as np
+        walls = []
+        for _ in range(2):
+            wall = Wall(rng=np.random.default_rng(3))
+            wall.shuffle_and_setup()
+            walls.append(wall.live_tiles + wall.dead_wall_tiles)
+        assert walls[0] == walls[1]
+        assert sorted((t.value, t.is_red) for t in walls[0]) == \
+            sorted((t.value, t.is_red) for t in Wall()._generate_tiles())
+
+    def test_config_seed_reproducible(self):
+        """未注入 rng 时按 config["seed"] 建 Generator, 同 seed 洗出同一牌墙"""
+        walls = []
+        for _ in range(2):
+            wall = Wall({"seed": 11})
+            wall.shuffle_and_setup()
+            walls.append(wall.live_tiles + wall.dead_wall_tiles)
+        assert walls[0] == walls[1]
+
+    def test_draw_tiles_slice(self):
+        """draw_tiles 与逐张 draw_tile 顺序一致, 余牌不足时截断"""
+        wall = Wall()
+        wall.live_tiles = H([1, 2, 3, 4, 5])
+        assert wall.draw_tiles(2) == H([1, 2])
+        assert wall.draw_tile() == T(3)
+        assert wall.draw_tiles(10) == H([4, 5])
+        assert wall.get_remaining_live_tiles_count() == 0
+
+    def test_live_tiles_assignment(self):
+        wall = Wall()
+        wall.live_tiles = H([1, 2])
+        assert wall.draw_tile() == T(1)
+        assert wall.live_tiles == [T(2)]
+
+
+class TestPonValues:
+    """pon_values / kan_count / meld_kinds 随副露赋值 / 追加 / 加杠同步。"""
+
+    def _pon(self, v):
+        return Meld(type=ActionType.PON, tiles=tuple(H([v, v, v])), from_player=1, called_tile=T(v))
+
+    def test_assignment_and_added_kan(self):
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        p.melds = [self._pon(27)]
+        assert p.pon_values == {27}
+        p.hand = H([0, 1, 2, 27])
+        gs.apply_action(0, Action(type=ActionType.KAN, kan_type=KanType.ADDED, tile=T(27)))
+        assert p.pon_values == set()
+        assert p.melds[0].type == ActionType.KAN
+        assert p.kan_count == 1 and gs.total_kans() == 1
+
+    def test_added_kan_without_pon_keeps_hand(self):
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        p.hand = H([0, 1, 2, 27])
+        with pytest.raises(RuntimeError):
+            gs.apply_action(0, Action(type=ActionType.KAN, kan_type=KanType.ADDED, tile=T(27)))
+        assert p.hand == H([0, 1, 2, 27])
+
+    def test_added_kan_keeps_meld_origin(self):
+        """加杠生成新的 Meld 对象, 保留来源与被叫牌"""
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        pon = self._pon(27)
+        p.melds = [pon]
+        p.hand = H([0, 1, 2, 27])
+        gs.apply_action(0, Action(type=ActionType.KAN, kan_type=KanType.ADDED, tile=T(27)))
+        kan = p.melds[0]
+        assert kan is not pon and pon.type == ActionType.PON
+        assert (kan.from_player, kan.called_tile, len(kan.tiles)) == (1, T(27), 4)
+        assert not hasattr(kan, "__dict__")
+
+    def test_added_kan_clears_ippatsu_for_all(self):
+        """杠/鸣牌消除所有人的一发机会, 未置位者保持 False"""
+        gs = GameState({"num_players": 4}, Wall())
+        gs.players[2].ippatsu_chance = True
+        p = gs.players[0]
+        p.melds = [self._pon(27)]
+        p.hand = H([0, 1, 2, 27])
+        gs.apply_action(0, Action(type=ActionType.KAN, kan_type=KanType.ADDED, tile=T(27)))
+        assert not any(q.ippatsu_chance for q in gs.players)
+
+    def test_total_kans_across_players(self):
+        gs = GameState({"num_players": 4}, Wall())
+        kan = Meld(type=ActionType.KAN, tiles=tuple(H([9] * 4)), from_player=0)
+        gs.players[0].melds = [kan, self._pon(5)]
+        gs.players[2].add_meld(kan)
+        assert gs.total_kans() == 2
+
+    def test_reset_clears(self):
+        gs = GameState({"num_players": 4}, Wall())
+        gs.players[0].add_meld(self._pon(5))
+        gs.players[0].add_meld(Meld(type=ActionType.KAN, tiles=tuple(H([9] * 4)), from_player=0))
+        gs.reset_new_hand()
+        assert gs.players[0].pon_values == set()
+        assert gs.total_kans() == 0
+
+    def test_meld_kinds_parallel_to_melds(self):
+        """meld_kinds 与 melds 逐项对应: 吃/碰/明杠(加杠)/暗杠"""
+        from src.env.core.game_state import (
+            MELD_KIND_CHI, MELD_KIND_PON, MELD_KIND_OPEN_KAN, MELD_KIND_CLOSED_KAN,
+        )
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        chi = Meld(type=ActionType.CHI, tiles=tuple(H([2, 0, 1])), from_player=3, called_tile=T(2))
+        p.melds = [chi, self._pon(27)]
+        assert p.meld_kinds == [MELD_KIND_CHI, MELD_KIND_PON]
+        p.add_meld(Meld(type=ActionType.KAN, tiles=tuple(H([9] * 4)), from_player=0))
+        p.hand = H([5, 27])
+        gs.apply_action(0, Action(type=ActionType.KAN, kan_type=KanType.ADDED, tile=T(27)))
+        assert p.meld_kinds == [MELD_KIND_CHI, MELD_KIND_OPEN_KAN, MELD_KIND_CLOSED_KAN]
+        gs.reset_new_hand()
+        assert p.meld_kinds == []
+
+    def test_find_pon_uses_meld_values(self):
+        """meld_values 与 melds 平行, find_pon 只认碰副露"""
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        chi = Meld(type=ActionType.CHI, tiles=tuple(H([5, 3, 4])), from_player=3, called_tile=T(5))
+        p.melds = [chi, self._pon(27)]
+        p.add_meld(self._pon(5))
+        assert p.meld_values == [5, 27, 5]
+        assert (p.find_pon(5), p.find_pon(27), p.find_pon(9)) == (2, 1, -1)
+        p.hand = H([5, 27])
+        gs.apply_action(0, Action(type=ActionType.KAN, kan_type=KanType.ADDED, tile=T(5)))
+        assert p.melds[2].type == ActionType.KAN and p.find_pon(5) == -1
+        gs.reset_new_hand()
+        assert p.meld_values == []
+
+
+class TestActionDispatch:
+    """apply_action 按动作类型查表分派。"""
+
+    def test_every_state_changing_type_has_handler(self):
+        handled = set(GameState._ACTION_HANDLERS)
+        assert handled == set(ActionType) - {ActionType.PASS}
+
+    def test_riichi_shares_discard_path(self):
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        p.hand = H([1, 2, 3])
+        p.drawn_tile = T(9)
+        gs.apply_action(0, Action(type=ActionType.RIICHI, riichi_discard=T(2)))
+        assert p.hand == H([1, 3, 9]) and p.drawn_tile is None
+        assert p.discards == [T(2)] and gs.last_discarded_tile == T(2)
+        assert p.riichi_declared and gs.riichi_sticks == 1
+
+    def test_pass_is_noop(self):
+        gs = GameState({"num_players": 4}, Wall())
+        gs.players[0].hand = H([1, 2, 3])
+        gs.apply_action(0, Action(type=ActionType.PASS))
+        assert gs.players[0].hand == H([1, 2, 3])
+
+    def test_events_ring_buffer(self):
+        """apply_action 只把 (player, action) 追加进定长事件日志, 格式化延后到 format_events"""
+        gs = GameState({"num_players": 4, "event_log_size": 2}, Wall())
+        gs.players[0].hand = H([1, 2, 3])
+        actions = [Action(type=ActionType.PASS) for _ in range(2)]
+        actions.append(Action(type=ActionType.DISCARD, tile=T(2)))
+        for a in actions:
+            gs.apply_action(0, a)
+        assert list(gs.events) == [(0, actions[1]), (0, actions[2])]
+        assert gs.format_events()[-1] == f"玩家 0: {actions[2]}"
+        gs.reset_game()
+        assert not gs.events
+
+    def test_every_action_type_has_next_phase(self):
+        """determine_next_phase 查表覆盖全部动作类型"""
+        from src.env.core.rules.rules_engine import _NEXT_PHASE
+        assert set(_NEXT_PHASE) == set(ActionType)
+        assert _NEXT_PHASE[ActionType.RIICHI] == GamePhase.WAITING_FOR_RESPONSE
+        assert _NEXT_PHASE[ActionType.KAN] == GamePhase.ACTION_PROCESSING
+
+
+class TestDiscardsMask:
+    """discards_mask 随打牌 / 赋值 / 重置同步。"""
+
+    def test_discard_sets_bit(self):
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        p.hand = H([1, 2, 3])
+        p.drawn_tile = T(30)
+        gs.apply_action(0, Action(type=ActionType.DISCARD, tile=T(30)))
+        gs.apply_action(0, Action(type=ActionType.DISCARD, tile=T(2)))
+        assert p.discards_mask == (1 << 30) | (1 << 2)
+
+    def test_assignment_and_reset(self):
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        p.discards = H([0, 0, 33])
+        assert p.discards_mask == (1 << 0) | (1 << 33)
+        gs.reset_new_hand()
+        assert p.discards_mask == 0
+
+
+class TestEnvLogger:
+    """env 内部 logger 挂在 mjagent 层级下, quiet()/verbose() 可统一开关。"""
+
+    def test_debug_follows_global_level(self):
+        from src.env.core import game_state
+        from src.utils.logger import quiet, verbose
+        import logging
+        assert game_state._log.name.startswith("mjagent.")
+        try:
+            verbose()
+            assert game_state._log.isEnabledFor(logging.DEBUG)
+        finally:
+            quiet()
+        assert not game_state._log.isEnabledFor(logging.DEBUG)
+
+    def test_buffered_batches_until_flush(self):
+        """buffered() 后日志先进内存缓冲, WARNING 或 flush() 时才写出"""
+        import io
+        import logging
+        from src.utils.logger import buffered, flush, get_logger
+        logger = get_logger()
+        saved_handlers, saved_level = list(logger.handlers), logger.level
+        out = io.StringIO()
+        logger.handlers[:] = [logging.StreamHandler(out)]
+        logger.setLevel(logging.INFO)
+        try:
+            buffered(capacity=100)
+            buffered(capacity=100)
+            assert len(logger.handlers) == 1
+            logger.info("a")
+            assert out.getvalue() == ""
+            flush()
+            assert out.getvalue() == "a\n"
+            logger.warning("b")
+            assert out.getvalue() == "a\nb\n"
+        finally:
+            logger.handlers[:] = saved_handlers
+            logger.setLevel(saved_level)
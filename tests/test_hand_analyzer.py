@@ -76,6 +76,16 @@ class TestShanten:
         waits = ha.find_wait_tiles(kokushi13, [])
         assert len(waits) == 13
 
+    def test_suit_options_pareto_reduced(self):
+        """花色分解只保留非支配组合, 且向听最优值与全量枚举一致"""
+        from src.env.core.rules.hand_analyzer import _decompose_suit, _pareto_front
+        counts = [1, 1, 2, 1, 1, 1, 0, 1, 1]
+        opts = _decompose_suit(counts)
+        assert len(opts) == len(set(opts))
+        for o in opts:
+            assert not any(p != o and all(x >= y for x, y in zip(p, o)) for p in opts)
+        assert _pareto_front([(1, 0, 0), (1, 0, 0), (0, 1, 0), (1, 1, 0)]) == [(1, 1, 0)]
+
 
 # ======================================================================
 # 2. 听牌 / 听牌枚举
@@ -102,6 +112,45 @@ class TestWaits:
         assert 0 not in waits  # 1m 已 4 张
 
 
+    def test_is_tenpai_agrees_with_waits(self, ha):
+        """567m777m456p456s99s: 听 4m/7m/9s; is_tenpai 与 find_wait_tiles 同一判定 (不依赖向听数)"""
+        hand = H([4, 5, 6, 6, 6, 12, 13, 14, 21, 22, 23, 26, 26])
+        assert ha.find_wait_tiles(hand, []) == {3, 6, 26}
+        assert ha.is_tenpai(hand, []) is True
+
+    def test_waits_on_any_matches_find_wait_tiles(self, ha):
+        # 两面 + 单骑等多种听牌, 逐个 value 对照 find_wait_tiles
+        tenpai = H([1, 2, 3, 3, 4, 9, 10, 11, 18, 19, 20, 27, 27])
+        waits = ha.find_wait_tiles(tenpai, [])
+        for v in range(34):
+            assert ha.waits_on_any(tenpai, [], {v}) == (v in waits)
+        assert ha.waits_on_any(tenpai, [], set()) is False
+
+    def test_waits_on_any_known_wait(self, ha):
+        tenpai = H([0, 1, 2, 9, 10, 11, 18, 19, 20, 27, 27, 27, 28])
+        assert ha.waits_on_any(tenpai, [], {28, 5}, known_wait=28) is True
+        assert ha.waits_on_any(tenpai, [], {5}, known_wait=28) is False
+
+    def test_wait_mask_counts_meld_tiles(self, ha):
+        """手牌 3 张 + 碰副露 1 张凑满 4 张的 value 不算听牌"""
+        pon = Meld(type=ActionType.PON, tiles=tuple(H([27, 27, 27])),
+                   from_player=1, called_tile=Tile(27))
+        hand = H([0, 1, 2, 9, 10, 11, 18, 19, 20, 27])  # 单骑 27, 但 27 已 4 张
+        assert ha.wait_mask(hand, [pon]) == 0
+        assert ha.find_wait_tiles(hand, [pon]) == set()
+
+    def test_wait_mask_cached_by_hand_counts(self, ha):
+        """听牌掩码按手牌计数缓存: 同样的手牌 (不同实例) 第二次查询命中缓存"""
+        from src.env.core.rules.hand_analyzer import _wait_mask
+        hand = H([1, 2, 3, 3, 4, 9, 10, 11, 18, 19, 20, 27, 27])
+        ha.wait_mask(hand, [])
+        hits = _wait_mask.cache_info().hits
+        assert ha.wait_mask(H([1, 2, 3, 3, 4, 9, 10, 11, 18, 19, 20, 27, 27]), []) == sum(
+            1 << v for v in ha.find_wait_tiles(hand, [])
+        )
+        assert _wait_mask.cache_info().hits > hits
+
+
 # ======================================================================
 # 3. 完整分解 find_all_winning_forms
 # ======================================================================
@@ -148,6 +197,33 @@ class TestWinForms:
         )
         assert red_preserved, "赤宝牌 is_red 信息应被保留"
 
+    def test_shuntsu_component_sorted_by_value(self):
+        """顺子组件的 tiles 按 value 排序, 实例 (赤五) 原样保留"""
+        red = Tile(13, is_red=True)
+        c = HandComponent("shuntsu", (Tile(14), red, Tile(12)))
+        assert [t.value for t in c.tiles] == [12, 13, 14] and c.tiles[1] is red
+
+    def test_forms_are_slotted(self, ha):
+        """WinForm / HandComponent 无实例 __dict__, 仍不可变"""
+        win = H([0, 1, 2, 9, 10, 11, 18, 19, 20, 27, 27, 27, 28, 28])
+        form = ha.find_all_winning_forms(win, [], Tile(28))[0]
+        assert not hasattr(form, "__dict__")
+        assert not any(hasattr(c, "__dict__") for c in form.components)
+        with pytest.raises(AttributeError):
+            form.hand_type = "chiitoitsu"
+
+    def test_take_helpers_single_pass(self, ha):
+        """取刻子/顺子单趟分拣: 取各 value 的第一张实例, 剩余保持原顺序"""
+        red = Tile(4, is_red=True)
+        tiles = [Tile(5), red, Tile(4), Tile(3), Tile(9), Tile(5)]
+        seq, rest = ha._take_sequence(tiles, 3)
+        assert seq == [Tile(3), red, Tile(5)] and seq[1] is red
+        assert rest == [Tile(4), Tile(9), Tile(5)]
+        assert ha._take_sequence(tiles, 7) == (None, tiles)
+        taken, rest = ha._take_n_tiles_by_value(tiles, 5, 2)
+        assert taken == [Tile(5), Tile(5)] and rest == [red, Tile(4), Tile(3), Tile(9)]
+        assert ha._take_n_tiles_by_value(tiles, 9, 2) == (None, tiles)
+
     def test_quad_not_two_pairs(self, ha):
         """4 张同 value 在七对子中不能当两对"""
         bad = H([0, 0, 0, 0, 2, 2, 5, 5, 9, 9, 18, 18, 27, 27])
@@ -156,6 +232,49 @@ class TestWinForms:
         assert len(chiitoi_forms) == 0
 
 
+class TestWinShapeCounts:
+    """check_win_shape 在计数向量上判定, 结果须与实例级回溯一致。"""
+
+    def test_matches_full_decomposition(self, ha):
+        import random
+        rng = random.Random(0)
+        pool = [v for v in range(34) for _ in range(4)]
+        for i in range(2000):
+            if i % 2:
+                # 近似和牌形: 随机面子 + 雀头
+                vals = []
+                while len(vals) < 12:
+                    b = rng.randrange(34)
+                    vals += [b, b + 1, b + 2] if b < 27 and b % 9 <= 6 and rng.random() < 0.6 else [b] * 3
+                vals += [rng.randrange(34)] * 2
+                if any(vals.count(v) > 4 for v in set(vals)):
+                    continue
+            else:
+                rng.shuffle(pool)
+                vals = pool[:14]
+            hand = H(vals)
+            expected = bool(ha.find_all_winning_forms(hand, [], hand[-1]))
+            assert ha.check_win_shape(hand, [], hand[-1]) == expected, sorted(vals)
+
+    def test_tile_count_must_match_melds(self, ha):
+        """张数与副露数不符时不算和牌 (如 14 张手牌 + 1 副露)"""
+        meld = Meld(type=ActionType.PON, tiles=tuple(H([27, 27, 27])),
+                    from_player=1, called_tile=Tile(27))
+        win = H([0, 1, 2, 9, 10, 11, 18, 19, 20, 3, 4, 5, 31, 31])
+        assert ha.check_win_shape(win, [], Tile(31)) is True
+        assert ha.check_win_shape(win, [meld], Tile(31)) is False
+
+    def test_wins_on_restores_counts(self, ha):
+        """wins_on 原地 +1 判定后复原计数向量"""
+        counts = [0] * 34
+        for v in [0, 1, 2, 9, 10, 11, 18, 19, 20, 3, 4, 5, 31]:
+            counts[v] += 1
+        before = list(counts)
+        assert ha.wins_on(counts, 0, 31) is True
+        assert ha.wins_on(counts, 0, 30) is False
+        assert counts == before
+
+
 # ======================================================================
 # 4. 副露
 # ======================================================================
@@ -192,6 +311,15 @@ class TestMelds:
         forms = ha.find_all_winning_forms(hand, [meld], Tile(31))
         assert all(f.hand_type != "chiitoitsu" for f in forms)
 
+    def test_open_chi_component_sorted(self, ha):
+        """吃的副露牌序为 (鸣牌, 搭子...), 转为顺子组件后按 value 排序; 刻子保持原顺序"""
+        chi = Meld(type=ActionType.CHI, tiles=tuple(H([2, 0, 1])),
+                   from_player=3, called_tile=Tile(2))
+        assert [t.value for t in ha._meld_to_component(chi).tiles] == [0, 1, 2]
+        pon_tiles = (Tile(4), Tile(4, is_red=True), Tile(4))
+        pon = Meld(type=ActionType.PON, tiles=pon_tiles, from_player=1, called_tile=Tile(4))
+        assert ha._meld_to_component(pon).tiles == pon_tiles
+
 
 # ======================================================================
 # 5. 性能
@@ -366,6 +366,64 @@ class TestCandidateActions:
         # 手牌: 234m 567p 678s 99p 45m+drawn5m -> 重复5m? 简化测: 有候选即可
         # 如果没立直候选也不算错(取决于手牌), 这里宽松测
 
+    def test_riichi_candidate_for_tenpai_missed_by_shanten(self, av):
+        """567m777m456p456s99s + 摸中: 打中后听牌, 应生成立直候选"""
+        gs = make_gs([
+            {"hand": H([4,5,6,6,6,12,13,14,21,22,23,26,26]), "drawn_tile": T(33), "menzen": True, "score": 25000},
+        ] + [{}]*3)
+        cands = av.get_legal_actions_on_draw(gs.players[0], gs)
+        riichi_tiles = {c.riichi_discard.value for c in cands if c.type == ActionType.RIICHI}
+        assert 33 in riichi_tiles
+
+    def test_call_prechecks_by_counts(self, av):
+        """计数预判: 碰/明杠/吃 与手牌张数一致 (SimpleNamespace 玩家无 hand_counts 时现算)"""
+        gs = make_gs([
+            {"last_discard": T(5)},
+            {"hand": H([5,5,5,3,4,9,10,11,18,19,20,27,28]), "menzen": True},
+        ] + [{}]*2)
+        gs.game_phase = GamePhase.WAITING_FOR_RESPONSE
+        types = [c.type for c in av.get_legal_actions_on_response(gs.players[1], gs)]
+        assert ActionType.PON in types and ActionType.KAN in types
+        assert ActionType.CHI in types  # 34m 吃 5m
+
+    def test_no_call_when_counts_insufficient(self, av):
+        """张数不足/字牌: 只剩 PASS"""
+        gs = make_gs([
+            {"last_discard": T(27)},
+            {"hand": H([0,1,2,9,10,11,18,19,20,27,28,29,30]), "menzen": True},
+        ] + [{}]*2)
+        gs.game_phase = GamePhase.WAITING_FOR_RESPONSE
+        cands = av.get_legal_actions_on_response(gs.players[1], gs)
+        assert [c.type for c in cands] == [ActionType.PASS]
+
+    def test_closed_kan_with_red_five(self, av):
+        """暗杠按 value 计数: 赤5 + 3 张普通 5 也能暗杠"""
+        gs = make_gs([
+            {"hand": H([4,4,4,9,10,11,18,19,20,27,27,28,29]), "drawn_tile": T(4, red=True)},
+        ] + [{}]*3)
+        kans = [c for c in av.get_legal_actions_on_draw(gs.players[0], gs)
+                if c.type == ActionType.KAN]
+        assert [(k.kan_type, k.tile.value) for k in kans] == [(KanType.CLOSED, 4)]
+
+    def test_added_kan_from_pon_values(self, av):
+        """加杠: 碰副露 value 出现在 drawn 中"""
+        pon = Meld(type=ActionType.PON, tiles=tuple(H([27,27,27])), from_player=1, called_tile=T(27))
+        gs = GameState({"num_players": 4}, Wall())
+        p = gs.players[0]
+        p.hand = H([0,1,2,9,10,11,18,19,20,5])
+        p.melds = [pon]
+        p.drawn_tile = T(27)
+        kans = [c for c in av.get_legal_actions_on_draw(p, gs) if c.type == ActionType.KAN]
+        assert [(k.kan_type, k.tile) for k in kans] == [(KanType.ADDED, T(27))]
+
+    def test_chi_precheck_respects_suit_boundary(self):
+        """吃的三种窗口不跨花色"""
+        from src.env.core.rules.action_validator import _can_chi_counts
+        counts = [0] * 34
+        counts[7] = counts[8] = 1  # 8m 9m
+        assert not _can_chi_counts(counts, 9)  # 1p 不能与 89m 组成顺子
+        assert _can_chi_counts(counts, 6)  # 7m + 89m
+
 
 # ======================================================================
 # 4. 计分测试 (对照天凤)
@@ -412,6 +470,9 @@ class TestScoring:
         assert "Tanyao" in yaku_names
         # 这手牌全顺子+两面听 -> 额外含平和, 所以 han=4 (立直1+自摸1+断幺1+平和1)
         assert d.han == 4
+        # 位掩码与役种列表同步
+        assert all(d.has_yaku(n) for n in yaku_names)
+        assert not d.has_yaku("Toitoi") and d.yakuman_mask == 0
 
     def test_pinfu(self, sc):
         """平和 (门清全顺子+雀头非役牌+两面听) = 1番"""
@@ -14,16 +14,19 @@ from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
+import numpy as np
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from src.env.core.actions import Tile, ActionType
 from src.env.core.game_state import PlayerState, Meld
 from src.env.core.rules.hand_analyzer import HandAnalyzer, WinForm, HandComponent
-from src.env.core.rules.scoring import Scoring, WinDetails
+from src.env.core.rules.scoring import (
+    Scoring, WinDetails, WIN_DTYPE, count_dora, pack_win_details,
+)
 from src.env.core.rules.constants import (
-    TERMINAL_HONOR_VALUES, WIND_EAST, WIND_SOUTH, DRAGON_WHITE, DRAGON_GREEN,
-    DRAGON_RED, MAN_1, MAN_9, PIN_1, PIN_9, SOU_1, SOU_9,
+    TERMINAL_HONOR_VALUES, WIND_EAST, WIND_SOUTH, WIND_NORTH, DRAGON_WHITE, DRAGON_GREEN,
+    DRAGON_RED, MAN_1, MAN_9, PIN_1, PIN_9, SOU_1, SOU_9, YAKU_BIT,
 )
 
 
@@ -353,6 +356,50 @@ class TestEndToEnd:
         names = [n for n, _ in details.yaku_list]
         assert "Tanyao" in names or "Menzen Tsumo" in names
 
+    def test_win_context_wind_tiles(self, scoring):
+        """场风/自风查表: 庄家上家 (座位差为负) 为北, 越界场风退回东"""
+        player = SimpleNamespace(player_index=0, riichi_declared=False, riichi_turn=-1,
+                                 ippatsu_chance=False, is_menzen=True)
+        gs = make_mock_gamestate(player, dealer_index=1, round_wind=1)
+        ctx = scoring._get_win_context(player, gs, True, T(0))
+        assert (ctx["round_wind"], ctx["player_wind"]) == (WIND_SOUTH, WIND_NORTH)
+        gs.round_wind = 7
+        assert scoring._get_win_context(player, gs, True, T(0))["round_wind"] == WIND_EAST
+
+    def test_is_valid_win_skips_scoring_and_reuses_scratch(self, scoring):
+        # 合法性判定不算宝牌/点数, 复用同一个 WinDetails 且每次先 reset
+        player = SimpleNamespace(
+            player_index=0, score=25000,
+            hand=H([1, 2, 3, 12, 13, 14, 21, 22, 23, 3, 4, 5, 13]),
+            drawn_tile=None, melds=[], discards=[],
+            riichi_declared=False, riichi_turn=-1, ippatsu_chance=False,
+            is_menzen=True, is_tenpai=False, is_furiten=False, has_won=False,
+            seat_wind=0,
+        )
+        gs = make_mock_gamestate(player)
+        scoring._calculate_dora = MagicMock(side_effect=AssertionError("不应计算宝牌"))
+        scratch = scoring._scratch_details
+        assert scoring.is_valid_win(player, T(13), is_tsumo=True, game_state=gs)
+        assert scoring._scratch_details is scratch and scratch.score_points == 0
+        assert not scoring.is_valid_win(player, T(30), is_tsumo=True, game_state=gs)
+        assert scratch.yaku_list == () and scratch.han == 0
+
+    def test_is_valid_win_stops_at_first_yaku_form(self, scoring):
+        # 合法性判定找到有役的分解即停, 不算符也不写役种列表
+        player = SimpleNamespace(
+            player_index=0, score=25000,
+            hand=H([1, 2, 3, 12, 13, 14, 21, 22, 23, 3, 4, 5, 13]),
+            drawn_tile=None, melds=[], discards=[],
+            riichi_declared=False, riichi_turn=-1, ippatsu_chance=False,
+            is_menzen=True, is_tenpai=False, is_furiten=False, has_won=False,
+            seat_wind=0,
+        )
+        gs = make_mock_gamestate(player)
+        scoring._calculate_fu = MagicMock(side_effect=AssertionError("不应计算符"))
+        assert scoring.is_valid_win(player, T(13), is_tsumo=True, game_state=gs)
+        scratch = scoring._scratch_details
+        assert scratch.han >= 1 and scratch.fu == 0 and scratch.yaku_list == ()
+
     def test_no_yaku_invalid(self, scoring):
         # 无役 (无番) -> 一番缚失败
         # 构造一个无役的和牌: 123m 456p 789s 123p 无役牌无断幺(含1m9s幺九)
@@ -369,6 +416,26 @@ class TestEndToEnd:
         # 荣和 (非自摸), 无立直, 含幺九非断幺, 应无役 -> invalid
         assert details.is_valid_win is False or details.han >= 1
 
+    def test_points_memoized_by_han_fu_dealer(self, scoring):
+        # 点数只由 (总番, 符, 庄家) 决定, 第二次查询直接命中缓存
+        child = scoring._calculate_points(1, 30, {"is_dealer": False})
+        dealer = scoring._calculate_points(1, 30, {"is_dealer": True})
+        assert (child, dealer) == (scoring._compute_points(1, 30, False),
+                                   scoring._compute_points(1, 30, True))
+        scoring._compute_points = MagicMock(side_effect=AssertionError("应命中缓存"))
+        assert scoring._calculate_points(1, 30, {}) == child
+        assert scoring._points_cache[(1, 30, True)] == dealer
+
+    def test_dora_counted_from_tile_vector(self, scoring):
+        # 宝牌按 34 维计数向量 gather 求和; 赤五另计, 里宝牌只在立直时计入
+        assert count_dora(np.bincount([4, 4, 5], minlength=34), [4]) == 2
+        assert count_dora(np.zeros(34, dtype=np.int64), []) == 0
+        hand = H([3, 4, 4, 5]) + [T(4, red=True)]
+        ctx = base_context(dora_indicators=[T(3)], ura_dora_indicators=[T(4)])
+        assert scoring._calculate_dora(hand, [], None, ctx) == 1 + 3
+        ctx["is_riichi"] = True
+        assert scoring._calculate_dora(hand, [], None, ctx) == 1 + 3 + 1
+
 
 # ======================================================================
 # 6. 支付 get_final_score_and_payout
@@ -405,6 +472,48 @@ class TestPayout:
         assert payout[0] == 6000
         assert payout[1] == -2000
 
+    def test_win_details_slotted_with_empty_defaults(self):
+        # WinDetails 无实例 __dict__, 役列表默认空 (不可变共享) 且可整体赋值
+        d = WinDetails()
+        assert not hasattr(d, "__dict__")
+        assert list(d.yaku_list) == [] and list(d.yakuman_list) == []
+        d.yaku_list = [("Riichi", 1)]
+        assert WinDetails().yaku_list == ()
+
+    def test_win_details_reset_matches_fresh(self):
+        # reset 按字段定义恢复默认值: 任何字段被改写后都与新建实例一致
+        d = WinDetails(is_valid_win=True, winning_tile=H([5])[0], han=3, fu=40,
+                       score_payout={0: 3900}, yaku_list=[("Riichi", 1)], yaku_mask=1)
+        d.reset()
+        assert d == WinDetails()
+
+    def test_win_details_record_round_trip(self):
+        # 定长记录保留数值字段和役种掩码, 批量统计直接在结构化数组上做
+        riichi = WinDetails(is_valid_win=True, han=2, fu=30, total_han=3, dora_count=1,
+                            score_points=3900, yaku_mask=YAKU_BIT["Riichi"])
+        records = pack_win_details([riichi, WinDetails()])
+        assert records.dtype == WIN_DTYPE and len(records) == 2
+        assert np.count_nonzero(records["yaku_mask"] & YAKU_BIT["Riichi"]) == 1
+        back = WinDetails.from_record(records[0])
+        assert back.to_record() == riichi.to_record() and back.has_yaku("Riichi")
+
+    def test_rules_engine_shares_win_details(self):
+        # RulesEngine 的类型标注直接引用 scoring.WinDetails, 不再有占位副本
+        from src.env.core.rules import rules_engine
+        assert rules_engine.WinDetails is WinDetails
+
+    def test_ryuukyoku_penalty_with_given_tenpai(self, scoring):
+        # 荒牌流局: 调用方传入听牌索引时不再重算, 1 家听牌收 3000
+        players = [SimpleNamespace(player_index=i, discards=[H([1])[0]], hand=[], melds=[])
+                   for i in range(4)]
+        gs = MagicMock()
+        gs.players = players
+        gs.dealer_index = 0
+        scoring.hand_analyzer = MagicMock()
+        payout = scoring.calculate_ryuukyoku_penalty_tenpai(gs, [2])
+        scoring.hand_analyzer.is_tenpai.assert_not_called()
+        assert payout == {0: -1000, 1: -1000, 2: 3000, 3: -1000}
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])